@@ -0,0 +1,150 @@
+import io
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+from fontTools.ttLib import TTFont
+from matplotlib.font_manager import fontManager
+from requests.adapters import HTTPAdapter
+
+import pyfonts.registry
+from pyfonts import configure_cache, set_http_session
+from pyfonts.cache import _MEMORY_CACHE
+from pyfonts.css import _parse_css
+from pyfonts.memory import _FONT_MEMO
+
+FONTS_DIR: str = os.path.join(os.path.dirname(__file__), "..", "tests")
+FAMILIES: dict = {"Ultra": "Ultra-Regular", "Amarante": "Amarante-Regular"}
+# content of the font files served, by file name
+FONTS: dict = {}
+
+
+def _woff(font_file: str) -> bytes:
+    font = TTFont(font_file)
+    font.flavor = "woff"
+    output = io.BytesIO()
+    font.save(output)
+    return output.getvalue()
+
+
+def _css(family: str, url: str, format: str) -> str:
+    return (
+        f"@font-face {{ font-family: '{family}'; font-style: normal; "
+        f"font-weight: 400; src: url({url}) format('{format}'); }}"
+    )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Stand-in for Google Fonts, Bunny Fonts and GitHub. The first segment of
+    the path is the host of the original request (see `_LocalAdapter`).
+    """
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        host, _, path = url.path.lstrip("/").partition("/")
+        if host in ("fonts.googleapis.com", "fonts.bunny.net") and path.startswith(
+            "css"
+        ):
+            family: str = parse_qs(url.query)["family"][0].split(":")[0]
+            if family not in FAMILIES:
+                return self._send(400, b"")
+            if host == "fonts.googleapis.com":
+                font_url = f"https://fonts.gstatic.com/s/{FAMILIES[family]}.ttf"
+                css = _css(family, font_url, "truetype")
+            else:
+                font_url = f"https://fonts.bunny.net/files/{FAMILIES[family]}.woff"
+                css = _css(family, font_url, "woff")
+            return self._send(200, css.encode(), "text/css")
+
+        content = FONTS.get(os.path.basename(path))
+        if content is None:
+            return self._send(404, b"")
+        self._send(200, content, "font/ttf")
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/plain"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "max-age=86400")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _LocalAdapter(HTTPAdapter):
+    """Send all requests to the local server instead of the real hosts."""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url
+
+    def send(
+        self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None
+    ):
+        url = urlparse(request.url)
+        query = f"?{url.query}" if url.query else ""
+        request.url = f"{self.base_url}/{url.netloc}{url.path}{query}"
+        return super().send(request, stream, timeout, verify, cert, proxies)
+
+
+@pytest.fixture(scope="session")
+def font_server():
+    for name in FAMILIES.values():
+        font_file = os.path.join(FONTS_DIR, f"{name}.ttf")
+        with open(font_file, "rb") as f:
+            FONTS[f"{name}.ttf"] = f.read()
+        FONTS[f"{name}.woff"] = _woff(font_file)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    session = requests.Session()
+    session.mount("https://", _LocalAdapter(f"http://127.0.0.1:{server.server_port}"))
+    set_http_session(session)
+    yield
+    set_http_session(None)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def new_process():
+    """
+    Reset the in-memory state of pyfonts, as in a new process. The cache on
+    disk is kept.
+    """
+    ttflist: list = list(fontManager.ttflist)
+
+    def reset():
+        _FONT_MEMO.clear()
+        _MEMORY_CACHE.clear()
+        _parse_css.cache_clear()
+        pyfonts.registry._REGISTERED.clear()
+        fontManager.ttflist[:] = ttflist
+        pyfonts.registry._clear_findfont_cache()
+
+    reset()
+    yield reset
+    reset()
+
+
+@pytest.fixture
+def new_cache(tmp_path, monkeypatch, new_process):
+    """Use a new empty cache, in a new process."""
+    monkeypatch.setattr("pyfonts.cache._CACHE_FILE", str(tmp_path / "legacy.json"))
+
+    def reset():
+        configure_cache(cache_dir=tempfile.mkdtemp(dir=tmp_path), shared_cache_dirs=[])
+        new_process()
+
+    reset()
+    yield reset
+    configure_cache(cache_dir=None, shared_cache_dirs=None)
@@ -0,0 +1,60 @@
+"""
+Benchmarks of font loading, against a local stand-in of the font providers
+(see `conftest.py`). Each loader is measured:
+
+- cold: empty cache, in a new process.
+- warm: fonts in the cache on disk, in a new process.
+- hot: fonts already loaded in this process.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from pyfonts import (
+    load_bunny_font,
+    load_bunny_fonts,
+    load_font,
+    load_google_font,
+    load_google_fonts,
+)
+
+FONT_URL: str = (
+    "https://raw.githubusercontent.com/y-sunflower/pyfonts/main/tests/Ultra-Regular.ttf"
+)
+ROUNDS: int = 20
+
+LOADERS: dict = {
+    "load_font": lambda: load_font(FONT_URL),
+    "load_google_font": lambda: load_google_font("Ultra"),
+    "load_bunny_font": lambda: load_bunny_font("Ultra"),
+    "load_google_fonts": lambda: load_google_fonts(["Ultra", "Amarante"]),
+    "load_bunny_fonts": lambda: load_bunny_fonts(["Ultra", "Amarante"]),
+}
+
+
+@pytest.fixture(params=list(LOADERS))
+def loader(request, font_server):
+    return LOADERS[request.param]
+
+
+def test_cold(benchmark, loader, new_cache):
+    benchmark.pedantic(loader, setup=new_cache, rounds=ROUNDS)
+
+
+def test_warm(benchmark, loader, new_cache, new_process):
+    loader()
+    benchmark.pedantic(loader, setup=new_process, rounds=ROUNDS)
+
+
+def test_hot(benchmark, loader, new_cache):
+    loader()
+    benchmark(loader)
+
+
+def test_import_time(benchmark):
+    def import_pyfonts():
+        subprocess.run([sys.executable, "-c", "import pyfonts"], check=True)
+
+    benchmark.pedantic(import_pyfonts, rounds=ROUNDS)
@@ -1,17 +1,129 @@
-from .main import load_font, set_default_font
-from .google import load_google_font
-from .bunny import load_bunny_font
-from .cache import clear_pyfonts_cache
-from .preview_font import preview_font
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any, Literal
+
+# Public names are imported lazily, so that `import pyfonts` does not import
+# matplotlib, requests, etc until they are actually needed.
+_LAZY_IMPORTS: dict[str, str] = {
+    "load_font": "pyfonts.main",
+    "set_default_font": "pyfonts.main",
+    "load_google_font": "pyfonts.google",
+    "load_bunny_font": "pyfonts.bunny",
+    "load_fonts": "pyfonts.batch",
+    "load_google_fonts": "pyfonts.batch",
+    "load_bunny_fonts": "pyfonts.batch",
+    "aload_font": "pyfonts.aio",
+    "aload_google_font": "pyfonts.aio",
+    "aload_bunny_font": "pyfonts.aio",
+    "clear_pyfonts_cache": "pyfonts.cache",
+    "configure_cache": "pyfonts.cache",
+    "prune_pyfonts_cache": "pyfonts.cache",
+    "preview_font": "pyfonts._preview",
+    "configure_http": "pyfonts.session",
+    "set_http_session": "pyfonts.session",
+    "set_memory_cache_size": "pyfonts.memory",
+    "memory_cache_info": "pyfonts.memory",
+    "set_offline_mode": "pyfonts.offline",
+    "warm_cache": "pyfonts.warm",
+    "register_cached_fonts": "pyfonts.registry",
+    "add_observer": "pyfonts.metrics",
+    "remove_observer": "pyfonts.metrics",
+    "cache_stats": "pyfonts.metrics",
+    "FontProvider": "pyfonts.providers",
+    "CSSProvider": "pyfonts.providers",
+    "DirectoryProvider": "pyfonts.providers",
+    "FailoverProvider": "pyfonts.providers",
+    "register_provider": "pyfonts.providers",
+    "get_provider": "pyfonts.providers",
+    "load_provider_font": "pyfonts.providers",
+    "search_families": "pyfonts.catalog",
+}
+
+if TYPE_CHECKING:
+    from .main import load_font, set_default_font
+    from .google import load_google_font
+    from .bunny import load_bunny_font
+    from .batch import load_fonts, load_google_fonts, load_bunny_fonts
+    from .aio import aload_font, aload_google_font, aload_bunny_font
+    from .cache import clear_pyfonts_cache, configure_cache, prune_pyfonts_cache
+    from ._preview import preview_font
+    from .session import configure_http, set_http_session
+    from .memory import set_memory_cache_size, memory_cache_info
+    from .offline import set_offline_mode
+    from .warm import warm_cache
+    from .registry import register_cached_fonts
+    from .metrics import add_observer, remove_observer, cache_stats
+    from .catalog import search_families
+    from .providers import (
+        FontProvider,
+        CSSProvider,
+        DirectoryProvider,
+        FailoverProvider,
+        register_provider,
+        get_provider,
+        load_provider_font,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module 'pyfonts' has no attribute '{name}'")
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+    # cache it, so that this function is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name: str, value: Any) -> None:
+        # importing the `pyfonts.preview_font` module (kept for backward
+        # compatibility) sets it as an attribute of the package, which must
+        # stay the function of the same name
+        if name == "preview_font" and isinstance(value, types.ModuleType):
+            value = value.preview_font
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
 
-from typing import Literal
 
 __version__: Literal["1.2.0"] = "1.2.0"
 __all__: list[str] = [
     "load_font",
     "load_google_font",
     "load_bunny_font",
+    "load_fonts",
+    "load_google_fonts",
+    "load_bunny_fonts",
+    "aload_font",
+    "aload_google_font",
+    "aload_bunny_font",
     "set_default_font",
     "preview_font",
     "clear_pyfonts_cache",
+    "configure_cache",
+    "prune_pyfonts_cache",
+    "configure_http",
+    "set_http_session",
+    "set_memory_cache_size",
+    "memory_cache_info",
+    "set_offline_mode",
+    "warm_cache",
+    "register_cached_fonts",
+    "add_observer",
+    "remove_observer",
+    "cache_stats",
+    "FontProvider",
+    "CSSProvider",
+    "DirectoryProvider",
+    "FailoverProvider",
+    "register_provider",
+    "get_provider",
+    "load_provider_font",
+    "search_families",
 ]
@@ -0,0 +1,53 @@
+import argparse
+import sys
+from typing import Optional
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pyfonts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    warm = subparsers.add_parser(
+        "warm",
+        help="Download the fonts of a manifest into the cache and write a lockfile.",
+    )
+    warm.add_argument("manifest", help="Path to a TOML manifest of fonts.")
+    warm.add_argument(
+        "--lockfile",
+        default=None,
+        help="Where to write the lockfile (default: <manifest>.lock.json).",
+    )
+    warm.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=8,
+        help="Maximum number of fonts downloaded at the same time (default: 8).",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command == "warm":
+        from pyfonts.warm import warm_cache
+        from pyfonts.cache import _get_cache_dir
+
+        try:
+            entries = warm_cache(
+                args.manifest, lockfile=args.lockfile, max_workers=args.jobs
+            )
+        except Exception as e:
+            print(f"pyfonts: error: {e}", file=sys.stderr)
+            return 1
+        for entry in entries:
+            style = "italic" if entry["italic"] else "normal"
+            print(
+                f"{entry['provider']}: {entry['family']} "
+                f"(weight={entry['weight']}, {style}) -> {entry['url']}"
+            )
+        print(f"Cached {len(entries)} font(s) in {_get_cache_dir()}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import asyncio
+import functools
+import json
+import weakref
+from typing import Callable, Optional, Union
+from matplotlib.font_manager import FontProperties
+
+from pyfonts.main import load_font
+from pyfonts.google import load_google_font
+from pyfonts.bunny import load_bunny_font
+
+# in-flight loads, per event loop, so that concurrent awaits of the
+# same font share a single download
+_IN_FLIGHT: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+async def _run_shared(
+    loader: Callable[..., FontProperties], **kwargs
+) -> FontProperties:
+    """
+    Run a blocking loader in a worker thread, so that the event loop is never
+    blocked on network or disk I/O. Concurrent calls with the same arguments
+    await the same in-flight load.
+    """
+    loop = asyncio.get_running_loop()
+    in_flight: dict[str, asyncio.Future] = _IN_FLIGHT.setdefault(loop, {})
+    key: str = json.dumps(
+        {"loader": getattr(loader, "__name__", repr(loader)), **kwargs},
+        sort_keys=True,
+        default=str,
+    )
+
+    future: Optional[asyncio.Future] = in_flight.get(key)
+    if future is None:
+        future = loop.run_in_executor(None, functools.partial(loader, **kwargs))
+        in_flight[key] = future
+        future.add_done_callback(lambda _: in_flight.pop(key, None))
+
+    # shield the shared load so that a cancelled caller does not cancel it
+    # for the others, and give each caller its own copy of the font
+    font: FontProperties = await asyncio.shield(future)
+    return font.copy()
+
+
+async def aload_font(
+    font_url: Optional[str] = None,
+    use_cache: bool = True,
+    danger_not_verify_ssl: bool = False,
+    subset_text: Optional[str] = None,
+    variations: Optional[dict[str, float]] = None,
+) -> FontProperties:
+    """
+    Async version of [`load_font()`](load_font.md). The font is loaded in a worker
+    thread, so the event loop is not blocked, and concurrent awaits for the same
+    font share a single download.
+
+    Args:
+        font_url: A URL pointing to a binary font file or the local file path of the font.
+        use_cache: Whether or not to cache fonts (to make pyfonts faster). Default to `True`.
+        danger_not_verify_ssl: Whether or not to to skip SSL certificate on
+            `ssl.SSLCertVerificationError`. See [`load_font()`](load_font.md).
+        subset_text: If passed, the font is reduced to the glyphs needed to render
+            this text. See [`load_font()`](load_font.md).
+        variations: Axis coordinates of a variable font (e.g., `{"wght": 650}`).
+            See [`load_font()`](load_font.md).
+
+    Returns:
+        matplotlib.font_manager.FontProperties: A `FontProperties` object containing the loaded font.
+
+    Examples:
+
+        ```python
+        from pyfonts import aload_font
+
+        font = await aload_font(
+            "https://github.com/y-sunflower/pyfonts/blob/main/tests/Ultra-Regular.ttf?raw=true"
+        )
+        ```
+    """
+    return await _run_shared(
+        load_font,
+        font_url=font_url,
+        use_cache=use_cache,
+        danger_not_verify_ssl=danger_not_verify_ssl,
+        subset_text=subset_text,
+        variations=variations,
+    )
+
+
+async def aload_google_font(
+    family: str,
+    weight: Optional[Union[int, str]] = None,
+    italic: Optional[bool] = None,
+    allowed_formats: list[str] = ["woff2", "woff", "ttf", "otf"],
+    use_cache: bool = True,
+    danger_not_verify_ssl: bool = False,
+    text: Optional[str] = None,
+    variations: Optional[dict[str, float]] = None,
+) -> FontProperties:
+    """
+    Async version of [`load_google_font()`](load_google_font.md), that takes the
+    same arguments. The event loop is not blocked, and concurrent awaits for the
+    same font share a single download.
+
+    Returns:
+        matplotlib.font_manager.FontProperties: A `FontProperties` object containing the loaded font.
+
+    Examples:
+
+        ```python
+        import asyncio
+        from pyfonts import aload_google_font
+
+        regular, bold = await asyncio.gather(
+            aload_google_font("Roboto"),
+            aload_google_font("Roboto", weight="bold"),
+        )
+        ```
+    """
+    return await _run_shared(
+        load_google_font,
+        family=family,
+        weight=weight,
+        italic=italic,
+        allowed_formats=allowed_formats,
+        use_cache=use_cache,
+        danger_not_verify_ssl=danger_not_verify_ssl,
+        text=text,
+        variations=variations,
+    )
+
+
+async def aload_bunny_font(
+    family: str,
+    weight: Optional[Union[int, str]] = None,
+    italic: Optional[bool] = None,
+    allowed_formats: list[str] = ["woff", "ttf", "otf"],
+    use_cache: bool = True,
+    danger_not_verify_ssl: bool = False,
+    text: Optional[str] = None,
+) -> FontProperties:
+    """
+    Async version of [`load_bunny_font()`](load_bunny_font.md), that takes the
+    same arguments. The event loop is not blocked, and concurrent awaits for the
+    same font share a single download.
+
+    Returns:
+        matplotlib.font_manager.FontProperties: A `FontProperties` object containing the loaded font.
+
+    Examples:
+
+        ```python
+        import asyncio
+        from pyfonts import aload_bunny_font
+
+        regular, bold = await asyncio.gather(
+            aload_bunny_font("Roboto"),
+            aload_bunny_font("Roboto", weight="bold"),
+        )
+        ```
+    """
+    return await _run_shared(
+        load_bunny_font,
+        family=family,
+        weight=weight,
+        italic=italic,
+        allowed_formats=allowed_formats,
+        use_cache=use_cache,
+        danger_not_verify_ssl=danger_not_verify_ssl,
+        text=text,
+    )
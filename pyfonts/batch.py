@@ -0,0 +1,302 @@
+import functools
+import inspect
+import json
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, Sequence, Union
+from matplotlib.font_manager import FontProperties
+
+from pyfonts.main import load_font
+from pyfonts.google import load_google_font
+from pyfonts.bunny import load_bunny_font
+from pyfonts.cache import _cache_key, _url_cache_get
+from pyfonts.providers import CSSProvider, FontProvider, get_provider
+from pyfonts.utils import (
+    _endpoint_key,
+    _resolve_family_urls,
+    _map_weight_to_numeric,
+)
+
+FontRequest = Union[str, dict]
+
+
+def _load_concurrently(
+    loader: Callable[..., FontProperties],
+    calls: list[dict],
+    max_workers: int,
+    prefetches: Sequence[tuple[Callable[[], None], list[int]]] = (),
+) -> list[FontProperties]:
+    """
+    Run `loader(**call)` for each call in a bounded thread pool and return the
+    results in input order. Identical calls are only run once.
+
+    Args:
+        loader: The function used to load a single font.
+        calls: List of keyword arguments to pass to `loader`.
+        max_workers: Maximum number of threads used at the same time.
+        prefetches: Functions to run in the same pool before some of the
+            calls, with the indices of these calls in `calls`.
+
+    Returns:
+        A list of `FontProperties`, in the same order as `calls`.
+    """
+    if max_workers < 1:
+        raise ValueError(f"`max_workers` must be at least 1, not {max_workers}.")
+    if not calls:
+        return []
+
+    keys: list[str] = [json.dumps(call, sort_keys=True, default=str) for call in calls]
+    unique_calls: dict[str, dict] = dict(zip(keys, calls))
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_calls))) as pool:
+        # prefetches are submitted first, so they are started before the
+        # loads that wait for them and these loads can't fill the pool
+        waits: dict[str, Future] = {}
+        for prefetch, indices in prefetches:
+            future: Future = pool.submit(prefetch)
+            for i in indices:
+                waits[keys[i]] = future
+        futures = {
+            key: pool.submit(_load_after, waits.get(key), loader, call)
+            for key, call in unique_calls.items()
+        }
+        results: dict[str, FontProperties] = {
+            key: future.result() for key, future in futures.items()
+        }
+
+    # identical calls get their own copy, so that changing the size, style,
+    # etc of one font does not change the others
+    return [results[key].copy() for key in keys]
+
+
+def _load_after(
+    prefetch: Optional[Future], loader: Callable[..., FontProperties], call: dict
+) -> FontProperties:
+    if prefetch is not None:
+        wait([prefetch])
+    return loader(**call)
+
+
+def _normalize_requests(fonts: list[FontRequest], **kwargs) -> list[dict]:
+    calls: list[dict] = []
+    for font in fonts:
+        if isinstance(font, str):
+            font = {"family": font}
+        elif not isinstance(font, dict):
+            raise TypeError(
+                f"Each font must be a family name or a dict of arguments, not {type(font).__name__}."
+            )
+        calls.append({**kwargs, **font})
+    return calls
+
+
+def _family_prefetches(
+    loader: Callable[..., FontProperties],
+    provider: FontProvider,
+    calls: list[dict],
+) -> list[tuple[Callable[[], None], list[int]]]:
+    """
+    Group the requested variants of each family, so that their urls are
+    resolved with a single CSS request per family, instead of one request per
+    variant.
+
+    Args:
+        loader: The function used to load a single font, for its defaults.
+        provider: The font provider. Only providers with a CSS API can
+            resolve several variants at once.
+        calls: List of keyword arguments that will be passed to `loader`.
+
+    Returns:
+        For each family with several variants to resolve, a function that
+        resolves them, and the indices of the calls of this family.
+    """
+    if not isinstance(provider, CSSProvider):
+        return []
+    defaults: dict = {
+        name: param.default
+        for name, param in inspect.signature(loader).parameters.items()
+    }
+
+    families: dict[tuple, dict] = {}
+    for i, call in enumerate(calls):
+        call = {**defaults, **call}
+        if not call.get("use_cache", True) or call.get("allowed_formats") is None:
+            continue
+        weight: Optional[int] = call.get("weight")
+        if weight is not None:
+            weight = _map_weight_to_numeric(weight)
+        key: str = _cache_key(
+            call["family"],
+            weight,
+            call.get("italic"),
+            call["allowed_formats"],
+            _endpoint_key(provider.endpoint),
+        )
+        if _url_cache_get(key) is not None:
+            continue
+        family: dict = families.setdefault(
+            (call["family"], tuple(call["allowed_formats"])), {}
+        )
+        family.setdefault((weight, bool(call.get("italic"))), []).append(i)
+
+    prefetches: list[tuple[Callable[[], None], list[int]]] = []
+    for (family, allowed_formats), variants in families.items():
+        if len(variants) < 2:
+            continue
+        prefetch = functools.partial(
+            _prefetch_family_urls,
+            provider.endpoint,
+            family,
+            list(variants),
+            list(allowed_formats),
+        )
+        prefetches.append(
+            (prefetch, [i for indices in variants.values() for i in indices])
+        )
+    return prefetches
+
+
+def _prefetch_family_urls(
+    endpoint: str,
+    family: str,
+    variants: list[tuple[Optional[int], bool]],
+    allowed_formats: list[str],
+) -> None:
+    try:
+        _resolve_family_urls(
+            endpoint=endpoint,
+            family=family,
+            variants=variants,
+            allowed_formats=allowed_formats,
+            use_cache=True,
+        )
+    except Exception:
+        # this is only a shortcut: when the combined request fails (for
+        # instance because one variant does not exist), each font is
+        # resolved on its own and gets its own error message
+        pass
+
+
+def load_fonts(
+    font_urls: list[str],
+    use_cache: bool = True,
+    danger_not_verify_ssl: bool = False,
+    max_workers: int = 8,
+) -> list[FontProperties]:
+    """
+    Load several fonts from remote urls or local files at once. Fonts are downloaded
+    concurrently, so the total time is roughly the one of the slowest font.
+
+    Args:
+        font_urls: List of urls or local paths, as accepted by [`load_font()`](load_font.md).
+        use_cache: Whether or not to cache fonts (to make pyfonts faster). Default to `True`.
+        danger_not_verify_ssl: Whether or not to to skip SSL certificate on
+            `ssl.SSLCertVerificationError`. See [`load_font()`](load_font.md).
+        max_workers: Maximum number of fonts loaded at the same time. Default to `8`.
+
+    Returns:
+        A list of `FontProperties`, in the same order as `font_urls`.
+
+    Examples:
+
+        ```python
+        from pyfonts import load_fonts
+
+        ultra, amarante = load_fonts(
+            [
+                "https://github.com/y-sunflower/pyfonts/blob/main/tests/Ultra-Regular.ttf?raw=true",
+                "https://github.com/y-sunflower/pyfonts/blob/main/tests/Amarante-Regular.ttf?raw=true",
+            ]
+        )
+        ```
+    """
+    calls: list[dict] = [
+        {
+            "font_url": font_url,
+            "use_cache": use_cache,
+            "danger_not_verify_ssl": danger_not_verify_ssl,
+        }
+        for font_url in font_urls
+    ]
+    return _load_concurrently(load_font, calls, max_workers=max_workers)
+
+
+def load_google_fonts(
+    fonts: list[FontRequest],
+    max_workers: int = 8,
+    **kwargs,
+) -> list[FontProperties]:
+    """
+    Load several fonts from Google Fonts at once. The variants of a same family
+    are resolved with a single CSS request, and the font downloads are done
+    concurrently.
+
+    Args:
+        fonts: List of fonts to load. Each element is either a family name
+            (e.g., "Roboto") or a dict of arguments passed to
+            [`load_google_font()`](load_google_font.md) (e.g., `{"family": "Roboto", "weight": "bold"}`).
+        max_workers: Maximum number of fonts loaded at the same time. Default to `8`.
+        kwargs: Default arguments passed to `load_google_font()` for every font
+            (e.g., `use_cache=False`). Values in `fonts` take precedence.
+
+    Returns:
+        A list of `FontProperties`, in the same order as `fonts`.
+
+    Examples:
+
+        ```python
+        from pyfonts import load_google_fonts
+
+        regular, bold, italic = load_google_fonts(
+            [
+                "Roboto",
+                {"family": "Roboto", "weight": "bold"},
+                {"family": "Roboto", "italic": True},
+            ]
+        )
+        ```
+    """
+    calls: list[dict] = _normalize_requests(fonts, **kwargs)
+    return _load_concurrently(
+        load_google_font,
+        calls,
+        max_workers=max_workers,
+        prefetches=_family_prefetches(load_google_font, get_provider("google"), calls),
+    )
+
+
+def load_bunny_fonts(
+    fonts: list[FontRequest],
+    max_workers: int = 8,
+    **kwargs,
+) -> list[FontProperties]:
+    """
+    Load several fonts from Bunny Fonts at once. The variants of a same family
+    are resolved with a single CSS request, and the font downloads are done
+    concurrently.
+
+    Args:
+        fonts: List of fonts to load. Each element is either a family name
+            (e.g., "Roboto") or a dict of arguments passed to
+            [`load_bunny_font()`](load_bunny_font.md) (e.g., `{"family": "Roboto", "weight": "bold"}`).
+        max_workers: Maximum number of fonts loaded at the same time. Default to `8`.
+        kwargs: Default arguments passed to `load_bunny_font()` for every font
+            (e.g., `use_cache=False`). Values in `fonts` take precedence.
+
+    Returns:
+        A list of `FontProperties`, in the same order as `fonts`.
+
+    Examples:
+
+        ```python
+        from pyfonts import load_bunny_fonts
+
+        regular, bold = load_bunny_fonts(["Roboto", {"family": "Roboto", "weight": "bold"}])
+        ```
+    """
+    calls: list[dict] = _normalize_requests(fonts, **kwargs)
+    return _load_concurrently(
+        load_bunny_font,
+        calls,
+        max_workers=max_workers,
+        prefetches=_family_prefetches(load_bunny_font, get_provider("bunny"), calls),
+    )
@@ -1,8 +1,7 @@
 from typing import Optional, Union, List
 from matplotlib.font_manager import FontProperties
 
-from pyfonts import load_font
-from pyfonts.utils import _get_fonturl
+from pyfonts.providers import load_provider_font
 
 
 def load_bunny_font(
@@ -12,6 +11,7 @@ def load_bunny_font(
     allowed_formats: List[str] = ["woff", "ttf", "otf"],
     use_cache: bool = True,
     danger_not_verify_ssl: bool = False,
+    text: Optional[str] = None,
 ) -> FontProperties:
     """
     Load a font from bunny Fonts with specified styling options and return a font property
@@ -33,6 +33,11 @@ def load_bunny_font(
             `ssl.SSLCertVerificationError`. If `True`, it's a **security risk** (such as data breaches or
             man-in-the-middle attacks), but can be convenient in some cases, like local
             development when behind a firewall.
+        text: The text that will be rendered with the font. Bunny Fonts splits
+            fonts into subsets (latin, cyrillic, etc). If `text` is passed,
+            only the subsets with characters of the text are downloaded (and
+            merged into one font if there are several), instead of the whole
+            font.
 
     Returns:
         matplotlib.font_manager.FontProperties: A `FontProperties` object containing the loaded font.
@@ -46,19 +51,16 @@ def load_bunny_font(
         font = load_bunny_font("Roboto", weight="bold") # bold font
         font = load_bunny_font("Roboto", italic=True) # italic font
         font = load_bunny_font("Roboto", weight="bold", italic=True) # italic and bold
+        font = load_bunny_font("Roboto", text="Привет") # only the needed subsets
         ```
     """
-    font_url = _get_fonturl(
-        endpoint="https://fonts.bunny.net/css",
-        family=family,
+    return load_provider_font(
+        family,
+        provider="bunny",
         weight=weight,
         italic=italic,
         allowed_formats=allowed_formats,
         use_cache=use_cache,
-    )
-
-    return load_font(
-        font_url,
-        use_cache=use_cache,
         danger_not_verify_ssl=danger_not_verify_ssl,
+        text=text,
     )
@@ -2,26 +2,65 @@ import shutil
 import hashlib
 import os
 import json
+import pathlib
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Optional
 from urllib.parse import urlparse
 
+from matplotlib.font_manager import fontManager
+
+from pyfonts.decompress import _CONVERTER_VERSION
+from pyfonts.lock import _remove_unused_lock
+from pyfonts.memory import _FONT_MEMO
+from pyfonts.metrics import _stage
+
+# legacy whole-file JSON url cache, only read to migrate it to the index
 _CACHE_FILE: str = os.path.join(
     os.path.expanduser("~"),
     ".cache",
     ".pyfonts_google_cache.json",
 )
+_INDEX_FILENAME: str = ".pyfonts_cache.sqlite3"
+_FONTS_DIRNAME: str = "pyfontsloader"
+# cache locations set with `configure_cache()`, they take precedence over
+# the PYFONTS_CACHE_DIR and PYFONTS_SHARED_CACHE_DIRS environment variables
+_CACHE_ROOT: Optional[str] = None
+_SHARED_CACHE_ROOTS: Optional[list] = None
 _MEMORY_CACHE: dict = {}
+# a stale cache entry that can't be revalidated (e.g., the server is down) is
+# used for this long before trying again, in seconds
+_REVALIDATION_BACKOFF: float = 300.0
+_LOCAL = threading.local()
 
+# limits of the font file cache, see `configure_cache()`
+_MAX_CACHE_SIZE: Optional[int] = None
+_MAX_CACHE_AGE: Optional[float] = None
+# how often (in seconds) the font file cache is pruned, across all processes
+_PRUNE_INTERVAL: float = 3600
+_PRUNE_STARTED: bool = False
+_PRUNE_LOCK = threading.Lock()
+_UNSET: Any = object()
 
-def _cache_key(family: str, weight, italic, allowed_formats: list[str]) -> str:
-    key_str: str = json.dumps(
-        {
-            "family": family,
-            "weight": weight,
-            "italic": italic,
-            "allowed_formats": allowed_formats,
-        },
-        sort_keys=True,
-    )
+
+def _cache_key(
+    family: str,
+    weight,
+    italic,
+    allowed_formats: list[str],
+    endpoint: Optional[str] = None,
+) -> str:
+    key: dict = {
+        "family": family,
+        "weight": weight,
+        "italic": italic,
+        "allowed_formats": allowed_formats,
+    }
+    if endpoint is not None:
+        key["endpoint"] = endpoint
+    key_str: str = json.dumps(key, sort_keys=True)
     return hashlib.sha256(key_str.encode()).hexdigest()
 
 
@@ -35,14 +74,196 @@ def _load_cache_from_disk() -> dict:
         return {}
 
 
-def _save_cache_to_disk() -> None:
+def _connect() -> sqlite3.Connection:
+    """
+    Get this thread's connection to the cache index, opening it if needed.
+
+    The index is a SQLite database in WAL mode, so any number of processes
+    can read it while another one writes, and each entry is written on its
+    own in an atomic transaction.
+    """
+    index_file: str = _get_index_file()
+    conn: Optional[sqlite3.Connection] = getattr(_LOCAL, "conn", None)
+    # connections must not be shared with forked processes
+    if conn is not None and _LOCAL.pid == os.getpid() and _LOCAL.path == index_file:
+        return conn
+
+    os.makedirs(os.path.dirname(index_file), exist_ok=True)
+    conn = sqlite3.connect(index_file, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS url_cache (key TEXT PRIMARY KEY, url TEXT NOT NULL)"
+    )
+    # font files are stored by content hash: `font_blobs` maps each font url to
+    # its file, and `blob_sources` maps the hash of a downloaded woff/woff2 file
+    # (and the converter version) to its converted ttf file, so that identical
+    # fonts are converted once
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS font_blobs (url TEXT PRIMARY KEY, "
+        "sha256 TEXT NOT NULL, ext TEXT NOT NULL, size INTEGER NOT NULL)"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS blob_sources (raw_sha256 TEXT PRIMARY KEY, "
+        "sha256 TEXT NOT NULL, ext TEXT NOT NULL, size INTEGER NOT NULL)"
+    )
+    # freshness of the url cache entries (keyed by cache key) and of the font
+    # files (keyed by font url), with the url to revalidate them
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS validators (key TEXT PRIMARY KEY, url TEXT NOT NULL, "
+        "etag TEXT, last_modified TEXT, expires REAL)"
+    )
+    _migrate_json_cache(conn)
+
+    _LOCAL.conn, _LOCAL.pid, _LOCAL.path = conn, os.getpid(), index_file
+    return conn
+
+
+def _migrate_json_cache(conn: sqlite3.Connection) -> None:
+    legacy: dict = _load_cache_from_disk()
+    if legacy:
+        conn.executemany(
+            "INSERT OR IGNORE INTO url_cache (key, url) VALUES (?, ?)",
+            legacy.items(),
+        )
+    if os.path.exists(_CACHE_FILE):
+        try:
+            os.remove(_CACHE_FILE)
+        except OSError:
+            pass
+
+
+def _connect_shared(root: str) -> Optional[sqlite3.Connection]:
+    """
+    Get this thread's read-only connection to the index of a shared cache,
+    or `None` if it has no index.
+    """
+    conns: dict = _LOCAL.__dict__.setdefault("shared_conns", {})
+    key: tuple = (os.getpid(), root)
+    if key not in conns:
+        index_file: str = os.path.join(root, _INDEX_FILENAME)
+        if not os.path.exists(index_file):
+            return None
+        # shared caches may be on read-only volumes, where SQLite can't
+        # create its lock files, so they are opened as immutable
+        uri: str = f"{pathlib.Path(index_file).absolute().as_uri()}?immutable=1"
+        conns[key] = sqlite3.connect(uri, uri=True)
+    return conns[key]
+
+
+def _url_cache_get(key: str) -> Optional[str]:
+    """
+    Get a font url from the in-memory cache, falling back to the shared
+    cache indexes, then to the on-disk index.
+    """
+    if key in _MEMORY_CACHE:
+        return _MEMORY_CACHE[key]
+    query: str = "SELECT url FROM url_cache WHERE key = ?"
+    row = None
+    for root in _get_shared_cache_roots():
+        try:
+            conn: Optional[sqlite3.Connection] = _connect_shared(root)
+            row = conn.execute(query, (key,)).fetchone() if conn else None
+        except sqlite3.Error:
+            row = None
+        if row is not None:
+            break
+    if row is None:
+        try:
+            row = _connect().execute(query, (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+    if row is None:
+        return None
+    _MEMORY_CACHE[key] = row[0]
+    return row[0]
+
+
+def _url_cache_set(key: str, url: str) -> None:
+    """
+    Store a font url in the in-memory cache and in the on-disk index.
+    """
+    _MEMORY_CACHE[key] = url
     try:
-        with open(_CACHE_FILE, "w") as f:
-            json.dump(_MEMORY_CACHE, f)
-    except Exception:
+        _connect().execute(
+            "INSERT OR REPLACE INTO url_cache (key, url) VALUES (?, ?)", (key, url)
+        )
+    except sqlite3.Error:
         pass
 
 
+def _validators_get(key: str) -> Optional[dict]:
+    """
+    Get the validators stored with a cache entry, if any.
+    """
+    query: str = (
+        "SELECT url, etag, last_modified, expires FROM validators WHERE key = ?"
+    )
+    try:
+        row = _connect().execute(query, (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    return dict(zip(("url", "etag", "last_modified", "expires"), row))
+
+
+def _validators_set(key: str, url: str, validators: dict) -> None:
+    """
+    Store the validators of a cache entry, with the url to revalidate it.
+    """
+    try:
+        _connect().execute(
+            "INSERT OR REPLACE INTO validators (key, url, etag, last_modified, expires) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                key,
+                url,
+                validators.get("etag"),
+                validators.get("last_modified"),
+                validators.get("expires"),
+            ),
+        )
+    except sqlite3.Error:
+        pass
+
+
+def _renew_validators(
+    key: str, validators: dict, new_validators: Optional[dict] = None
+) -> None:
+    """
+    Store the validators of a revalidated cache entry. Without new validators,
+    because the entry could not be revalidated, the entry is kept as is for
+    `_REVALIDATION_BACKOFF` seconds before trying again.
+    """
+    if new_validators is None:
+        new_validators = {
+            "etag": None,
+            "last_modified": None,
+            "expires": time.time() + _REVALIDATION_BACKOFF,
+        }
+    _validators_set(
+        key,
+        validators["url"],
+        {
+            "etag": new_validators["etag"] or validators["etag"],
+            "last_modified": new_validators["last_modified"]
+            or validators["last_modified"],
+            "expires": new_validators["expires"],
+        },
+    )
+
+
+def _is_stale(validators: Optional[dict]) -> bool:
+    """
+    Whether a cache entry must be revalidated. Entries without freshness
+    information never expire.
+    """
+    if validators is None or validators["expires"] is None:
+        return False
+    return time.time() >= validators["expires"]
+
+
 def clear_pyfonts_cache(verbose: bool = True) -> None:
     """
     Cleans both:
@@ -72,15 +293,22 @@ def clear_pyfonts_cache(verbose: bool = True) -> None:
         if verbose:
             print("No font cache directory found. Nothing to clean.")
 
-    # clear the Google Fonts URL cache
+    # clear the in-memory fonts and the Google Fonts URL cache
+    _FONT_MEMO.clear()
     global _MEMORY_CACHE
     _MEMORY_CACHE.clear()
 
-    if os.path.exists(_CACHE_FILE):
+    index_file: str = _get_index_file()
+    if os.path.exists(index_file) or os.path.exists(_CACHE_FILE):
         try:
-            os.remove(_CACHE_FILE)
+            if os.path.exists(_CACHE_FILE):
+                os.remove(_CACHE_FILE)
+            if os.path.exists(index_file):
+                conn: sqlite3.Connection = _connect()
+                for table in ("url_cache", "font_blobs", "blob_sources", "validators"):
+                    conn.execute(f"DELETE FROM {table}")
             if verbose:
-                print(f"Google Fonts URL cache cleared: {_CACHE_FILE}")
+                print(f"Google Fonts URL cache cleared: {index_file}")
         except Exception as e:
             if verbose:
                 print(f"Failed to remove Google Fonts cache file: {e}")
@@ -89,18 +317,472 @@ def clear_pyfonts_cache(verbose: bool = True) -> None:
             print("No Google Fonts cache file found. Nothing to clean.")
 
 
+def configure_cache(
+    max_size: Optional[int] = _UNSET,
+    max_age: Optional[float] = _UNSET,
+    cache_dir: Optional[str] = _UNSET,
+    shared_cache_dirs: Optional[list[str]] = _UNSET,
+) -> None:
+    """
+    Set the location of the cache and limits on the font file cache. When the
+    cache goes over its limits, the least recently used fonts are removed. Only
+    the arguments that are passed are changed.
+
+    Shared caches are read-only caches checked before the regular one. They are
+    typically created at build time (for example in a Docker image) by loading
+    fonts with `cache_dir` pointing to the shared location, so that containers
+    started from it don't have to download anything.
+
+    Pruning runs in a background thread the first time the cache is used
+    in a process (at most once an hour across processes), so it never
+    slows down font loading. It can also be run manually with
+    [`prune_pyfonts_cache()`](cache.md#pyfonts.prune_pyfonts_cache).
+
+    Args:
+        max_size: Maximum size of the font cache, in bytes. `None` means no limit.
+            Default is `None`.
+        max_age: Maximum time, in seconds, a cached font is kept without being
+            used. `None` means no limit. Default is `None`.
+        cache_dir: Directory where the cache is stored. `None` means the
+            `PYFONTS_CACHE_DIR` environment variable if set, otherwise `~/.cache`.
+        shared_cache_dirs: Directories of read-only caches, checked in order before
+            the regular cache. `None` means the `PYFONTS_SHARED_CACHE_DIRS`
+            environment variable (directories separated by `os.pathsep`) if set.
+
+    Examples:
+
+        ```python
+        from pyfonts import configure_cache
+
+        configure_cache(max_size=200 * 1024**2, max_age=30 * 24 * 3600)
+        configure_cache(cache_dir="/tmp/pyfonts", shared_cache_dirs=["/opt/fonts"])
+        ```
+    """
+    global _MAX_CACHE_SIZE, _MAX_CACHE_AGE, _CACHE_ROOT, _SHARED_CACHE_ROOTS
+
+    if max_size is not _UNSET:
+        if max_size is not None and max_size < 0:
+            raise ValueError(f"`max_size` must be positive, not {max_size}.")
+        _MAX_CACHE_SIZE = max_size
+    if max_age is not _UNSET:
+        if max_age is not None and max_age < 0:
+            raise ValueError(f"`max_age` must be positive, not {max_age}.")
+        _MAX_CACHE_AGE = max_age
+    if cache_dir is not _UNSET:
+        _CACHE_ROOT = cache_dir
+    if shared_cache_dirs is not _UNSET:
+        _SHARED_CACHE_ROOTS = (
+            None if shared_cache_dirs is None else list(shared_cache_dirs)
+        )
+
+
+def prune_pyfonts_cache(verbose: bool = True) -> None:
+    """
+    Remove fonts from the font cache directory until it respects the limits
+    set with [`configure_cache()`](cache.md#pyfonts.configure_cache): fonts not
+    used for more than `max_age` first, then the least recently used ones until
+    the cache is smaller than `max_size`. Fonts loaded in the current process are
+    kept.
+
+    Args:
+        `verbose`: Whether or not to print a cache cleanup message.
+            The default value is `True`.
+
+    Examples:
+
+        ```python
+        from pyfonts import prune_pyfonts_cache
+
+        prune_pyfonts_cache()
+        ```
+    """
+    removed, freed = _prune_cache_dir()
+    if verbose:
+        print(f"Removed {removed} font(s) from the cache ({freed / 1024**2:.1f} MB).")
+
+
+def _prune_cache_dir() -> tuple[int, int]:
+    """
+    Apply the cache limits to the font cache directory.
+
+    Cached fonts store the time they were downloaded as their modification
+    time, and the last time they were used as their access time (see
+    `_touch_cached_font()`). The index entries of the removed fonts are
+    removed with them.
+
+    Returns:
+        The number of removed fonts and the number of bytes freed.
+    """
+    cache_dir: str = _get_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return 0, 0
+
+    now: float = time.time()
+    # fonts loaded in this process can still be used by matplotlib
+    in_use: set = _FONT_MEMO.files() | {
+        os.path.abspath(entry.fname) for entry in fontManager.ttflist
+    }
+    fonts: list = []
+    locks: list = []
+    for entry in os.scandir(cache_dir):
+        if not entry.is_file() or entry.name.startswith("."):
+            continue
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        if entry.name.endswith(".tmp"):
+            # leftovers of an interrupted download
+            if now - stat.st_mtime > _PRUNE_INTERVAL:
+                _remove_quietly(entry.path)
+        elif entry.name.endswith(".lock"):
+            locks.append((stat.st_mtime, entry.path))
+        elif os.path.abspath(entry.path) not in in_use:
+            fonts.append((stat.st_atime, stat.st_size, entry.path))
+
+    to_remove: list = []
+    if _MAX_CACHE_AGE is not None:
+        to_remove += [f for f in fonts if now - f[0] > _MAX_CACHE_AGE]
+        fonts = [f for f in fonts if now - f[0] <= _MAX_CACHE_AGE]
+    if _MAX_CACHE_SIZE is not None:
+        total_size: int = sum(f[1] for f in fonts)
+        for font in sorted(fonts):
+            if total_size <= _MAX_CACHE_SIZE:
+                break
+            to_remove.append(font)
+            total_size -= font[1]
+
+    removed, freed = _remove_fonts([(size, path) for _, size, path in to_remove])
+    # locks are touched each time they are acquired, so old locks are
+    # unused, unless a download holds them since then
+    for mtime, path in locks:
+        if now - mtime > _PRUNE_INTERVAL:
+            _remove_unused_lock(path)
+    return removed, freed
+
+
+def _remove_fonts(fonts: list) -> tuple[int, int]:
+    """
+    Remove `(size, path)` fonts from the font cache directory, and their
+    entries from the index in the same transaction.
+
+    Returns:
+        The number of removed fonts and the number of bytes freed.
+    """
+    if not fonts:
+        return 0, 0
+    try:
+        conn: Optional[sqlite3.Connection] = _connect()
+        conn.execute("BEGIN IMMEDIATE")
+    except sqlite3.Error:
+        conn = None
+
+    removed, freed = 0, 0
+    try:
+        for size, path in fonts:
+            if not _remove_quietly(path):
+                continue
+            removed += 1
+            freed += size
+            if conn is not None:
+                # blobs are named `{sha256}{ext}`
+                name: str = os.path.basename(path)
+                blob: tuple = (name[:64], name[64:])
+                conn.execute(
+                    "DELETE FROM font_blobs WHERE sha256 = ? AND ext = ?", blob
+                )
+                conn.execute(
+                    "DELETE FROM blob_sources WHERE sha256 = ? AND ext = ?", blob
+                )
+        if conn is not None:
+            conn.execute("COMMIT")
+    except sqlite3.Error:
+        if conn is not None and conn.in_transaction:
+            conn.execute("ROLLBACK")
+    return removed, freed
+
+
+def _remove_quietly(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+def _prune_in_background() -> None:
+    """
+    Prune the font cache in a daemon thread, once per process, and only if
+    no process did it in the last `_PRUNE_INTERVAL` seconds.
+    """
+    global _PRUNE_STARTED
+    with _PRUNE_LOCK:
+        if _PRUNE_STARTED:
+            return
+        _PRUNE_STARTED = True
+
+    marker: str = os.path.join(_get_cache_dir(), ".last_prune")
+    try:
+        if time.time() - os.path.getmtime(marker) < _PRUNE_INTERVAL:
+            return
+    except OSError:
+        pass
+
+    def prune() -> None:
+        try:
+            with open(marker, "w"):
+                pass
+            _prune_cache_dir()
+        except OSError:
+            pass
+
+    threading.Thread(target=prune, name="pyfonts-cache-prune", daemon=True).start()
+
+
+def _touch_cached_font(cached_fontfile: str) -> None:
+    """
+    Record that a cached font was used, by setting its access time (the
+    modification time is kept as the download time).
+    """
+    try:
+        os.utime(cached_fontfile, (time.time(), os.path.getmtime(cached_fontfile)))
+    except OSError:
+        pass
+
+
+def _needs_decompression(font_url: str) -> bool:
+    """
+    Whether the font at this url is a woff/woff2 file, which matplotlib
+    can't read and must be converted to ttf first.
+    """
+    _, ext = os.path.splitext(urlparse(font_url).path)
+    return ext.lower() in (".woff", ".woff2")
+
+
+def _font_cache_id(font_url: str) -> tuple[str, str]:
+    """
+    Get the id of a font url in the cache, and the extension of its cached file.
+    """
+    _, ext = os.path.splitext(os.path.basename(urlparse(font_url).path))
+    if _needs_decompression(font_url):
+        # woff/woff2 files are stored already converted to ttf, keyed by
+        # the converter version so that a warm load never decompresses.
+        return f"{font_url}#ttf-v{_CONVERTER_VERSION}", ".ttf"
+    return font_url, ext
+
+
 def _create_cache_from_fontfile(font_url):
-    parsed_url = urlparse(font_url)
-    url_path = parsed_url.path
-    filename = os.path.basename(url_path)
-    _, ext = os.path.splitext(filename)
-    url_hash: str = hashlib.sha256(font_url.encode()).hexdigest()
+    cache_id, ext = _font_cache_id(font_url)
+    url_hash: str = hashlib.sha256(cache_id.encode()).hexdigest()
     cache_filename: str = f"{url_hash}{ext}"
     cache_dir: str = _get_cache_dir()
     os.makedirs(cache_dir, exist_ok=True)
+    _prune_in_background()
     cached_fontfile: str = os.path.join(cache_dir, cache_filename)
     return cached_fontfile, cache_dir
 
 
+def _is_font_file(path: str) -> bool:
+    """
+    Check that a file can be parsed as a font.
+    """
+    from matplotlib.ft2font import FT2Font
+
+    try:
+        with _stage("parse", file=path):
+            FT2Font(path)
+    except Exception:
+        return False
+    return True
+
+
+def _valid_blob(cache_dir: str, row: Optional[tuple]) -> Optional[str]:
+    """
+    Get the path of a blob from its `(sha256, ext, size)` index row, if the
+    file exists and has the expected size. Since blobs are checked before
+    being added to the index, written atomically and named after their
+    content hash, this is enough to trust them.
+    """
+    if row is None:
+        return None
+    sha256, ext, size = row
+    path: str = os.path.join(cache_dir, f"{sha256}{ext}")
+    try:
+        if os.path.getsize(path) == size:
+            return path
+    except OSError:
+        pass
+    return None
+
+
+def _cached_blob(font_url: str) -> Optional[str]:
+    """
+    Get the cached file of a font url, from the shared caches first, then
+    from the regular cache.
+    """
+    cache_id, _ = _font_cache_id(font_url)
+    query: str = "SELECT sha256, ext, size FROM font_blobs WHERE url = ?"
+    for root in _get_shared_cache_roots():
+        try:
+            conn: Optional[sqlite3.Connection] = _connect_shared(root)
+            row = conn.execute(query, (cache_id,)).fetchone() if conn else None
+        except sqlite3.Error:
+            continue
+        path: Optional[str] = _valid_blob(os.path.join(root, _FONTS_DIRNAME), row)
+        if path is not None:
+            return path
+    try:
+        conn = _connect()
+        row = conn.execute(query, (cache_id,)).fetchone()
+    except sqlite3.Error:
+        return None
+    path = _valid_blob(_get_cache_dir(), row)
+    if path is None and row is not None:
+        # the blob is missing or truncated: remove it so it's downloaded again
+        _remove_quietly(os.path.join(_get_cache_dir(), f"{row[0]}{row[1]}"))
+        try:
+            conn.execute("DELETE FROM font_blobs WHERE url = ?", (cache_id,))
+        except sqlite3.Error:
+            pass
+    return path
+
+
+def _converted_blob(raw_sha256: str) -> Optional[tuple]:
+    """
+    Get the `(sha256, ext, size)` of the already converted ttf file of a
+    woff/woff2 file, if any, made with the current converter version.
+    """
+    query: str = "SELECT sha256, ext, size FROM blob_sources WHERE raw_sha256 = ?"
+    try:
+        row = _connect().execute(query, (_source_key(raw_sha256),)).fetchone()
+    except sqlite3.Error:
+        return None
+    return row if _valid_blob(_get_cache_dir(), row) is not None else None
+
+
+def _source_key(raw_sha256: str) -> str:
+    # conversions are keyed by converter version, like the ids of woff/woff2
+    # urls, so that a new converter doesn't reuse previous conversions
+    return f"{raw_sha256}#ttf-v{_CONVERTER_VERSION}"
+
+
+def _link_blob(font_url: str, row: tuple, raw_sha256: Optional[str] = None) -> str:
+    """
+    Record that a font url (and optionally the hash of its downloaded content)
+    points to an existing blob, and return the path of the blob.
+    """
+    cache_id, _ = _font_cache_id(font_url)
+    try:
+        conn: sqlite3.Connection = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO font_blobs (url, sha256, ext, size) "
+            "VALUES (?, ?, ?, ?)",
+            (cache_id, *row),
+        )
+        if raw_sha256 is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO blob_sources (raw_sha256, sha256, ext, size) "
+                "VALUES (?, ?, ?, ?)",
+                (_source_key(raw_sha256), *row),
+            )
+    except sqlite3.Error:
+        pass
+    return os.path.join(_get_cache_dir(), f"{row[0]}{row[1]}")
+
+
+def _store_blob(font_url: str, content: bytes, raw_sha256: Optional[str] = None) -> str:
+    """
+    Store the content of a font in the cache, named after its hash, and
+    record which url it comes from. Identical fonts are only stored once.
+
+    Args:
+        font_url: The url the font was downloaded from.
+        content: The content of the font file, converted to ttf if needed.
+        raw_sha256: The hash of the downloaded content, if it was converted.
+
+    Returns:
+        The path of the cached file.
+    """
+    cache_dir: str = _get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    return _store_blob_file(
+        font_url,
+        tmp_path,
+        hashlib.sha256(content).hexdigest(),
+        len(content),
+        raw_sha256,
+    )
+
+
+def _store_blob_file(
+    font_url: str,
+    tmp_path: str,
+    sha256: str,
+    size: int,
+    raw_sha256: Optional[str] = None,
+) -> str:
+    """
+    Same as `_store_blob()`, for a font already written to a temporary file
+    of the cache directory, that is moved in place.
+
+    Args:
+        font_url: The url the font was downloaded from.
+        tmp_path: Path of the temporary file.
+        sha256: The hash of the content of the file.
+        size: The size of the file.
+        raw_sha256: The hash of the downloaded content, if it was converted.
+
+    Returns:
+        The path of the cached file.
+    """
+    if not _is_font_file(tmp_path):
+        os.remove(tmp_path)
+        raise ValueError(f"The file at '{font_url}' is not a valid font file.")
+
+    _, ext = _font_cache_id(font_url)
+    row: tuple = (sha256, ext, size)
+    cache_dir: str = _get_cache_dir()
+    if _valid_blob(cache_dir, row) is None:
+        os.replace(tmp_path, os.path.join(cache_dir, f"{sha256}{ext}"))
+    else:
+        os.remove(tmp_path)
+    return _link_blob(font_url, row, raw_sha256)
+
+
+def _get_cache_root() -> str:
+    if _CACHE_ROOT is not None:
+        return _CACHE_ROOT
+    return os.environ.get("PYFONTS_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+
+
+def _get_shared_cache_roots() -> list[str]:
+    if _SHARED_CACHE_ROOTS is not None:
+        return _SHARED_CACHE_ROOTS
+    roots: str = os.environ.get("PYFONTS_SHARED_CACHE_DIRS", "")
+    return [root for root in roots.split(os.pathsep) if root]
+
+
 def _get_cache_dir() -> str:
-    return os.path.join(os.path.expanduser("~"), ".cache", "pyfontsloader")
+    return os.path.join(_get_cache_root(), _FONTS_DIRNAME)
+
+
+def _get_index_file() -> str:
+    return os.path.join(_get_cache_root(), _INDEX_FILENAME)
+
+
+def _cached_font_candidates(cached_fontfile: str) -> list[str]:
+    """
+    Get the paths where a cached font may be: in each shared cache, then in
+    the regular cache.
+    """
+    filename: str = os.path.basename(cached_fontfile)
+    shared: list[str] = [
+        os.path.join(root, _FONTS_DIRNAME, filename)
+        for root in _get_shared_cache_roots()
+    ]
+    return shared + [cached_fontfile]
@@ -0,0 +1,239 @@
+import difflib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from pyfonts.cache import _get_cache_root
+from pyfonts.lock import _atomic_write
+from pyfonts.offline import _is_offline
+from pyfonts.session import _http_get
+
+_GOOGLE_METADATA_URL: str = "https://fonts.google.com/metadata/fonts"
+_CATALOG_FILENAME: str = ".pyfonts_google_catalog.json"
+# the catalog is refreshed once a week, and a stale catalog is still used
+# if it can't be refreshed
+_CATALOG_MAX_AGE: float = 7 * 24 * 3600
+
+_CATALOG: Optional[dict] = None
+# whether `_CATALOG` was refreshed if stale, rather than just read from the
+# cache by `_peek_catalog()`
+_CATALOG_CHECKED: bool = False
+_CATALOG_LOCK = threading.Lock()
+
+
+def _get_catalog_file() -> str:
+    return os.path.join(_get_cache_root(), _CATALOG_FILENAME)
+
+
+def _fetch_catalog() -> dict:
+    """
+    Download the metadata of all Google Fonts families, and keep the fields
+    used by pyfonts.
+
+    Returns:
+        A dict mapping each family name to its metadata.
+    """
+    response = _http_get(_GOOGLE_METADATA_URL)
+    response.raise_for_status()
+    # the response starts with `)]}'` to prevent JSON hijacking
+    text: str = response.text
+    metadata: dict = json.loads(text[text.index("{") :])
+
+    catalog: dict = {}
+    for family in metadata["familyMetadataList"]:
+        catalog[family["family"]] = {
+            "axes": {
+                axis["tag"]: [axis["min"], axis["max"], axis["defaultValue"]]
+                for axis in family.get("axes", [])
+            },
+            "styles": sorted(family.get("fonts", {})),
+            "subsets": family.get("subsets", []),
+            "category": family.get("category"),
+        }
+    return catalog
+
+
+def _get_catalog() -> dict:
+    """
+    Get the Google Fonts catalog, from memory, from the cache or from the
+    network, in this order.
+    """
+    global _CATALOG, _CATALOG_CHECKED
+
+    with _CATALOG_LOCK:
+        if _CATALOG is not None and _CATALOG_CHECKED:
+            return _CATALOG
+        _CATALOG_CHECKED = True
+
+        catalog_file: str = _get_catalog_file()
+        is_fresh: bool = (
+            os.path.exists(catalog_file)
+            and time.time() - os.path.getmtime(catalog_file) < _CATALOG_MAX_AGE
+        )
+        if not is_fresh and not _is_offline():
+            try:
+                catalog: dict = _fetch_catalog()
+                os.makedirs(os.path.dirname(catalog_file), exist_ok=True)
+                _atomic_write(catalog_file, json.dumps(catalog).encode())
+                _CATALOG = catalog
+                return _CATALOG
+            except Exception:
+                if not os.path.exists(catalog_file):
+                    raise
+
+        if not os.path.exists(catalog_file):
+            raise RuntimeError(
+                "Offline mode is enabled and the Google Fonts catalog is not in the cache."
+            )
+        with open(catalog_file, "r") as f:
+            _CATALOG = json.load(f)
+        return _CATALOG
+
+
+def _peek_catalog() -> Optional[dict]:
+    """
+    Get the Google Fonts catalog from memory or from the cache, even if it is
+    stale, without network access.
+
+    Returns:
+        The catalog, or `None` if it was never downloaded.
+    """
+    global _CATALOG
+
+    with _CATALOG_LOCK:
+        if _CATALOG is None:
+            try:
+                with open(_get_catalog_file(), "r") as f:
+                    _CATALOG = json.load(f)
+            except (OSError, ValueError):
+                return None
+        return _CATALOG
+
+
+def _unknown_family_message(family: str, catalog: dict) -> str:
+    message: str = f"No family named '{family}' in Google Fonts."
+    suggestions: list[str] = _close_families(family, catalog, limit=3)
+    if suggestions:
+        message += f" Did you mean: {', '.join(repr(s) for s in suggestions)}?"
+    return message
+
+
+def _close_families(query: str, catalog: dict, limit: int) -> list[str]:
+    """
+    Find the families whose name contains the query, then the families with
+    a similar name (e.g., with a typo), ignoring case.
+    """
+    names: dict[str, str] = {name.lower(): name for name in catalog}
+    query = query.lower().strip()
+
+    # exact matches first, then names starting with the query
+    matches: list[str] = sorted(
+        (name for name in names if query in name),
+        key=lambda name: (name != query, not name.startswith(query), len(name), name),
+    )
+    for name in difflib.get_close_matches(query, names, n=limit, cutoff=0.6):
+        if name not in matches:
+            matches.append(name)
+    return [names[name] for name in matches[:limit]]
+
+
+def _resolve_weight(
+    family: str, weight: Optional[int], italic: Optional[bool]
+) -> Optional[int]:
+    """
+    Check a variant of a Google Fonts family against the cached catalog, so
+    that variants that don't exist fail before any request.
+
+    Nothing is checked when the catalog was never downloaded, or when the
+    family is not in it (unless offline), since it can be newer than the
+    catalog.
+
+    Args:
+        family: Name of the font family (e.g., "Roboto").
+        weight: Numeric font weight, or None for the default weight.
+        italic: Whether the font should be italic.
+
+    Returns:
+        The weight to request: the requested weight, or when it is None and
+        the family has no regular weight, the nearest available weight.
+    """
+    catalog: Optional[dict] = _peek_catalog()
+    if catalog is None:
+        return weight
+    if family not in catalog:
+        if _is_offline():
+            raise ValueError(_unknown_family_message(family, catalog))
+        return weight
+
+    # styles are named after the weight, with an `i` suffix for italics
+    suffix: str = "i" if italic else ""
+    weights: list[int] = sorted(
+        int(style[: len(style) - len(suffix)])
+        for style in catalog[family]["styles"]
+        if style.endswith("i") == bool(italic)
+    )
+    style_name: str = "italic" if italic else "normal"
+    if not weights:
+        raise ValueError(f"'{family}' has no {style_name} style in Google Fonts.")
+
+    wght: Optional[list] = catalog[family]["axes"].get("wght")
+    if weight is None:
+        if 400 in weights or (wght is not None and wght[0] <= 400 <= wght[1]):
+            return None
+        return min(weights, key=lambda w: (abs(w - 400), w))
+
+    if weight in weights or (wght is not None and wght[0] <= weight <= wght[1]):
+        return weight
+    raise ValueError(
+        f"'{family}' has no {style_name} weight {weight} in Google Fonts. "
+        f"Valid options are: {', '.join(str(w) for w in weights)}."
+    )
+
+
+def search_families(query: str, limit: int = 10) -> list[str]:
+    """
+    Search the families of Google Fonts by name. Names that contain the query
+    come first, followed by similar names, so that misspelled names are also
+    found.
+
+    The catalog of Google Fonts is downloaded the first time, and cached for
+    a week. Once cached, it's also used to check the weight and style requested
+    from Google Fonts before any request, and to find the nearest available
+    weight of families without a regular weight.
+
+    Args:
+        query: A full or partial family name, in any case.
+        limit: Maximum number of families returned. Default to `10`.
+
+    Returns:
+        The matching family names, best matches first.
+
+    Examples:
+
+        ```python
+        from pyfonts import search_families
+
+        search_families("robto")  # ['Roboto', ...]
+        search_families("mono", limit=3)
+        ```
+    """
+    return _close_families(query, _get_catalog(), limit)
+
+
+def _get_family_axes(family: str) -> dict[str, list[float]]:
+    """
+    Get the variation axes of a Google Fonts family.
+
+    Args:
+        family: Name of the font family (e.g., "Roboto").
+
+    Returns:
+        A dict mapping each axis tag to its `[min, max, default]` values. The
+        dict is empty for families that are not variable fonts.
+    """
+    catalog: dict = _get_catalog()
+    if family not in catalog:
+        raise ValueError(_unknown_family_message(family, catalog))
+    return catalog[family]["axes"]
@@ -0,0 +1,144 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Sequence
+from urllib.parse import urljoin
+
+_FONT_FACE_PATTERN = re.compile(r"@font-face\s*{([^}]*)}", re.IGNORECASE)
+_DESCRIPTOR_PATTERN = re.compile(r"([a-zA-Z-]+)\s*:\s*([^;]+);?")
+_SRC_URL_PATTERN = re.compile(r"url\(\s*['\"]?([^'\")]+)['\"]?\s*\)")
+
+# printable ASCII, used to find the subset of a font with latin characters
+_BASIC_LATIN: range = range(0x20, 0x7F)
+
+
+@dataclass(frozen=True)
+class _FontFace:
+    """
+    One font file of a `@font-face` block of a font provider's CSS.
+    """
+
+    family: str
+    weight: int
+    style: str
+    url: str
+    format: str
+    # inclusive `(start, end)` codepoint ranges, empty if the face has no
+    # `unicode-range` and thus covers every character of the font
+    unicode_range: tuple[tuple[int, int], ...] = ()
+
+    def covers(self, codepoint: int) -> bool:
+        if not self.unicode_range:
+            return True
+        return any(start <= codepoint <= end for start, end in self.unicode_range)
+
+
+def _parse_unicode_range(value: str) -> tuple[tuple[int, int], ...]:
+    """
+    Parse a `unicode-range` descriptor such as `U+0000-00FF, U+0131, U+04??`.
+
+    Args:
+        value: The value of the descriptor.
+
+    Returns:
+        The inclusive `(start, end)` codepoint ranges.
+    """
+    ranges: list[tuple[int, int]] = []
+    for item in value.split(","):
+        item = item.strip().upper()
+        if not item.startswith("U+"):
+            continue
+        item = item[2:]
+        try:
+            if "-" in item:
+                start, end = item.split("-", 1)
+                ranges.append((int(start, 16), int(end, 16)))
+            elif "?" in item:
+                ranges.append(
+                    (int(item.replace("?", "0"), 16), int(item.replace("?", "F"), 16))
+                )
+            else:
+                ranges.append((int(item, 16), int(item, 16)))
+        except ValueError:
+            continue
+    return tuple(ranges)
+
+
+@lru_cache(maxsize=128)
+def _parse_css(css_text: str, base_url: Optional[str] = None) -> tuple[_FontFace, ...]:
+    """
+    Parse all the `@font-face` blocks of a CSS stylesheet. Results are cached,
+    so parsing the same stylesheet again is free.
+
+    Args:
+        css_text: The CSS returned by the font provider.
+        base_url: The url of the stylesheet, against which relative font file
+            urls (e.g., `/files/roboto.woff2`) are resolved.
+
+    Returns:
+        One `_FontFace` per font file url, in the order of the stylesheet.
+    """
+    faces: list[_FontFace] = []
+    for block in _FONT_FACE_PATTERN.findall(css_text):
+        descriptors: dict = {
+            name.lower(): value.strip()
+            for name, value in _DESCRIPTOR_PATTERN.findall(block)
+        }
+        # variable fonts have a range of weights, e.g. `100 900`
+        weight: str = descriptors.get("font-weight", "400").split()[0]
+        unicode_range: tuple = _parse_unicode_range(
+            descriptors.get("unicode-range", "")
+        )
+        for url in _SRC_URL_PATTERN.findall(descriptors.get("src", "")):
+            if base_url is not None:
+                url = urljoin(base_url, url)
+            faces.append(
+                _FontFace(
+                    family=descriptors.get("font-family", "").strip("'\""),
+                    weight=int(weight) if weight.isdigit() else 400,
+                    style=descriptors.get("font-style", "normal").lower(),
+                    url=url,
+                    format=url.split("?")[0].rsplit(".", 1)[-1].lower(),
+                    unicode_range=unicode_range,
+                )
+            )
+    return tuple(faces)
+
+
+def _select_face(
+    faces: Sequence[_FontFace],
+    allowed_formats: list[str],
+    weight: Optional[int] = None,
+    style: Optional[str] = None,
+) -> Optional[_FontFace]:
+    """
+    Pick the face to download. Faces are ranked by how close they are to the
+    requested style and weight, then by format preference, then by how many
+    basic latin characters they cover (for fonts split in subsets), and finally
+    by url, so that the same CSS always gives the same face.
+
+    Args:
+        faces: The faces to choose from.
+        allowed_formats: List of acceptable font file extensions, by order of
+            preference (e.g., ["woff2", "ttf"]).
+        weight: The requested weight, if any.
+        style: The requested style (`"normal"` or `"italic"`), if any.
+
+    Returns:
+        The best face, or `None` if no face has an allowed format.
+    """
+    candidates: list[_FontFace] = [
+        face for face in faces if face.format in allowed_formats
+    ]
+    if not candidates:
+        return None
+    return min(
+        candidates,
+        key=lambda face: (
+            style is not None and face.style != style,
+            0 if weight is None else abs(face.weight - weight),
+            allowed_formats.index(face.format),
+            -sum(face.covers(codepoint) for codepoint in _BASIC_LATIN),
+            face.url,
+        ),
+    )
@@ -1,8 +1,23 @@
-import os
-from fontTools.ttLib import woff2
+import io
 
+# Bump this whenever the woff/woff2 -> ttf conversion changes, so that
+# previously converted files in the cache are not reused.
+_CONVERTER_VERSION: int = 1
 
-def _decompress_woff_to_ttf(font_url: str) -> str:
-    output_path: str = os.path.splitext(font_url)[0] + ".ttf"
-    woff2.decompress(font_url, output_path)
-    return output_path
+
+def _decompress_woff_to_ttf(content: bytes) -> bytes:
+    """
+    Convert the content of a woff/woff2 font file to the content of a ttf
+    file, that matplotlib can read.
+
+    Args:
+        content: The raw content of the woff/woff2 file.
+
+    Returns:
+        The raw content of the ttf file.
+    """
+    from fontTools.ttLib import woff2
+
+    output = io.BytesIO()
+    woff2.decompress(io.BytesIO(content), output)
+    return output.getvalue()
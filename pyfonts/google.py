@@ -1,8 +1,7 @@
-from typing import Optional, Union, List
+from typing import Dict, Optional, Union, List
 from matplotlib.font_manager import FontProperties
 
-from pyfonts import load_font
-from pyfonts.utils import _get_fonturl
+from pyfonts.providers import load_provider_font
 
 
 def load_google_font(
@@ -12,6 +11,8 @@ def load_google_font(
     allowed_formats: List[str] = ["woff2", "woff", "ttf", "otf"],
     use_cache: bool = True,
     danger_not_verify_ssl: bool = False,
+    text: Optional[str] = None,
+    variations: Optional[Dict[str, float]] = None,
 ) -> FontProperties:
     """
     Load a font from Google Fonts with specified styling options and return a font property
@@ -31,6 +32,18 @@ def load_google_font(
             `ssl.SSLCertVerificationError`. If `True`, it's a **security risk** (such as data breaches or
             man-in-the-middle attacks), but can be convenient in some cases, like local
             development when behind a firewall.
+        text: The text that will be rendered with the font. By default, the
+            whole font is downloaded. If `text` is passed, the font is requested
+            split into subsets (latin, cyrillic, etc), and only the subsets with
+            characters of the text are downloaded (and merged into one font if
+            there are several). This keeps downloads small for CJK fonts.
+            Subsets are woff2 files if [brotli](https://github.com/google/brotli)
+            is installed, and woff files otherwise.
+        variations: Axis coordinates (e.g., `{"wght": 650, "wdth": 80}`) for
+            variable fonts. The variable font is downloaded once, and a static
+            instance is created locally for each set of coordinates. `weight`
+            is used as the `wght` coordinate if it is not in `variations`.
+            Can't be used with `text`.
 
     Returns:
         matplotlib.font_manager.FontProperties: A `FontProperties` object containing the loaded font.
@@ -44,19 +57,18 @@ def load_google_font(
         font = load_google_font("Roboto", weight="bold") # bold font
         font = load_google_font("Roboto", italic=True) # italic font
         font = load_google_font("Roboto", weight="bold", italic=True) # italic and bold
+        font = load_google_font("Noto Sans JP", text="こんにちは") # only the needed subsets
+        font = load_google_font("Roboto", variations={"wght": 650, "wdth": 80}) # any axis value
         ```
     """
-    font_url = _get_fonturl(
-        endpoint="https://fonts.googleapis.com/css2",
-        family=family,
-        italic=italic,
+    return load_provider_font(
+        family,
+        provider="google",
         weight=weight,
+        italic=italic,
         allowed_formats=allowed_formats,
         use_cache=use_cache,
-    )
-
-    return load_font(
-        font_url,
-        use_cache=use_cache,
         danger_not_verify_ssl=danger_not_verify_ssl,
+        text=text,
+        variations=variations,
     )
@@ -0,0 +1,129 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Generator
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock(fd: int) -> None:
+        # LK_LOCK only retries for 10 seconds, so keep trying until it succeeds
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _file_lock(path: str) -> Generator[None, None, None]:
+    """
+    Hold an exclusive lock on `path` (created if needed). The lock is
+    shared by all threads and processes on this machine, and blocks
+    until it is available.
+
+    The modification time of the lock file is updated when the lock is
+    acquired, so that cache pruning can tell unused locks apart.
+    """
+    while True:
+        fd: int = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock(fd)
+            if _is_current(fd, path):
+                break
+            # the lock file was removed by `_remove_unused_lock()` while we
+            # were waiting for it: lock the new file instead
+            _unlock(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+
+    try:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        yield
+    finally:
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+
+def _is_current(fd: int, path: str) -> bool:
+    try:
+        return os.path.samestat(os.fstat(fd), os.stat(path))
+    except OSError:
+        return False
+
+
+def _remove_unused_lock(path: str) -> bool:
+    """
+    Remove a lock file, unless it is held by a thread or process.
+
+    Returns:
+        Whether the lock file was removed.
+    """
+    try:
+        fd: int = os.open(path, os.O_RDWR)
+    except OSError:
+        return False
+    try:
+        if not _try_lock(fd):
+            return False
+        try:
+            # removed while holding the lock, so that the waiters of this
+            # lock see that it's gone, see `_file_lock()`
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path: str, content: bytes) -> None:
+    """
+    Write `content` to `path` so that readers either see the previous file
+    or the complete new one, never a partially written file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
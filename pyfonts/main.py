@@ -1,16 +1,45 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import os
-import ssl
 import warnings
 
-from urllib.request import urlopen
-from urllib.error import URLError, HTTPError
-from matplotlib.font_manager import FontProperties, fontManager
+from matplotlib.font_manager import FontProperties
 from matplotlib import rcParams
 
 from pyfonts.is_valid import _is_url, _is_valid_raw_url
-from pyfonts.cache import _create_cache_from_fontfile
+from pyfonts.cache import (
+    _cached_blob,
+    _is_stale,
+    _renew_validators,
+    _validators_get,
+    _validators_set,
+    _cached_font_candidates,
+    _converted_blob,
+    _link_blob,
+    _store_blob,
+    _store_blob_file,
+    _get_cache_dir,
+    _create_cache_from_fontfile,
+    _needs_decompression,
+    _touch_cached_font,
+)
 from pyfonts.decompress import _decompress_woff_to_ttf
+from pyfonts.session import (
+    _close,
+    _conditional_headers,
+    _http_get,
+    _stream_to_file,
+    _validators_from_response,
+)
+from pyfonts.lock import _file_lock
+from pyfonts.memory import _FONT_MEMO
+from pyfonts.metrics import _cache_event, _stage
+from pyfonts.offline import _is_offline
+from pyfonts.subset import _subset_font
+from pyfonts.variable import _instantiate_font
+from pyfonts.registry import _register_fonts
+
+if TYPE_CHECKING:
+    import requests
 
 
 def load_font(
@@ -18,6 +47,8 @@ def load_font(
     use_cache: bool = True,
     danger_not_verify_ssl: bool = False,
     font_path: Optional[str] = None,
+    subset_text: Optional[str] = None,
+    variations: Optional[dict[str, float]] = None,
 ) -> FontProperties:
     """
     Loads a matplotlib `FontProperties` object from a remote url or a local file,
@@ -40,6 +71,13 @@ def load_font(
             man-in-the-middle attacks), but can be convenient in some cases, like local
             development when behind a firewall.
         font_path: (deprecated) The local file path of the font. Use `font_url` instead.
+        subset_text: If passed, the font is reduced to the glyphs needed to render
+            this text. The smaller font is cached, and is faster to load and to
+            embed in PDF/SVG files, which is useful for large CJK or emoji fonts.
+        variations: Axis coordinates of a variable font (e.g., `{"wght": 650, "wdth": 80}`).
+            A static instance of the font is created at these coordinates and
+            cached, since matplotlib can't select the axes of a variable font.
+            Axes that are not set use their default value.
 
     Returns:
         matplotlib.font_manager.FontProperties: A `FontProperties` object containing the loaded font.
@@ -52,8 +90,24 @@ def load_font(
         font = load_font(
             "https://github.com/y-sunflower/pyfonts/blob/main/tests/Ultra-Regular.ttf?raw=true"
         )
+        font = load_font("NotoSansJP-Regular.ttf", subset_text="こんにちは")
+        font = load_font("Roboto-VariableFont.ttf", variations={"wght": 650})
         ```
     """
+    if subset_text is not None or variations is not None:
+        font_prop: FontProperties = load_font(
+            font_url,
+            use_cache=use_cache,
+            danger_not_verify_ssl=danger_not_verify_ssl,
+            font_path=font_path,
+        )
+        font_file: str = str(font_prop.get_file())
+        if variations is not None:
+            font_file = _instantiate_font(font_file, variations)
+        if subset_text is not None:
+            font_file = _subset_font(font_file, subset_text)
+        return FontProperties(fname=font_file)
+
     if font_path is not None:
         warnings.warn(
             "`font_path` argument is deprecated and will be removed in a future version."
@@ -74,77 +128,245 @@ def load_font(
                 font_prop.get_name()
             except FileNotFoundError:
                 raise FileNotFoundError(f"Font file not found: '{font_url}'.")
+            _register_fonts([font_url])
             return font_prop
-        if not _is_valid_raw_url(font_url):
-            raise ValueError(
-                f"""The URL provided ({font_url}) does not appear to be valid.
-                It must point to a binary font file from Github.
-                Have you forgotten to append `?raw=true` to the end of the URL?
-                """
-            )
+        return _load_remote_font(font_url, use_cache, danger_not_verify_ssl)
+    else:
+        raise ValueError("You must provide a `font_url`.")
+
 
-        cached_fontfile, cache_dir = _create_cache_from_fontfile(font_url)
+def _load_remote_font(
+    font_url: str,
+    use_cache: bool,
+    danger_not_verify_ssl: bool,
+    register: bool = True,
+) -> FontProperties:
+    """
+    Load a font from an url, from the memory cache, the cache on disk or the
+    network, in this order.
 
+    Args:
+        font_url: The url of the font file.
+        use_cache: Whether or not to cache fonts.
+        danger_not_verify_ssl: Whether or not to to skip SSL certificate on
+            SSL verification errors.
+        register: Whether to register the font with matplotlib. Partial fonts,
+            such as the subsets of a font, must not be registered under the
+            family name.
+
+    Returns:
+        The `FontProperties` of the font.
+    """
+    if not _is_valid_raw_url(font_url):
+        raise ValueError(
+            f"""The URL provided ({font_url}) does not appear to be valid.
+            It must point to a binary font file from Github.
+            Have you forgotten to append `?raw=true` to the end of the URL?
+            """
+        )
+
+    if use_cache:
+        font_prop: Optional[FontProperties] = _FONT_MEMO.get(font_url)
+        if font_prop is not None:
+            return font_prop
+
+    cached_fontfile, cache_dir = _create_cache_from_fontfile(font_url)
+
+    if use_cache and not _is_offline():
+        _revalidate_font(font_url, danger_not_verify_ssl)
+    if use_cache or _is_offline():
+        font_prop = _load_cached_font(font_url, cached_fontfile, register)
+        _cache_event("file", font_prop is not None, font_url)
+        if font_prop is not None:
+            _FONT_MEMO.set(font_url, font_prop)
+            return font_prop
+
+    if _is_offline():
+        raise RuntimeError(
+            f"Offline mode is enabled and the font at '{font_url}' is not in the cache. "
+            "Add it to your manifest and run `python -m pyfonts warm`."
+        )
+
+    # only one process at a time downloads a given font, the others wait
+    # for it and then reuse its result
+    with _file_lock(f"{cached_fontfile}.lock"):
         if use_cache:
-            # check if file is in cache
-
-            if os.path.exists(cached_fontfile):
-                try:
-                    # woff/woff2 are not supported by matplotlib, so we convert them
-                    # to ttf. This is mostly useful to work with Bunny fonts API.
-                    if cached_fontfile.endswith(("woff", "woff2")):
-                        cached_fontfile: str = _decompress_woff_to_ttf(cached_fontfile)
-
-                    font_prop: FontProperties = FontProperties(fname=cached_fontfile)
-                    font_prop.get_name()  # triggers an error if invalid
-                    return font_prop
-                except Exception:
-                    # cached file is invalid, remove and proceed to download
-                    os.remove(cached_fontfile)
+            font_prop = _load_cached_font(font_url, cached_fontfile, register)
+            if font_prop is not None:
+                _FONT_MEMO.set(font_url, font_prop)
+                return font_prop
+
+        response = _download_font(font_url, danger_not_verify_ssl)
+        font_file: str = _store_font(font_url, response)
+        _validators_set(font_url, font_url, _validators_from_response(response))
+
+    font_prop = FontProperties(fname=font_file)
+    if register:
+        _register_fonts([font_file])
+    if use_cache:
+        _FONT_MEMO.set(font_url, font_prop)
+    return font_prop
+
+
+def _load_cached_font(
+    font_url: str, cached_fontfile: str, register: bool = True
+) -> Optional[FontProperties]:
+    """
+    Load a font from the shared caches or from the regular cache.
+
+    Args:
+        font_url: The url of the font.
+        cached_fontfile: Path of the font in the regular cache, for caches
+            written before fonts were stored by content hash. woff/woff2 fonts
+            are cached already converted to ttf.
+        register: Whether to register the font with matplotlib.
+
+    Returns:
+        The `FontProperties` of the cached font, or `None` if the font is not
+        in any cache or if the cached files are invalid.
+    """
+    # files stored by content hash are checked with their size only
+    blob: Optional[str] = _cached_blob(font_url)
+    if blob is not None:
+        _touch_cached_font(blob)
+        if register:
+            _register_fonts([blob])
+        return FontProperties(fname=blob)
 
+    for path in _cached_font_candidates(cached_fontfile):
+        if not os.path.exists(path):
+            continue
         try:
-            response = urlopen(font_url)
-        except HTTPError as e:
-            if e.code == 404:
-                raise Exception(
-                    "404 error. The url passed does not exist: font file not found."
+            with _stage("parse", file=path):
+                font_prop: FontProperties = FontProperties(fname=path)
+                font_prop.get_name()  # triggers an error if invalid
+        except Exception:
+            continue
+        _touch_cached_font(path)
+        if register:
+            _register_fonts([path])
+        return font_prop
+    return None
+
+
+def _store_font(font_url: str, response: "requests.Response") -> str:
+    """
+    Stream a downloaded font to the cache and return the path of its file.
+    """
+    with _stage("download", url=font_url) as stage:
+        tmp_path, sha256, size = _stream_to_file(font_url, response, _get_cache_dir())
+        stage["bytes"] = size
+    if _needs_decompression(font_url):
+        # woff/woff2 are not supported by matplotlib, so we convert them
+        # to ttf. This is mostly useful to work with Bunny fonts API.
+        # The same file from another url is only converted once.
+        try:
+            converted: Optional[tuple] = _converted_blob(sha256)
+            if converted is not None:
+                return _link_blob(font_url, converted)
+            with _stage("decompress", url=font_url, bytes=size):
+                with open(tmp_path, "rb") as f:
+                    content: bytes = _decompress_woff_to_ttf(f.read())
+        finally:
+            os.remove(tmp_path)
+        return _store_blob(font_url, content, sha256)
+    return _store_blob_file(font_url, tmp_path, sha256, size)
+
+
+def _revalidate_font(font_url: str, danger_not_verify_ssl: bool = False) -> None:
+    """
+    If the cached file of a font url is stale, revalidate it with a conditional
+    request, that costs a `304` response with no body if the font has not
+    changed. The stale file is kept if the font can't be downloaded.
+    """
+    validators: Optional[dict] = _validators_get(font_url)
+    if validators is None or not _is_stale(validators):
+        return
+
+    cached_fontfile, _ = _create_cache_from_fontfile(font_url)
+    with _file_lock(f"{cached_fontfile}.lock"):
+        # another process may have revalidated it while we were waiting
+        validators = _validators_get(font_url)
+        if validators is None or not _is_stale(validators):
+            return
+        try:
+            response = _download_font(
+                font_url,
+                danger_not_verify_ssl,
+                headers=_conditional_headers(validators),
+            )
+        except Exception:
+            _renew_validators(font_url, validators)
+            return
+        # the body of a `304` response is empty, but its connection must be
+        # released
+        try:
+            if response.status_code != 304:
+                _store_font(font_url, response)
+        except Exception:
+            _renew_validators(font_url, validators)
+            return
+        finally:
+            _close(response)
+        _renew_validators(font_url, validators, _validators_from_response(response))
+
+
+def _download_font(
+    font_url: str,
+    danger_not_verify_ssl: bool = False,
+    headers: Optional[dict] = None,
+) -> "requests.Response":
+    """
+    Download a font file.
+
+    Args:
+        font_url: The url of the font file.
+        danger_not_verify_ssl: Whether or not to to skip SSL certificate on
+            SSL verification errors.
+        headers: Additional headers, e.g. for conditional requests.
+
+    Returns:
+        The response, whose body (the font file) is not downloaded yet.
+    """
+    import requests
+
+    # the body is streamed to the cache by `_store_font()`
+    kwargs: dict = {"stream": True}
+    if headers:
+        kwargs["headers"] = headers
+    with _stage("request", url=font_url):
+        try:
+            response = _http_get(font_url, **kwargs)
+        except requests.exceptions.SSLError:
+            if danger_not_verify_ssl:
+                warnings.warn(
+                    "SSL certificate verification disabled. This is insecure and vulnerable "
+                    "to man-in-the-middle attacks. Use only in trusted environments.",
+                    UserWarning,
                 )
-            else:
-                raise ValueError(f"An HTTPError has occurred. Code: {e.code}")
-        except URLError as e:
-            if isinstance(e.reason, ssl.SSLCertVerificationError):
-                if danger_not_verify_ssl:
-                    warnings.warn(
-                        "SSL certificate verification disabled. This is insecure and vulnerable "
-                        "to man-in-the-middle attacks. Use only in trusted environments.",
-                        UserWarning,
-                    )
-                    response = urlopen(
-                        font_url, context=ssl._create_unverified_context()
-                    )
-                else:
-                    raise Exception(
-                        "SSL certificate verification failed. "
-                        "If you are behind a firewall or using a proxy, "
-                        "try setting `danger_not_verify_ssl=True` to bypass verification."
-                        "verification."
-                    )
+                response = _http_get(font_url, verify=False, **kwargs)
             else:
                 raise Exception(
-                    "Failed to load font. This may be due to a lack of internet connection "
-                    "or an environment where local files are not accessible (Pyodide, etc)."
+                    "SSL certificate verification failed. "
+                    "If you are behind a firewall or using a proxy, "
+                    "try setting `danger_not_verify_ssl=True` to bypass verification."
                 )
+        except requests.exceptions.RequestException:
+            raise Exception(
+                "Failed to load font. This may be due to a lack of internet connection "
+                "or an environment where local files are not accessible (Pyodide, etc)."
+            )
 
-        content = response.read()
-        with open(cached_fontfile, "wb") as f:
-            f.write(content)
-
-        if cached_fontfile.endswith(("woff", "woff2")):
-            cached_fontfile: str = _decompress_woff_to_ttf(cached_fontfile)
+    if response.status_code >= 400:
+        _close(response)
+    if response.status_code == 404:
+        raise Exception(
+            "404 error. The url passed does not exist: font file not found."
+        )
+    elif response.status_code >= 400:
+        raise ValueError(f"An HTTPError has occurred. Code: {response.status_code}")
 
-        return FontProperties(fname=cached_fontfile)
-    else:
-        raise ValueError("You must provide a `font_url`.")
+    return response
 
 
 def set_default_font(font: FontProperties) -> None:
@@ -168,7 +390,7 @@ def set_default_font(font: FontProperties) -> None:
         # ^ axis labels, ticks, legend entries all also in Fascinate Inline
         ```
     """
-    fontManager.addfont(str(font.get_file()))
+    _register_fonts([str(font.get_file())])
     rcParams.update(
         {
             "font.family": font.get_name(),
@@ -0,0 +1,120 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+from matplotlib.font_manager import FontProperties
+
+from pyfonts.metrics import _cache_event
+
+
+class _FontMemo:
+    """
+    Thread-safe LRU cache of already loaded and validated `FontProperties`,
+    so that loading the same font twice in a process doesn't touch the disk.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._fonts: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[FontProperties]:
+        with self._lock:
+            font: Optional[FontProperties] = self._fonts.get(key)
+            if font is None:
+                self.misses += 1
+            else:
+                self._fonts.move_to_end(key)
+                self.hits += 1
+        _cache_event("memory", font is not None, key)
+        if font is None:
+            return None
+        # callers get their own copy, so that changing its size, style,
+        # etc does not change the cached font
+        return font.copy()
+
+    def set(self, key: Hashable, font: FontProperties) -> None:
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._fonts[key] = font.copy()
+            self._fonts.move_to_end(key)
+            while len(self._fonts) > self.maxsize:
+                self._fonts.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._fonts) > max(maxsize, 0):
+                self._fonts.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fonts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def files(self) -> set:
+        """
+        Get the files of the fonts kept in memory.
+        """
+        with self._lock:
+            fonts: list = list(self._fonts.values())
+        return {os.path.abspath(str(font.get_file())) for font in fonts}
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._fonts),
+                "maxsize": self.maxsize,
+            }
+
+
+_FONT_MEMO = _FontMemo()
+
+
+def set_memory_cache_size(maxsize: int) -> None:
+    """
+    Set the maximum number of fonts kept in memory. Fonts loaded with
+    `use_cache=True` are kept in memory, so that loading them again in the same
+    Python session is almost free. When the limit is reached, the least recently
+    used fonts are dropped.
+
+    Args:
+        maxsize: Maximum number of fonts kept in memory. Use `0` to disable the
+            in-memory cache. Default is `256`.
+
+    Examples:
+
+        ```python
+        from pyfonts import set_memory_cache_size
+
+        set_memory_cache_size(1000)
+        ```
+    """
+    _FONT_MEMO.resize(maxsize)
+
+
+def memory_cache_info() -> dict:
+    """
+    Get statistics about the in-memory font cache.
+
+    Returns:
+        A dict with the number of `hits` and `misses` since the cache was
+        last cleared, the current number of fonts (`size`) and the `maxsize`.
+
+    Examples:
+
+        ```python
+        from pyfonts import load_google_font, memory_cache_info
+
+        load_google_font("Roboto")
+        load_google_font("Roboto")  # served from memory
+        print(memory_cache_info()["hits"])
+        ```
+    """
+    return _FONT_MEMO.info()
@@ -0,0 +1,159 @@
+import copy
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from typing import Callable, Generator
+
+Observer = Callable[[str, dict], None]
+
+# caches that emit hit/miss events: loaded fonts in memory, font file urls
+# (resolved from the CSS of providers) and font files on disk
+_CACHES: tuple = ("memory", "url", "file")
+
+_OBSERVERS: list = []
+_STATS_LOCK = threading.Lock()
+
+
+def _empty_stats() -> dict:
+    return {
+        "caches": {cache: {"hits": 0, "misses": 0} for cache in _CACHES},
+        "stages": {},
+    }
+
+
+_STATS: dict = _empty_stats()
+
+
+def add_observer(observer: Observer) -> None:
+    """
+    Call a function for each event of font loading, for example to send
+    metrics to your monitoring system or to log slow loads. The function is
+    called with the name of the event and its data:
+
+    - `"stage"`: a step of loading a font is done. The data has the `stage`
+      (`"css"`, `"request"`, `"download"`, `"decompress"`, `"parse"`,
+      `"register"`, `"instantiate"`, `"subset"` or `"merge"`), its `duration`
+      in seconds, the number of `bytes` transferred or processed when relevant,
+      and whether it succeeded (`ok`). Most stages also have the `url` or
+      `file` they worked on.
+    - `"cache"`: a cache was checked. The data has the `cache` (`"memory"`,
+      `"url"` or `"file"`), whether it was a `hit`, and the `key` that was
+      looked up.
+
+    Observers are called in the thread that loads the font, so they should be
+    fast. Errors raised by observers are turned into warnings.
+
+    Args:
+        observer: A function that takes the name of the event and its data.
+
+    Examples:
+
+        ```python
+        from pyfonts import add_observer, load_google_font
+
+        def log_slow_stages(event, data):
+            if event == "stage" and data["duration"] > 0.5:
+                print(f"slow {data['stage']}: {data['duration']:.2f}s")
+
+        add_observer(log_slow_stages)
+        font = load_google_font("Roboto")
+        ```
+    """
+    with _STATS_LOCK:
+        _OBSERVERS.append(observer)
+
+
+def remove_observer(observer: Observer) -> None:
+    """
+    Stop calling a function added with
+    [`add_observer()`](metrics.md#pyfonts.add_observer).
+
+    Args:
+        observer: The function to remove.
+    """
+    with _STATS_LOCK:
+        if observer in _OBSERVERS:
+            _OBSERVERS.remove(observer)
+
+
+def cache_stats(reset: bool = False) -> dict:
+    """
+    Get cumulative statistics about font loading in this process.
+
+    Args:
+        reset: Whether to reset the statistics after reading them.
+
+    Returns:
+        A dict with:
+
+        - `caches`: the number of `hits` and `misses` of each cache: `memory`
+          (loaded fonts), `url` (font file urls resolved from the providers'
+          CSS) and `file` (font files on disk).
+        - `stages`: for each stage of font loading, the number of times it
+          ran (`count`), its total duration in seconds (`seconds`) and the
+          total number of `bytes` it transferred or processed.
+
+    Examples:
+
+        ```python
+        from pyfonts import cache_stats, load_google_font
+
+        load_google_font("Roboto")
+        stats = cache_stats()
+        print(stats["caches"]["file"])  # {'hits': 0, 'misses': 1}
+        print(stats["stages"]["download"]["bytes"])
+        ```
+    """
+    global _STATS
+
+    with _STATS_LOCK:
+        stats: dict = copy.deepcopy(_STATS)
+        if reset:
+            _STATS = _empty_stats()
+    return stats
+
+
+def _emit(event: str, data: dict) -> None:
+    """
+    Add an event to the statistics and send it to the observers.
+    """
+    with _STATS_LOCK:
+        if event == "cache":
+            counts: dict = _STATS["caches"][data["cache"]]
+            counts["hits" if data["hit"] else "misses"] += 1
+        elif event == "stage":
+            stage: dict = _STATS["stages"].setdefault(
+                data["stage"], {"count": 0, "seconds": 0.0, "bytes": 0}
+            )
+            stage["count"] += 1
+            stage["seconds"] += data["duration"]
+            stage["bytes"] += data.get("bytes") or 0
+        observers: list = list(_OBSERVERS)
+
+    for observer in observers:
+        try:
+            observer(event, data)
+        except Exception as e:
+            warnings.warn(f"pyfonts observer {observer!r} failed: {e!r}")
+
+
+def _cache_event(cache: str, hit: bool, key) -> None:
+    _emit("cache", {"cache": cache, "hit": hit, "key": key})
+
+
+@contextmanager
+def _stage(stage: str, **data) -> Generator[dict, None, None]:
+    """
+    Time a stage of font loading. The yielded dict is sent with the event,
+    so that the stage can add data to it, such as the number of `bytes`.
+    """
+    data["stage"] = stage
+    data["ok"] = False
+    start: float = time.perf_counter()
+    try:
+        yield data
+        data["ok"] = True
+    finally:
+        data["duration"] = time.perf_counter() - start
+        _emit("stage", data)
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+from typing import Optional
+
+# offline settings set with `set_offline_mode()`, they take precedence over
+# the PYFONTS_OFFLINE and PYFONTS_LOCKFILE environment variables
+_OFFLINE: Optional[bool] = None
+_LOCKFILE: Optional[str] = None
+_LOCKFILE_URLS: dict = {}
+_LOCKFILE_LOCK = threading.Lock()
+
+
+def set_offline_mode(enabled: bool = True, lockfile: Optional[str] = None) -> None:
+    """
+    Enable or disable the offline mode. In offline mode, `pyfonts` never uses the
+    network: fonts are only loaded from the cache, and font urls are only
+    resolved from the cache and from the lockfile written by
+    `python -m pyfonts warm`. Loading a font that is not available offline
+    raises an error.
+
+    The offline mode can also be enabled with the `PYFONTS_OFFLINE=1` and
+    `PYFONTS_LOCKFILE=path/to/fonts.lock.json` environment variables.
+
+    Args:
+        enabled: Whether to enable the offline mode. Default is `True`.
+        lockfile: Path to a lockfile written by `python -m pyfonts warm`.
+
+    Examples:
+
+        ```python
+        from pyfonts import set_offline_mode, load_google_font
+
+        set_offline_mode(lockfile="fonts.lock.json")
+        font = load_google_font("Roboto")  # never touches the network
+        ```
+    """
+    global _OFFLINE, _LOCKFILE
+    _OFFLINE = enabled
+    _LOCKFILE = lockfile
+
+
+def _is_offline() -> bool:
+    if _OFFLINE is not None:
+        return _OFFLINE
+    return os.environ.get("PYFONTS_OFFLINE", "").lower() in ("1", "true", "yes")
+
+
+def _lockfile_key(endpoint: str, family: str, weight, italic) -> str:
+    return json.dumps(
+        [endpoint, family, None if weight is None else int(weight), bool(italic)]
+    )
+
+
+def _read_lockfile(path: str) -> dict:
+    """
+    Read a lockfile and map each request to its resolved font url.
+    """
+    with _LOCKFILE_LOCK:
+        mtime: float = os.path.getmtime(path)
+        if path not in _LOCKFILE_URLS or _LOCKFILE_URLS[path][0] != mtime:
+            with open(path, "r") as f:
+                entries: list = json.load(f)["fonts"]
+            urls: dict = {
+                _lockfile_key(
+                    entry["endpoint"], entry["family"], entry["weight"], entry["italic"]
+                ): entry["url"]
+                for entry in entries
+            }
+            _LOCKFILE_URLS[path] = (mtime, urls)
+        return _LOCKFILE_URLS[path][1]
+
+
+def _lockfile_url(endpoint: str, family: str, weight, italic) -> Optional[str]:
+    """
+    Get the font url of a request from the lockfile, if any.
+    """
+    path: Optional[str] = _LOCKFILE or os.environ.get("PYFONTS_LOCKFILE")
+    if not path or not os.path.exists(path):
+        return None
+    key: str = _lockfile_key(endpoint, family, weight, italic)
+    return _read_lockfile(path).get(key)
@@ -0,0 +1,629 @@
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from matplotlib.font_manager import FontProperties
+
+from pyfonts.cache import _cache_key, _url_cache_get, _url_cache_set
+from pyfonts.css import _FontFace
+from pyfonts.main import _load_remote_font, load_font
+from pyfonts.memory import _FONT_MEMO
+from pyfonts.subset import _merge_fonts
+from pyfonts.utils import (
+    _get_fonturl,
+    _get_subset_fonturls,
+    _get_variable_fonturl,
+    _map_weight_to_numeric,
+    _select_fonturl,
+    _BUNNY_ENDPOINT,
+    _GOOGLE_ENDPOINT,
+)
+
+
+class FontProvider(ABC):
+    """
+    Base class of font providers. A provider finds the font file (as an url
+    or a local path) of a family for a given weight and style.
+
+    Subclasses must set a `name` and implement `get_fonturl()`. Providers
+    that can only download the subsets of a font needed to render a text set
+    `supports_text` and implement `get_subset_fonturls()`, and providers of
+    variable fonts set `supports_variations` and implement
+    `get_variable_fonturl()`.
+
+    Attributes:
+        name: Name of the provider, used with
+            [`load_provider_font()`](providers.md#pyfonts.load_provider_font).
+        allowed_formats: The file formats used when none are requested, by order
+            of preference.
+        supports_text: Whether `load_provider_font()` accepts `text`.
+        supports_variations: Whether `load_provider_font()` accepts `variations`.
+    """
+
+    name: str = ""
+    allowed_formats: Sequence[str] = ("woff2", "woff", "ttf", "otf")
+    supports_text: bool = False
+    supports_variations: bool = False
+
+    @abstractmethod
+    def get_fonturl(
+        self,
+        family: str,
+        weight: Optional[Union[int, str]],
+        italic: Optional[bool],
+        allowed_formats: List[str],
+        use_cache: bool,
+    ) -> str: ...
+
+    def get_subset_fonturls(
+        self,
+        family: str,
+        weight: Optional[Union[int, str]],
+        italic: Optional[bool],
+        allowed_formats: List[str],
+        text: str,
+        use_cache: bool,
+    ) -> List[str]:
+        raise ValueError(f"The '{self.name}' provider doesn't support `text`.")
+
+    def get_variable_fonturl(
+        self,
+        family: str,
+        italic: Optional[bool],
+        allowed_formats: List[str],
+        use_cache: bool,
+    ) -> str:
+        raise ValueError(f"The '{self.name}' provider doesn't support `variations`.")
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r})"
+
+
+class CSSProvider(FontProvider):
+    """
+    A provider with a CSS API compatible with
+    [Google Fonts](https://developers.google.com/fonts/docs/css2), such as
+    Google Fonts itself, Bunny Fonts, or a self-hosted mirror of them.
+
+    Args:
+        name: Name of the provider.
+        endpoint: URL of the CSS API (e.g., `"https://fonts.googleapis.com/css2"`).
+        allowed_formats: The file formats used when none are requested, by order
+            of preference. Default to `["woff2", "woff", "ttf", "otf"]`.
+        supports_text: Whether the CSS has a `unicode-range` for each subset of
+            a font, so that only the subsets needed for a text are downloaded.
+        supports_variations: Whether the API serves variable fonts. The axes of
+            each family are read from the Google Fonts catalog.
+
+    Examples:
+
+        ```python
+        from pyfonts import CSSProvider, register_provider
+
+        # a mirror of Google Fonts in your network
+        register_provider(
+            CSSProvider("google", "https://fonts.internal.example.com/css2"),
+            replace=True,
+        )
+        ```
+    """
+
+    def __init__(
+        self,
+        name: str,
+        endpoint: str,
+        allowed_formats: Sequence[str] = ("woff2", "woff", "ttf", "otf"),
+        supports_text: bool = False,
+        supports_variations: bool = False,
+    ):
+        self.name = name
+        self.endpoint = endpoint
+        self.allowed_formats = tuple(allowed_formats)
+        self.supports_text = supports_text
+        self.supports_variations = supports_variations
+
+    def get_fonturl(self, family, weight, italic, allowed_formats, use_cache) -> str:
+        return _get_fonturl(
+            endpoint=self.endpoint,
+            family=family,
+            weight=weight,
+            italic=italic,
+            allowed_formats=allowed_formats,
+            use_cache=use_cache,
+        )
+
+    def get_subset_fonturls(
+        self, family, weight, italic, allowed_formats, text, use_cache
+    ) -> List[str]:
+        return _get_subset_fonturls(
+            endpoint=self.endpoint,
+            family=family,
+            weight=weight,
+            italic=italic,
+            allowed_formats=allowed_formats,
+            text=text,
+            use_cache=use_cache,
+        )
+
+    def get_variable_fonturl(self, family, italic, allowed_formats, use_cache) -> str:
+        return _get_variable_fonturl(
+            endpoint=self.endpoint,
+            family=family,
+            italic=italic,
+            allowed_formats=allowed_formats,
+            use_cache=use_cache,
+        )
+
+    def __repr__(self) -> str:
+        return f"CSSProvider(name={self.name!r}, endpoint={self.endpoint!r})"
+
+
+class DirectoryProvider(FontProvider):
+    """
+    A provider of the ttf/otf files of a directory tree, for example a copy
+    of the fonts you need on a local or network drive. The family, weight
+    and style of each file are read from the file itself, so files can be
+    named and organised in any way.
+
+    The directory is scanned the first time a font is requested.
+
+    Args:
+        name: Name of the provider.
+        root: The directory with the font files.
+
+    Examples:
+
+        ```python
+        from pyfonts import DirectoryProvider, load_provider_font, register_provider
+
+        register_provider(DirectoryProvider("shared", "/mnt/fonts"))
+        font = load_provider_font("Roboto", provider="shared", weight="bold")
+        ```
+    """
+
+    def __init__(self, name: str, root: str):
+        self.name = name
+        self.root = root
+        self.allowed_formats = ("ttf", "otf")
+        self._families: Optional[Dict[str, List[_FontFace]]] = None
+        self._lock = threading.Lock()
+
+    def _get_families(self) -> Dict[str, List[_FontFace]]:
+        with self._lock:
+            if self._families is None:
+                from matplotlib.font_manager import get_font, ttfFontProperty
+
+                families: Dict[str, List[_FontFace]] = {}
+                for directory, _, filenames in os.walk(self.root):
+                    for filename in sorted(filenames):
+                        extension: str = os.path.splitext(filename)[1].lower()
+                        if extension not in (".ttf", ".otf"):
+                            continue
+                        path: str = os.path.join(directory, filename)
+                        try:
+                            entry = ttfFontProperty(get_font(path))
+                        except Exception:
+                            continue
+                        face = _FontFace(
+                            family=entry.name,
+                            weight=_map_weight_to_numeric(entry.weight),
+                            style="italic" if entry.style != "normal" else "normal",
+                            url=path,
+                            format=extension[1:],
+                        )
+                        families.setdefault(entry.name.lower(), []).append(face)
+                self._families = families
+            return self._families
+
+    def get_fonturl(self, family, weight, italic, allowed_formats, use_cache) -> str:
+        faces: Optional[List[_FontFace]] = self._get_families().get(family.lower())
+        if not faces:
+            raise ValueError(f"No family named '{family}' in '{self.root}'.")
+        if isinstance(weight, str):
+            weight = _map_weight_to_numeric(weight)
+        return _select_fonturl(tuple(faces), family, weight, italic, allowed_formats)
+
+    def __repr__(self) -> str:
+        return f"DirectoryProvider(name={self.name!r}, root={self.root!r})"
+
+
+_HEDGE_POOL: Optional[ThreadPoolExecutor] = None
+_HEDGE_POOL_LOCK = threading.Lock()
+_HEDGE_MAX_WORKERS: int = 8
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    """
+    Get the threads in which failover providers race their providers. They are
+    shared by all failover providers, so that their number stays bounded.
+    """
+    global _HEDGE_POOL
+    with _HEDGE_POOL_LOCK:
+        if _HEDGE_POOL is None:
+            _HEDGE_POOL = ThreadPoolExecutor(
+                max_workers=_HEDGE_MAX_WORKERS, thread_name_prefix="pyfonts-hedge"
+            )
+        return _HEDGE_POOL
+
+
+class FailoverProvider(FontProvider):
+    """
+    A provider that gets fonts from other providers, for example Google Fonts
+    and Bunny Fonts, which have mostly the same fonts. Providers are tried in
+    order, and the next one is used when a provider fails.
+
+    With `hedge_after`, the next provider is also started when a provider
+    hasn't answered after this delay, and the first valid answer is used, so
+    that a slow provider doesn't slow down font loading.
+
+    The provider that answered for a family is cached, and tried first the
+    next times this family is loaded. When no formats are requested, each
+    provider uses its own default formats.
+
+    Args:
+        name: Name of the provider.
+        providers: The providers, or the names of registered providers, by
+            order of preference.
+        hedge_after: Delay in seconds after which the next provider is started
+            if no provider has answered yet. `None` means only when a provider
+            fails. Default is `None`.
+
+    Examples:
+
+        ```python
+        from pyfonts import FailoverProvider, load_provider_font, register_provider
+
+        register_provider(FailoverProvider("any", ["google", "bunny"], hedge_after=0.5))
+        font = load_provider_font("Roboto", provider="any")
+        ```
+    """
+
+    def __init__(
+        self,
+        name: str,
+        providers: Sequence[Union[str, FontProvider]],
+        hedge_after: Optional[float] = None,
+    ):
+        if not providers:
+            raise ValueError("`providers` must not be empty.")
+        if hedge_after is not None and hedge_after < 0:
+            raise ValueError(f"`hedge_after` must be positive, not {hedge_after}.")
+        self.name = name
+        # names are resolved now, so that the built-in providers can be
+        # replaced by a failover provider that uses them
+        self.providers: List[FontProvider] = [
+            get_provider(p) if isinstance(p, str) else p for p in providers
+        ]
+        self.hedge_after = hedge_after
+        self.allowed_formats = self.providers[0].allowed_formats
+        self.supports_text = any(p.supports_text for p in self.providers)
+        self.supports_variations = any(p.supports_variations for p in self.providers)
+
+    def get_fonturl(self, family, weight, italic, allowed_formats, use_cache) -> str:
+        return self._race(
+            family,
+            self.providers,
+            lambda provider: provider.get_fonturl(
+                family,
+                weight,
+                italic,
+                self._formats(provider, allowed_formats),
+                use_cache,
+            ),
+            use_cache,
+        )
+
+    def get_subset_fonturls(
+        self, family, weight, italic, allowed_formats, text, use_cache
+    ) -> List[str]:
+        return self._race(
+            family,
+            [p for p in self.providers if p.supports_text],
+            lambda provider: provider.get_subset_fonturls(
+                family,
+                weight,
+                italic,
+                self._formats(provider, allowed_formats),
+                text,
+                use_cache,
+            ),
+            use_cache,
+        )
+
+    def get_variable_fonturl(self, family, italic, allowed_formats, use_cache) -> str:
+        return self._race(
+            family,
+            [p for p in self.providers if p.supports_variations],
+            lambda provider: provider.get_variable_fonturl(
+                family, italic, self._formats(provider, allowed_formats), use_cache
+            ),
+            use_cache,
+        )
+
+    def _formats(self, provider: FontProvider, allowed_formats: List[str]) -> List[str]:
+        # the default formats of a failover provider are the ones of its
+        # first provider, the other providers use their own defaults
+        if list(allowed_formats) == list(self.allowed_formats):
+            return list(provider.allowed_formats)
+        return allowed_formats
+
+    def _winner_key(self, family: str) -> str:
+        return _cache_key(family, "failover", None, [], self.name)
+
+    def _race(
+        self,
+        family: str,
+        providers: List[FontProvider],
+        resolve: Callable[[FontProvider], Any],
+        use_cache: bool,
+    ) -> Any:
+        """
+        Get the first valid answer of the providers, starting with the one
+        that answered last time for this family.
+        """
+        if use_cache:
+            winner: Optional[str] = _url_cache_get(self._winner_key(family))
+            providers = sorted(providers, key=lambda p: p.name != winner)
+
+        errors: List[Tuple[int, Exception]] = []
+        if self.hedge_after is None:
+            for i, provider in enumerate(providers):
+                try:
+                    result: Any = resolve(provider)
+                except Exception as e:
+                    errors.append((i, e))
+                    continue
+                if use_cache:
+                    _url_cache_set(self._winner_key(family), provider.name)
+                return result
+        else:
+            running: Dict[Future, int] = {}
+            try:
+                for i, provider in enumerate(providers):
+                    running[_hedge_pool().submit(resolve, provider)] = i
+                    while running:
+                        done, _ = wait(
+                            running,
+                            timeout=(
+                                self.hedge_after if i + 1 < len(providers) else None
+                            ),
+                            return_when=FIRST_COMPLETED,
+                        )
+                        if not done:
+                            break  # too slow, start the next provider
+                        for future in done:
+                            index: int = running.pop(future)
+                            try:
+                                result = future.result()
+                            except Exception as e:
+                                errors.append((index, e))
+                                continue
+                            if use_cache:
+                                _url_cache_set(
+                                    self._winner_key(family), providers[index].name
+                                )
+                            return result
+                        if i + 1 < len(providers):
+                            break  # a provider failed, start the next one
+            finally:
+                # requests of providers that lose the race keep running in the
+                # background, since they can't be cancelled once started
+                for future in running:
+                    future.cancel()
+
+        # the error of the preferred provider is the most relevant one
+        raise min(errors, key=lambda error: error[0])[1]
+
+    def __repr__(self) -> str:
+        names: str = ", ".join(repr(p.name) for p in self.providers)
+        return f"FailoverProvider(name={self.name!r}, providers=[{names}])"
+
+
+_PROVIDERS: Dict[str, FontProvider] = {
+    "google": CSSProvider(
+        "google", _GOOGLE_ENDPOINT, supports_text=True, supports_variations=True
+    ),
+    "bunny": CSSProvider(
+        "bunny", _BUNNY_ENDPOINT, ["woff", "ttf", "otf"], supports_text=True
+    ),
+}
+_PROVIDERS_LOCK = threading.Lock()
+
+
+def register_provider(provider: FontProvider, replace: bool = False) -> None:
+    """
+    Register a font provider, so that fonts can be loaded from it with
+    [`load_provider_font()`](providers.md#pyfonts.load_provider_font).
+
+    Replacing the built-in `"google"` or `"bunny"` providers also changes
+    where [`load_google_font()`](load_google_font.md) and
+    [`load_bunny_font()`](load_bunny_font.md) load fonts from. The fonts
+    kept in memory are cleared when a provider is replaced, so that they are
+    loaded again from the new provider.
+
+    Args:
+        provider: The provider.
+        replace: Whether to replace a registered provider with the same name.
+
+    Examples:
+
+        ```python
+        from pyfonts import CSSProvider, register_provider
+
+        register_provider(CSSProvider("mirror", "https://fonts.internal.example.com/css2"))
+        ```
+    """
+    if not provider.name:
+        raise ValueError("The provider must have a `name`.")
+    with _PROVIDERS_LOCK:
+        if provider.name in _PROVIDERS and not replace:
+            raise ValueError(
+                f"A provider named '{provider.name}' is already registered. "
+                "Use `replace=True` to replace it."
+            )
+        if _PROVIDERS.get(provider.name, provider) is not provider:
+            # loaded fonts are kept in memory by provider name
+            _FONT_MEMO.clear()
+        _PROVIDERS[provider.name] = provider
+
+
+def get_provider(name: str) -> FontProvider:
+    """
+    Get a registered font provider.
+
+    Args:
+        name: Name of the provider (e.g., `"google"`).
+
+    Returns:
+        The provider.
+    """
+    with _PROVIDERS_LOCK:
+        if name not in _PROVIDERS:
+            raise ValueError(
+                f"Unknown provider '{name}'. Valid options are: {', '.join(_PROVIDERS)}."
+            )
+        return _PROVIDERS[name]
+
+
+def load_provider_font(
+    family: str,
+    provider: Union[str, FontProvider] = "google",
+    weight: Optional[Union[int, str]] = None,
+    italic: Optional[bool] = None,
+    allowed_formats: Optional[List[str]] = None,
+    use_cache: bool = True,
+    danger_not_verify_ssl: bool = False,
+    text: Optional[str] = None,
+    variations: Optional[Dict[str, float]] = None,
+) -> FontProperties:
+    """
+    Load a font from a font provider. [`load_google_font()`](load_google_font.md)
+    and [`load_bunny_font()`](load_bunny_font.md) are shortcuts for the built-in
+    `"google"` and `"bunny"` providers.
+
+    Args:
+        family: Font family name (e.g., "Open Sans", "Roboto", etc).
+        provider: Name of a registered provider (see
+            [`register_provider()`](providers.md#pyfonts.register_provider)), or
+            the provider itself. Default to `"google"`.
+        weight: Desired font weight (e.g., 400, 700) or one of 'thin', 'extra-light', 'light',
+            'regular', 'medium', 'semi-bold', 'bold', 'extra-bold', 'black'. Default is `None`.
+        italic: Whether to use the italic variant. Default is `None`.
+        allowed_formats: List of acceptable font file formats. Default to the
+            formats of the provider.
+        use_cache: Whether or not to cache fonts (to make pyfonts faster). Default to `True`.
+        danger_not_verify_ssl: Whether or not to to skip SSL certificate on
+            `ssl.SSLCertVerificationError`. If `True`, it's a **security risk** (such as data breaches or
+            man-in-the-middle attacks), but can be convenient in some cases, like local
+            development when behind a firewall.
+        text: The text that will be rendered with the font, to only download the
+            subsets of the font needed for it. Only for providers that support it.
+        variations: Axis coordinates (e.g., `{"wght": 650, "wdth": 80}`) for
+            variable fonts. Only for providers that support it.
+
+    Returns:
+        matplotlib.font_manager.FontProperties: A `FontProperties` object containing the loaded font.
+
+    Examples:
+
+        ```python
+        from pyfonts import DirectoryProvider, load_provider_font, register_provider
+
+        font = load_provider_font("Roboto", provider="bunny", weight="bold")
+
+        register_provider(DirectoryProvider("shared", "/mnt/fonts"))
+        font = load_provider_font("Roboto", provider="shared")
+        ```
+    """
+    if isinstance(provider, str):
+        provider = get_provider(provider)
+    if allowed_formats is None:
+        allowed_formats = list(provider.allowed_formats)
+    if text is not None and not provider.supports_text:
+        raise ValueError(f"The '{provider.name}' provider doesn't support `text`.")
+    if variations is not None and not provider.supports_variations:
+        raise ValueError(
+            f"The '{provider.name}' provider doesn't support `variations`."
+        )
+
+    memo_key: tuple = (provider.name, family, weight, italic, tuple(allowed_formats))
+    if text is not None:
+        memo_key += (frozenset(text),)
+    if variations is not None:
+        if text is not None:
+            raise ValueError("`text` and `variations` can't be used together.")
+        variations = dict(variations)
+        if weight is not None:
+            variations.setdefault("wght", _map_weight_to_numeric(weight))
+        memo_key += (tuple(sorted(variations.items())),)
+    if use_cache:
+        font: Optional[FontProperties] = _FONT_MEMO.get(memo_key)
+        if font is not None:
+            return font
+
+    if variations is not None:
+        font_url = provider.get_variable_fonturl(
+            family=family,
+            italic=italic,
+            allowed_formats=allowed_formats,
+            use_cache=use_cache,
+        )
+        font = load_font(
+            font_url,
+            use_cache=use_cache,
+            danger_not_verify_ssl=danger_not_verify_ssl,
+            variations=variations,
+        )
+    elif text is not None:
+        font_urls: List[str] = provider.get_subset_fonturls(
+            family=family,
+            weight=weight,
+            italic=italic,
+            allowed_formats=allowed_formats,
+            text=text,
+            use_cache=use_cache,
+        )
+        font = _load_subsets(font_urls, use_cache, danger_not_verify_ssl)
+    else:
+        font_url = provider.get_fonturl(
+            family=family,
+            weight=weight,
+            italic=italic,
+            allowed_formats=allowed_formats,
+            use_cache=use_cache,
+        )
+        font = load_font(
+            font_url,
+            use_cache=use_cache,
+            danger_not_verify_ssl=danger_not_verify_ssl,
+        )
+    if use_cache:
+        _FONT_MEMO.set(memo_key, font)
+    return font
+
+
+def _load_subsets(
+    font_urls: List[str],
+    use_cache: bool,
+    danger_not_verify_ssl: bool,
+) -> FontProperties:
+    """
+    Load the subsets of a font needed to render a text, merged into a single
+    font if there are several.
+    """
+    # subsets only have some of the glyphs of the font, so they are not
+    # registered with matplotlib under the family name
+    with ThreadPoolExecutor(max_workers=min(8, len(font_urls))) as pool:
+        fonts: List[FontProperties] = list(
+            pool.map(
+                lambda font_url: _load_remote_font(
+                    font_url, use_cache, danger_not_verify_ssl, register=False
+                ),
+                font_urls,
+            )
+        )
+    if len(fonts) == 1:
+        return fonts[0]
+    return FontProperties(fname=_merge_fonts([str(f.get_file()) for f in fonts]))
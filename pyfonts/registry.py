@@ -0,0 +1,218 @@
+import dataclasses
+import json
+import os
+import threading
+from typing import Optional
+
+import matplotlib
+from matplotlib.font_manager import FontEntry, fontManager
+
+from pyfonts.cache import _get_cache_dir, _get_cache_root, _get_shared_cache_roots
+from pyfonts.cache import _FONTS_DIRNAME
+from pyfonts.lock import _file_lock
+from pyfonts.metrics import _stage
+
+# one JSON object per line, so that new entries are appended to the index
+# instead of rewriting it
+_FONT_INDEX_FILENAME: str = ".pyfonts_font_index.jsonl"
+_FONT_EXTENSIONS: tuple = (".ttf", ".otf")
+# subsets only have some of the glyphs of a font, and instances of variable
+# fonts share the family name of their font, so they must not be picked by
+# matplotlib when a font is referenced by its family name
+_UNREGISTERED_SUFFIXES: tuple = (
+    ".subset.ttf",
+    ".subset.otf",
+    ".merged.ttf",
+    ".instance.ttf",
+    ".instance.otf",
+)
+
+_REGISTERED: set = set()
+_REGISTRY_LOCK = threading.Lock()
+# the persisted index of each cache root, read once per process
+_FONT_INDEXES: dict = {}
+
+
+def _get_font_index_file() -> str:
+    return os.path.join(_get_cache_root(), _FONT_INDEX_FILENAME)
+
+
+def _read_font_index(index_file: str) -> dict:
+    """
+    Read the persisted `FontEntry` fields of already registered files. Entries
+    written by another matplotlib version are discarded, since `FontEntry` may
+    change, and the latest entry of a file wins.
+    """
+    index: dict = {}
+    try:
+        with open(index_file, "r") as f:
+            lines: list[str] = f.readlines()
+    except OSError:
+        return index
+    for line in lines:
+        try:
+            record: dict = json.loads(line)
+        except ValueError:
+            continue  # a line being appended by another process
+        if record.get("matplotlib") == matplotlib.__version__:
+            index[record["file"]] = record
+    return index
+
+
+def _font_index(index_file: str) -> dict:
+    index: Optional[dict] = _FONT_INDEXES.get(index_file)
+    if index is None:
+        index = _FONT_INDEXES[index_file] = _read_font_index(index_file)
+    return index
+
+
+def _append_to_font_index(index_file: str, records: list[dict]) -> None:
+    """
+    Append records to the persisted index. Failures are ignored, since the
+    index only saves parsing the files again.
+    """
+    content: str = "".join(json.dumps(record) + "\n" for record in records)
+    try:
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        with _file_lock(f"{index_file}.lock"), open(index_file, "a") as f:
+            f.write(content)
+    except OSError:
+        pass
+
+
+def _is_cached_font(font_file: str) -> bool:
+    """
+    Whether a font file is in the regular cache or in a shared cache, where
+    it won't change: other files are not added to the persisted index.
+    """
+    roots: list[str] = [_get_cache_root(), *_get_shared_cache_roots()]
+    return any(
+        font_file.startswith(os.path.join(os.path.realpath(root), "")) for root in roots
+    )
+
+
+def _clear_findfont_cache() -> None:
+    # matplotlib caches the result of font lookups
+    findfont_cached = getattr(fontManager, "_findfont_cached", None)
+    if findfont_cached is not None:
+        findfont_cached.cache_clear()
+
+
+def _register_fonts(font_files: list[str]) -> int:
+    """
+    Register font files with matplotlib's `fontManager`, so that they can be
+    referenced by family name. Each file is only registered once per process,
+    and the properties of the cached files are read from the persisted index
+    when possible, instead of parsing the file.
+
+    Args:
+        font_files: Paths of the font files.
+
+    Returns:
+        The number of newly registered files.
+    """
+    with _REGISTRY_LOCK:
+        new_files: list[str] = []
+        for font_file in font_files:
+            font_file = os.path.realpath(font_file)
+            if font_file not in _REGISTERED and font_file not in new_files:
+                new_files.append(font_file)
+        if not new_files:
+            return 0
+
+        with _stage("register", files=len(new_files)):
+            index_file: str = _get_font_index_file()
+            index: Optional[dict] = None
+            new_records: list[dict] = []
+            for font_file in new_files:
+                try:
+                    stat: os.stat_result = os.stat(font_file)
+                except OSError:
+                    continue
+                cached: bool = _is_cached_font(font_file)
+                if cached and index is None:
+                    index = _font_index(index_file)
+                record: Optional[dict] = index.get(font_file) if cached else None
+                if (
+                    record is not None
+                    and record["mtime_ns"] == stat.st_mtime_ns
+                    and record["size"] == stat.st_size
+                ):
+                    fontManager.ttflist.extend(
+                        FontEntry(**entry) for entry in record["entries"]
+                    )
+                else:
+                    n_fonts: int = len(fontManager.ttflist)
+                    try:
+                        fontManager.addfont(font_file)
+                    except Exception:
+                        continue
+                    if cached:
+                        record = {
+                            "file": font_file,
+                            "matplotlib": matplotlib.__version__,
+                            "mtime_ns": stat.st_mtime_ns,
+                            "size": stat.st_size,
+                            "entries": [
+                                dataclasses.asdict(entry)
+                                for entry in fontManager.ttflist[n_fonts:]
+                            ],
+                        }
+                        index[font_file] = record
+                        new_records.append(record)
+                _REGISTERED.add(font_file)
+
+            if new_records:
+                _append_to_font_index(index_file, new_records)
+
+        _clear_findfont_cache()
+        return len(new_files)
+
+
+def register_cached_fonts(cache_dir: Optional[str] = None) -> int:
+    """
+    Register all the fonts of the cache with matplotlib, so that they can be
+    used by family name, for example in `rcParams["font.family"]` or in style
+    sheets. Fonts loaded with `pyfonts` are already registered automatically:
+    this is useful to use fonts cached by a previous session without loading
+    them one by one.
+
+    The properties of each font are stored in an index next to the cache, so
+    that the font files are not parsed again by the next sessions.
+
+    Args:
+        cache_dir: Directory with the font files. Default is the regular cache
+            and the shared caches (see [`configure_cache()`](cache.md)).
+
+    Returns:
+        The number of newly registered font files.
+
+    Examples:
+
+        ```python
+        import matplotlib.pyplot as plt
+        from pyfonts import register_cached_fonts
+
+        register_cached_fonts()
+        plt.rcParams["font.family"] = "Roboto"
+        ```
+    """
+    if cache_dir is None:
+        cache_dirs: list[str] = [
+            os.path.join(root, _FONTS_DIRNAME) for root in _get_shared_cache_roots()
+        ] + [_get_cache_dir()]
+    else:
+        cache_dirs = [cache_dir]
+
+    font_files: list[str] = []
+    for directory in cache_dirs:
+        if not os.path.isdir(directory):
+            continue
+        for filename in sorted(os.listdir(directory)):
+            if (
+                filename.lower().endswith(_FONT_EXTENSIONS)
+                and not filename.lower().endswith(_UNREGISTERED_SUFFIXES)
+                and not filename.startswith(".")
+            ):
+                font_files.append(os.path.join(directory, filename))
+    return _register_fonts(font_files)
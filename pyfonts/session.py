@@ -0,0 +1,292 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+from urllib.parse import urlparse
+
+# requests is only imported when a first request is made, to keep
+# `import pyfonts` fast
+if TYPE_CHECKING:
+    import requests
+
+_TIMEOUT: tuple[float, float] = (5.0, 30.0)
+_RETRIES: int = 3
+_BACKOFF_FACTOR: float = 0.5
+_POOL_MAXSIZE: int = 16
+_MAX_DOWNLOAD_SIZE: Optional[int] = 100 * 1024**2
+_PROGRESS: Optional[Callable[[str, int, Optional[int]], None]] = None
+_CHUNK_SIZE: int = 64 * 1024
+_UNSET: Any = object()
+
+_SESSIONS: dict[str, "requests.Session"] = {}
+_CUSTOM_SESSIONS: dict[Optional[str], "requests.Session"] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def configure_http(
+    timeout: Optional[Union[float, tuple[float, float]]] = None,
+    retries: Optional[int] = None,
+    backoff_factor: Optional[float] = None,
+    max_download_size: Optional[int] = _UNSET,
+    progress: Optional[Callable[[str, int, Optional[int]], None]] = _UNSET,
+) -> None:
+    """
+    Configure how `pyfonts` talks to font providers. Only the arguments that
+    are passed are changed.
+
+    Font files are streamed to the cache in chunks, so a download never holds
+    the whole file in memory.
+
+    Args:
+        timeout: Timeout in seconds, either a single value or a `(connect, read)`
+            tuple. Default is `(5, 30)`.
+        retries: Maximum number of retries for failed connections and
+            `429`/`5xx` responses. Default is `3`.
+        backoff_factor: Factor of the exponential backoff between retries
+            (0.5s, 1s, 2s, ... with the default of `0.5`).
+        max_download_size: Maximum size of a font file, in bytes. Larger
+            downloads are aborted with an error. `None` means no limit.
+            Default is 100 MB.
+        progress: Function called after each downloaded chunk of a font file,
+            with the url, the number of bytes downloaded so far and the total
+            size (`None` if unknown). `None` disables progress reports.
+
+    Examples:
+
+        ```python
+        from pyfonts import configure_http
+
+        configure_http(timeout=(2, 10), retries=5)
+        configure_http(
+            max_download_size=20 * 1024**2,
+            progress=lambda url, done, total: print(f"{url}: {done}/{total}"),
+        )
+        ```
+    """
+    global _TIMEOUT, _RETRIES, _BACKOFF_FACTOR, _MAX_DOWNLOAD_SIZE, _PROGRESS
+
+    if timeout is not None:
+        if not isinstance(timeout, tuple):
+            timeout = (float(timeout), float(timeout))
+        _TIMEOUT = timeout
+    if retries is not None:
+        if retries < 0:
+            raise ValueError(f"`retries` must be positive, not {retries}.")
+        _RETRIES = retries
+    if backoff_factor is not None:
+        _BACKOFF_FACTOR = backoff_factor
+    if max_download_size is not _UNSET:
+        if max_download_size is not None and max_download_size < 0:
+            raise ValueError(
+                f"`max_download_size` must be positive, not {max_download_size}."
+            )
+        _MAX_DOWNLOAD_SIZE = max_download_size
+    if progress is not _UNSET:
+        _PROGRESS = progress
+
+    # pooled sessions are rebuilt with the new retry policy on next use
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+def set_http_session(
+    session: Optional["requests.Session"],
+    host: Optional[str] = None,
+) -> None:
+    """
+    Use your own `requests.Session` for all downloads, or only for those to a
+    given host. This can be used to add authentication, proxies, or to
+    redirect requests to a local mirror.
+
+    Args:
+        session: The session to use. Pass `None` to go back to the default
+            pooled session.
+        host: The host (e.g., `"fonts.gstatic.com"`) the session is used for.
+            If `None`, the session is used for every host.
+
+    Examples:
+
+        ```python
+        import requests
+        from pyfonts import set_http_session
+
+        session = requests.Session()
+        session.proxies = {"https": "http://proxy.internal:3128"}
+        set_http_session(session)
+        ```
+    """
+    with _SESSIONS_LOCK:
+        if session is None:
+            _CUSTOM_SESSIONS.pop(host, None)
+        else:
+            _CUSTOM_SESSIONS[host] = session
+
+
+def _new_session() -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=_RETRIES,
+        backoff_factor=_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _get_session(url: str) -> "requests.Session":
+    """
+    Get the session to use for an url: the one set by the user if any,
+    otherwise a pooled keep-alive session shared by all requests to this host.
+    """
+    host: str = urlparse(url).netloc
+    with _SESSIONS_LOCK:
+        if host in _CUSTOM_SESSIONS:
+            return _CUSTOM_SESSIONS[host]
+        if None in _CUSTOM_SESSIONS:
+            return _CUSTOM_SESSIONS[None]
+        if host not in _SESSIONS:
+            _SESSIONS[host] = _new_session()
+        return _SESSIONS[host]
+
+
+def _http_get(url: str, verify: bool = True, **kwargs) -> "requests.Response":
+    """
+    Send a GET request through the session of the url's host, with the
+    configured timeout and retries.
+
+    `verify` is only passed when certificates must not be verified, since it
+    would otherwise override the `verify` setting of a user's session.
+    """
+    if not verify:
+        kwargs["verify"] = False
+    return _get_session(url).get(url, timeout=_TIMEOUT, **kwargs)
+
+
+def _validators_from_response(response: "requests.Response") -> dict:
+    """
+    Get the cache validators of a response: its `ETag` and `Last-Modified`
+    headers, and when it expires according to `Cache-Control` or `Expires`.
+
+    Returns:
+        A dict with the `etag`, `last_modified` and `expires` (a timestamp, or
+        `None` if the response has no freshness information) of the response.
+    """
+    headers = getattr(response, "headers", None) or {}
+    expires: Optional[float] = None
+    cache_control: str = headers.get("Cache-Control", "").lower()
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        expires = time.time()
+    elif max_age is not None:
+        expires = time.time() + int(max_age.group(1))
+    elif headers.get("Expires"):
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            expires = time.time()
+    return {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "expires": expires,
+    }
+
+
+def _conditional_headers(validators: dict) -> dict:
+    """
+    Get the headers of a conditional request, that costs a `304` response with
+    no body if the cached response is still valid.
+    """
+    headers: dict = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def _stream_to_file(
+    url: str, response: "requests.Response", directory: str
+) -> tuple[str, str, int]:
+    """
+    Write the body of a response to a temporary file in `directory`, chunk by
+    chunk, hashing it on the fly and reporting progress. The download is
+    aborted if it goes over the maximum download size.
+
+    Args:
+        url: The url of the response, for progress reports and errors.
+        response: A response of a request sent with `stream=True`.
+        directory: Directory of the temporary file, which should be on the
+            same filesystem as its final location.
+
+    Returns:
+        The path of the temporary file, the sha256 of its content and its size.
+    """
+    headers = getattr(response, "headers", None) or {}
+    try:
+        total: Optional[int] = int(headers["Content-Length"])
+    except (KeyError, TypeError, ValueError):
+        total = None
+    if _MAX_DOWNLOAD_SIZE is not None and total is not None:
+        if total > _MAX_DOWNLOAD_SIZE:
+            _close(response)
+            raise ValueError(_too_large_message(url))
+
+    # responses of custom sessions or adapters may not support streaming
+    if hasattr(response, "iter_content"):
+        chunks = response.iter_content(chunk_size=_CHUNK_SIZE)
+    else:
+        chunks = [response.content]
+
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    sha256 = hashlib.sha256()
+    size: int = 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if _MAX_DOWNLOAD_SIZE is not None and size > _MAX_DOWNLOAD_SIZE:
+                    raise ValueError(_too_large_message(url))
+                sha256.update(chunk)
+                f.write(chunk)
+                if _PROGRESS is not None:
+                    _PROGRESS(url, size, total)
+    except BaseException:
+        _close(response)
+        os.remove(tmp_path)
+        raise
+    return tmp_path, sha256.hexdigest(), size
+
+
+def _too_large_message(url: str) -> str:
+    return (
+        f"The file at '{url}' is larger than the maximum download size "
+        f"({_MAX_DOWNLOAD_SIZE} bytes). It can be changed with "
+        "`configure_http(max_download_size=...)`."
+    )
+
+
+def _close(response: "requests.Response") -> None:
+    # releases the connection of a streamed response that is not fully read
+    if hasattr(response, "close"):
+        response.close()
@@ -0,0 +1,90 @@
+import hashlib
+import io
+import os
+
+from pyfonts.cache import _get_cache_dir, _touch_cached_font
+from pyfonts.lock import _atomic_write, _file_lock
+from pyfonts.metrics import _stage
+
+
+def _merge_fonts(font_files: list[str]) -> str:
+    """
+    Merge the subset files of a font (latin, cyrillic, etc) into a single ttf
+    file, stored in the cache next to the subsets.
+
+    Args:
+        font_files: Paths of the ttf files to merge. When several files have a
+            glyph for a same character, the first one is used.
+
+    Returns:
+        The path of the merged file.
+    """
+    merge_id: str = "\n".join(os.path.basename(path) for path in font_files)
+    merge_hash: str = hashlib.sha256(f"merge:{merge_id}".encode()).hexdigest()
+    cache_dir: str = _get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    merged_file: str = os.path.join(cache_dir, f"{merge_hash}.merged.ttf")
+
+    with _file_lock(f"{merged_file}.lock"):
+        if not os.path.exists(merged_file):
+            with _stage("merge", file=merged_file) as stage:
+                from fontTools.merge import Merger
+
+                output = io.BytesIO()
+                Merger().merge(font_files).save(output)
+                stage["bytes"] = len(output.getvalue())
+                _atomic_write(merged_file, output.getvalue())
+        else:
+            _touch_cached_font(merged_file)
+    return merged_file
+
+
+def _subset_font(font_file: str, text: str) -> str:
+    """
+    Create a copy of a font with only the glyphs needed to render a text,
+    stored in the cache and keyed by the font file and the set of characters.
+
+    Args:
+        font_file: Path of the ttf/otf file to subset.
+        text: The characters to keep.
+
+    Returns:
+        The path of the subset file.
+    """
+    stat: os.stat_result = os.stat(font_file)
+    codepoints: str = ",".join(str(ord(char)) for char in sorted(set(text)))
+    source: str = f"{os.path.abspath(font_file)}:{stat.st_mtime_ns}:{stat.st_size}"
+    subset_hash: str = hashlib.sha256(
+        f"subset:{source}:{codepoints}".encode()
+    ).hexdigest()
+    cache_dir: str = _get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    subset_file: str = os.path.join(
+        cache_dir, f"{subset_hash}.subset{os.path.splitext(font_file)[1] or '.ttf'}"
+    )
+
+    with _file_lock(f"{subset_file}.lock"):
+        if not os.path.exists(subset_file):
+            with _stage("subset", file=font_file) as stage:
+                from fontTools.subset import Options, Subsetter
+                from fontTools.ttLib import TTFont
+
+                options = Options(
+                    layout_features=["*"],
+                    name_IDs=["*"],
+                    name_languages=["*"],
+                    notdef_outline=True,
+                )
+
+                font = TTFont(font_file)
+                subsetter = Subsetter(options=options)
+                subsetter.populate(text=text)
+                subsetter.subset(font)
+
+                output = io.BytesIO()
+                font.save(output)
+                stage["bytes"] = len(output.getvalue())
+                _atomic_write(subset_file, output.getvalue())
+        else:
+            _touch_cached_font(subset_file)
+    return subset_file
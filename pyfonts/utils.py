@@ -1,14 +1,36 @@
-import re
-import os
-from typing import Optional, Union
-import requests
+import importlib.util
+from typing import Callable, Optional, Union, overload
 
 from pyfonts.cache import (
     _cache_key,
-    _load_cache_from_disk,
-    _save_cache_to_disk,
-    _MEMORY_CACHE,
-    _CACHE_FILE,
+    _is_stale,
+    _renew_validators,
+    _url_cache_get,
+    _url_cache_set,
+    _validators_get,
+    _validators_set,
+)
+from pyfonts.catalog import _get_family_axes, _resolve_weight
+from pyfonts.metrics import _cache_event, _stage
+from pyfonts.session import (
+    _conditional_headers,
+    _http_get,
+    _validators_from_response,
+)
+from pyfonts.css import _FontFace, _parse_css, _select_face
+from pyfonts.offline import _is_offline, _lockfile_url
+
+_GOOGLE_ENDPOINT: str = "https://fonts.googleapis.com/css2"
+_BUNNY_ENDPOINT: str = "https://fonts.bunny.net/css"
+
+# Google Fonts only splits fonts into subsets with a `unicode-range` for
+# browsers that support it, and sends a single ttf file to other clients
+_WOFF2_USER_AGENT: str = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+_WOFF_USER_AGENT: str = (
+    "Mozilla/5.0 (Windows NT 6.1; rv:38.0) Gecko/20100101 Firefox/38.0"
 )
 
 
@@ -36,15 +58,127 @@ def _get_fonturl(
         Direct URL to the font file matching the requested style and format.
     """
     if isinstance(weight, str):
-        weight: int = _map_weight_to_numeric(weight)
+        weight = _map_weight_to_numeric(weight)
+
+    # relative font urls are resolved against the endpoint, since it only
+    # differs from the url of the CSS by its query
+    def select(css_text: str) -> str:
+        return _select_fonturl(
+            _parse_css(css_text, endpoint), family, weight, italic, allowed_formats
+        )
+
+    cache_key: str = _cache_key(
+        family, weight, italic, allowed_formats, _endpoint_key(endpoint)
+    )
+    if use_cache or _is_offline():
+        cached_url: Optional[str] = _url_cache_get(cache_key)
+        _cache_event("url", cached_url is not None, cache_key)
+        if cached_url is not None:
+            return _revalidate(cache_key, cached_url, select)
+
+    locked_url: Optional[str] = _lockfile_url(endpoint, family, weight, italic)
+    if locked_url is not None and locked_url.rsplit(".", 1)[-1] in allowed_formats:
+        return locked_url
+
+    if endpoint == _GOOGLE_ENDPOINT:
+        weight = _resolve_weight(family, weight, italic)
+
+    if _is_offline():
+        raise RuntimeError(
+            f"Offline mode is enabled and the url of '{family}' (weight={weight}, "
+            f"italic={italic}) is neither in the cache nor in the lockfile. "
+            "Add it to your manifest and run `python -m pyfonts warm`."
+        )
+
+    css_url: str = _get_css_url(endpoint, family, weight, italic)
+    css_text, validators = _fetch_css(css_url)
+    font_url: str = select(css_text)
 
-    cache_key: str = _cache_key(family, weight, italic, allowed_formats)
     if use_cache:
-        if not _MEMORY_CACHE and os.path.exists(_CACHE_FILE):
-            _MEMORY_CACHE.update(_load_cache_from_disk())
-        if cache_key in _MEMORY_CACHE:
-            return _MEMORY_CACHE[cache_key]
+        _url_cache_set(cache_key, font_url)
+        _validators_set(cache_key, css_url, validators)
+    return font_url
+
+
+def _select_fonturl(
+    faces: tuple[_FontFace, ...],
+    family: str,
+    weight: Optional[int],
+    italic: Optional[bool],
+    allowed_formats: list,
+) -> str:
+    """
+    Pick the url of the requested variant among the faces of a CSS.
+    """
+    face: Optional[_FontFace] = _select_face(
+        faces,
+        allowed_formats,
+        weight=400 if weight is None else weight,
+        style="italic" if italic else "normal",
+    )
+    if face is None:
+        raise RuntimeError(
+            f"No font files found in formats {allowed_formats} for '{family}'"
+        )
+    return face.url
+
+
+def _revalidate(
+    cache_key: str,
+    cached_value: str,
+    select: Callable[[str], str],
+    headers: Optional[dict] = None,
+) -> str:
+    """
+    Revalidate a url cache entry if it is stale, with a conditional request
+    to the CSS it was resolved from. If the CSS has not changed, this costs a
+    `304` response with no body.
+
+    Args:
+        cache_key: The key of the entry in the url cache.
+        cached_value: The cached value.
+        select: The function used to get the value of the entry from the CSS.
+        headers: Extra headers the CSS was requested with.
+
+    Returns:
+        The up to date value of the entry. The stale value is returned if the
+        CSS can't be fetched.
+    """
+    validators: Optional[dict] = _validators_get(cache_key)
+    if _is_offline() or validators is None or not _is_stale(validators):
+        return cached_value
+
+    try:
+        css_text, new_validators = _fetch_css(validators["url"], validators, headers)
+        if css_text is not None:
+            cached_value = select(css_text)
+    except Exception:
+        _renew_validators(cache_key, validators)
+        return cached_value
+
+    _url_cache_set(cache_key, cached_value)
+    _renew_validators(cache_key, validators, new_validators)
+    return cached_value
+
+
+def _get_css_url(
+    endpoint: str,
+    family: str,
+    weight: Optional[int],
+    italic: Optional[bool],
+) -> str:
+    """
+    Construct the URL of the CSS of a family for the given style parameters.
+
+    Args:
+        endpoint: URL of the font provider.
+        family: Name of the font family (e.g., "Roboto").
+        weight: Numeric font weight (e.g., 400, 700). If None, no weight axis is set.
+        italic: Whether the font should be italic. If None, no italic axis is set.
 
+    Returns:
+        The URL of the CSS.
+    """
     url: str = f"{endpoint}?family={family.replace(' ', '+')}"
     settings: dict = {}
 
@@ -58,10 +192,250 @@ def _get_fonturl(
         axes = ",".join(settings.keys())
         values = ",".join(settings.values())
         url += f":{axes}@{values}"
+    return url
 
-    response = requests.get(url)
-    response.raise_for_status()
-    css_text = response.text
+
+def _get_subset_fonturls(
+    endpoint: str,
+    family: str,
+    weight: Optional[Union[int, str]],
+    italic: Optional[bool],
+    allowed_formats: list,
+    text: str,
+    use_cache: bool,
+) -> list[str]:
+    """
+    Get the urls of the subset files (latin, cyrillic, etc) needed to render a
+    text, using the `unicode-range` of each face of the CSS.
+
+    Args:
+        endpoint: URL of the font provider.
+        family: Name of the font family (e.g., "Roboto").
+        weight: Numeric font weight (e.g., 400, 700). If None, no weight axis is set.
+        italic: Whether the font should be italic. If None, no italic axis is set.
+        allowed_formats: List of acceptable font file extensions (e.g., ["woff2", "ttf"]).
+        text: The characters that will be rendered with the font.
+        use_cache: Whether or not to cache fonts (to make pyfonts faster).
+
+    Returns:
+        Direct URLs to the font files, the one covering the most characters first.
+    """
+    if isinstance(weight, str):
+        weight = _map_weight_to_numeric(weight)
+
+    codepoints: list[int] = sorted({ord(char) for char in text if not char.isspace()})
+    subset_format, headers = _subset_request(allowed_formats)
+
+    def select(css_text: str) -> list[str]:
+        return _select_subset_fonturls(
+            _parse_css(css_text, endpoint),
+            family,
+            weight,
+            italic,
+            allowed_formats,
+            codepoints,
+        )
+
+    # the stylesheet is cached instead of the urls for this text, so that all
+    # the texts rendered with a variant share a single entry and request
+    cache_key: str = "css:" + _cache_key(
+        family, weight, italic, [subset_format], _endpoint_key(endpoint)
+    )
+    if use_cache or _is_offline():
+        cached_css: Optional[str] = _url_cache_get(cache_key)
+        _cache_event("url", cached_css is not None, cache_key)
+        if cached_css is not None:
+            return select(_revalidate(cache_key, cached_css, lambda css: css, headers))
+
+    if endpoint == _GOOGLE_ENDPOINT:
+        weight = _resolve_weight(family, weight, italic)
+
+    if _is_offline():
+        raise RuntimeError(
+            f"Offline mode is enabled and the urls of '{family}' (weight={weight}, "
+            f"italic={italic}) for this text are not in the cache."
+        )
+
+    css_url: str = _get_css_url(endpoint, family, weight, italic)
+    css_text, validators = _fetch_css(css_url, headers=headers)
+    urls: list[str] = select(css_text)
+
+    if use_cache:
+        _url_cache_set(cache_key, css_text)
+        _validators_set(cache_key, css_url, validators)
+    return urls
+
+
+def _subset_request(allowed_formats: list) -> tuple[str, dict]:
+    """
+    Get the headers of a request for the CSS of a font split in subsets: the
+    user agent of a browser that supports `unicode-range` and woff2 if it can
+    be decompressed (it needs brotli), or only woff otherwise.
+
+    Returns:
+        The format of the subsets and the headers of the request.
+    """
+    brotli: bool = any(
+        importlib.util.find_spec(module) is not None
+        for module in ("brotli", "brotlicffi")
+    )
+    if "woff2" in allowed_formats and brotli:
+        return "woff2", {"User-Agent": _WOFF2_USER_AGENT}
+    return "woff", {"User-Agent": _WOFF_USER_AGENT}
+
+
+def _select_subset_fonturls(
+    faces: tuple[_FontFace, ...],
+    family: str,
+    weight: Optional[int],
+    italic: Optional[bool],
+    allowed_formats: list,
+    codepoints: list[int],
+) -> list[str]:
+    """
+    Pick the urls of the subsets of the requested variant that cover the
+    given codepoints.
+    """
+    best_face: Optional[_FontFace] = _select_face(
+        faces,
+        allowed_formats,
+        weight=400 if weight is None else weight,
+        style="italic" if italic else "normal",
+    )
+    if best_face is None:
+        raise RuntimeError(
+            f"No font files found in formats {allowed_formats} for '{family}'"
+        )
+
+    # all the subsets of the chosen variant and format
+    subsets: list[_FontFace] = [
+        face
+        for face in faces
+        if (face.weight, face.style, face.format)
+        == (best_face.weight, best_face.style, best_face.format)
+    ]
+    # greedy set cover: take the subset with the most missing characters first
+    urls: list[str] = []
+    missing: set[int] = set(codepoints)
+    while missing and subsets:
+        face: _FontFace = max(
+            subsets, key=lambda face: sum(face.covers(c) for c in missing)
+        )
+        covered: set[int] = {c for c in missing if face.covers(c)}
+        if not covered:
+            break
+        urls.append(face.url)
+        missing -= covered
+        subsets.remove(face)
+    if not urls:
+        # none of the characters are in the font, use the default subset
+        urls = [best_face.url]
+    return urls
+
+
+def _get_variable_fonturl(
+    endpoint: str,
+    family: str,
+    italic: Optional[bool],
+    allowed_formats: list,
+    use_cache: bool,
+) -> str:
+    """
+    Get the URL of the variable font file of a family, with the full range of
+    all its axes, so that a single file serves every instance.
+
+    Args:
+        endpoint: URL of the font provider.
+        family: Name of the font family (e.g., "Roboto").
+        italic: Whether the font should be italic.
+        allowed_formats: List of acceptable font file extensions (e.g., ["woff2", "ttf"]).
+        use_cache: Whether or not to cache fonts (to make pyfonts faster).
+
+    Returns:
+        Direct URL to the variable font file.
+    """
+
+    def select(css_text: str) -> str:
+        face: Optional[_FontFace] = _select_face(
+            _parse_css(css_text, endpoint),
+            allowed_formats,
+            style="italic" if italic else "normal",
+        )
+        if face is None:
+            raise RuntimeError(
+                f"No font files found in formats {allowed_formats} for '{family}'"
+            )
+        return face.url
+
+    cache_key: str = _cache_key(
+        family, "variable", italic, allowed_formats, _endpoint_key(endpoint)
+    )
+    if use_cache or _is_offline():
+        cached_url: Optional[str] = _url_cache_get(cache_key)
+        _cache_event("url", cached_url is not None, cache_key)
+        if cached_url is not None:
+            return _revalidate(cache_key, cached_url, select)
+
+    axes: dict = _get_family_axes(family)
+    if not axes:
+        raise ValueError(f"'{family}' is not a variable font.")
+
+    # axes must be sorted alphabetically, lowercase (registered) axes first
+    tags: list[str] = sorted(axes, key=lambda tag: (not tag.islower(), tag))
+    settings: dict = {"ital": "1"} if italic else {}
+    for tag in tags:
+        minimum, maximum, _ = axes[tag]
+        settings[tag] = f"{minimum:g}..{maximum:g}"
+    url: str = (
+        f"{endpoint}?family={family.replace(' ', '+')}"
+        f":{','.join(settings.keys())}@{','.join(settings.values())}"
+    )
+
+    css_text, validators = _fetch_css(url)
+    font_url: str = select(css_text)
+
+    if use_cache:
+        _url_cache_set(cache_key, font_url)
+        _validators_set(cache_key, url, validators)
+    return font_url
+
+
+@overload
+def _fetch_css(
+    url: str, validators: None = None, headers: Optional[dict] = None
+) -> tuple[str, dict]: ...
+
+
+@overload
+def _fetch_css(
+    url: str, validators: dict, headers: Optional[dict] = None
+) -> tuple[Optional[str], dict]: ...
+
+
+def _fetch_css(
+    url: str, validators: Optional[dict] = None, headers: Optional[dict] = None
+) -> tuple[Optional[str], dict]:
+    """
+    Fetch the CSS of a font provider.
+
+    Args:
+        url: The url of the CSS, including the family and its variants.
+        validators: The validators of a cached version of the CSS. If passed,
+            a conditional request is made.
+        headers: Extra headers of the request (e.g., a `User-Agent`).
+
+    Returns:
+        The CSS text, or `None` if the cached version is still valid, and
+        the validators of the response.
+    """
+    headers = {**(headers or {}), **_conditional_headers(validators or {})}
+    with _stage("css", url=url, bytes=0) as stage:
+        response = _http_get(url, headers=headers) if headers else _http_get(url)
+        if response.status_code == 304:
+            return None, _validators_from_response(response)
+        response.raise_for_status()
+        css_text: str = response.text
+        stage["bytes"] = len(css_text.encode())
 
     # for some reason, Bunny fonts sends this text response instead of an
     # actual error message, so we handle it ourselves manually.
@@ -71,23 +445,97 @@ def _get_fonturl(
             "Maybe the font variant (italic, bold, etc) you're looking for"
             " does not exist."
         )
+    return css_text, _validators_from_response(response)
 
-    formats_pattern = "|".join(map(re.escape, allowed_formats))
-    font_urls: list = re.findall(
-        rf"url\((https://[^)]+\.({formats_pattern}))\)", css_text
-    )
-    if not font_urls:
-        raise RuntimeError(
-            f"No font files found in formats {allowed_formats} for '{family}'"
-        )
 
-    for fmt in allowed_formats:
-        for font_url, ext in font_urls:
-            if ext == fmt:
-                if use_cache:
-                    _MEMORY_CACHE[cache_key] = font_url
-                    _save_cache_to_disk()
-                return font_url
+def _resolve_family_urls(
+    endpoint: str,
+    family: str,
+    variants: list[tuple[Optional[Union[int, str]], Optional[bool]]],
+    allowed_formats: list,
+    use_cache: bool,
+) -> dict[tuple[int, bool], str]:
+    """
+    Get the font file urls of several variants of a family with a single CSS
+    request, and store them all in the url cache so that loading each variant
+    afterwards does not need any CSS request.
+
+    Args:
+        endpoint: URL of the font provider.
+        family: Name of the font family (e.g., "Roboto").
+        variants: The `(weight, italic)` variants to resolve (e.g.,
+            `[(None, False), ("bold", True)]`). A `None` weight is the
+            regular weight.
+        allowed_formats: List of acceptable font file extensions (e.g., ["woff2", "ttf"]).
+        use_cache: Whether or not to cache fonts (to make pyfonts faster).
+
+    Returns:
+        The url of each `(weight, italic)` variant, for the variants that exist.
+    """
+    requested: set[tuple[int, int]] = set()
+    # the styles in which `weight=None` is resolved as 400, unless the
+    # catalog knows that the family has no regular weight in this style
+    regular_italics: set[int] = set()
+    for weight, italic in variants:
+        if weight is None:
+            if (
+                endpoint == _GOOGLE_ENDPOINT
+                and _resolve_weight(family, None, bool(italic)) is not None
+            ):
+                continue
+            regular_italics.add(int(bool(italic)))
+            weight = 400
+        weight = _map_weight_to_numeric(weight)
+        if not (100 <= weight <= 900):
+            raise ValueError(f"`weight` must be between 100 and 900, not {weight}.")
+        requested.add((int(bool(italic)), weight))
+    if not requested:
+        return {}
+
+    # only the requested tuples, since a single one that doesn't exist fails
+    # the whole request. They must be sorted, e.g. `ital,wght@0,400;1,700`
+    tuples: str = ";".join(f"{italic},{weight}" for italic, weight in sorted(requested))
+    url: str = f"{endpoint}?family={family.replace(' ', '+')}:ital,wght@{tuples}"
+    css_text, validators = _fetch_css(url)
+    faces: tuple[_FontFace, ...] = _parse_css(css_text, url)
+
+    urls: dict[tuple[int, bool], str] = {}
+    for italic, weight in sorted(requested):
+        style: str = "italic" if italic else "normal"
+        variant_faces: list[_FontFace] = [
+            face for face in faces if face.weight == weight and face.style == style
+        ]
+        face: Optional[_FontFace] = _select_face(variant_faces, allowed_formats)
+        if face is None:
+            continue
+        urls[(weight, bool(italic))] = face.url
+        if not use_cache:
+            continue
+        weight_args: list[Optional[int]] = [weight]
+        if weight == 400 and italic in regular_italics:
+            weight_args.append(None)
+        # `italic=None` and `italic=False` make the same request
+        for weight_arg in weight_args:
+            for italic_arg in [True] if italic else [False, None]:
+                key: str = _cache_key(
+                    family,
+                    weight_arg,
+                    italic_arg,
+                    allowed_formats,
+                    _endpoint_key(endpoint),
+                )
+                _url_cache_set(key, face.url)
+                _validators_set(key, url, validators)
+    return urls
+
+
+def _endpoint_key(endpoint: str) -> Optional[str]:
+    """
+    Get the endpoint to add to url cache keys, so that providers don't share
+    their entries with each other. Google Fonts is kept out of the keys, so
+    that caches written by previous versions remain valid.
+    """
+    return None if endpoint == _GOOGLE_ENDPOINT else endpoint
 
 
 def _map_weight_to_numeric(weight_str: Union[str, int, float]) -> int:
@@ -0,0 +1,73 @@
+import hashlib
+import io
+import os
+
+from pyfonts.cache import _get_cache_dir, _touch_cached_font
+from pyfonts.lock import _atomic_write, _file_lock
+from pyfonts.metrics import _stage
+
+
+def _instantiate_font(font_file: str, variations: dict[str, float]) -> str:
+    """
+    Create a static instance of a variable font at the given axis
+    coordinates, stored in the cache and keyed by the font file and the
+    coordinates. Axes that are not in `variations` are set to their default.
+
+    Args:
+        font_file: Path of the variable ttf/otf file.
+        variations: Axis coordinates, e.g. `{"wght": 650, "wdth": 80}`.
+
+    Returns:
+        The path of the instance file.
+    """
+    stat: os.stat_result = os.stat(font_file)
+    coordinates: str = ",".join(
+        f"{tag}={float(value)}" for tag, value in sorted(variations.items())
+    )
+    source: str = f"{os.path.abspath(font_file)}:{stat.st_mtime_ns}:{stat.st_size}"
+    instance_hash: str = hashlib.sha256(
+        f"instance:{source}:{coordinates}".encode()
+    ).hexdigest()
+    cache_dir: str = _get_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    instance_file: str = os.path.join(
+        cache_dir,
+        f"{instance_hash}.instance{os.path.splitext(font_file)[1] or '.ttf'}",
+    )
+
+    with _file_lock(f"{instance_file}.lock"):
+        if not os.path.exists(instance_file):
+            with _stage("instantiate", file=font_file) as stage:
+                from fontTools.ttLib import TTFont
+                from fontTools.varLib.instancer import instantiateVariableFont
+
+                font = TTFont(font_file)
+                if "fvar" not in font:
+                    raise ValueError(
+                        f"The font '{font_file}' is not a variable font, "
+                        "it can't be used with `variations`."
+                    )
+                axes: dict = {axis.axisTag: axis for axis in font["fvar"].axes}
+                for tag, value in variations.items():
+                    if tag not in axes:
+                        raise ValueError(
+                            f"The font has no '{tag}' axis. Valid options are: "
+                            f"{', '.join(axes)}."
+                        )
+                    if not (axes[tag].minValue <= value <= axes[tag].maxValue):
+                        raise ValueError(
+                            f"`{tag}` must be between {axes[tag].minValue:g} and "
+                            f"{axes[tag].maxValue:g}, not {value}."
+                        )
+
+                # `None` pins an axis to its default value
+                limits: dict = {tag: variations.get(tag) for tag in axes}
+                instance = instantiateVariableFont(font, limits)
+
+                output = io.BytesIO()
+                instance.save(output)
+                stage["bytes"] = len(output.getvalue())
+                _atomic_write(instance_file, output.getvalue())
+        else:
+            _touch_cached_font(instance_file)
+    return instance_file
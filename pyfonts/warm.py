@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from pyfonts.main import load_font
+from pyfonts.lock import _atomic_write
+from pyfonts.providers import FontProvider, get_provider
+from pyfonts.utils import _map_weight_to_numeric
+
+
+def _read_manifest(manifest: str) -> list[dict]:
+    """
+    Read a TOML manifest and expand it to one request per font file.
+    """
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        import tomli as tomllib
+
+    with open(manifest, "rb") as f:
+        fonts: list = tomllib.load(f).get("fonts", [])
+
+    font_requests: list[dict] = []
+    for font in fonts:
+        provider: str = font.get("provider", "google")
+        get_provider(provider)  # raises an error if unknown
+        if "family" not in font:
+            raise ValueError(f"Missing `family` in manifest entry: {font}.")
+        for weight in font.get("weights", [None]):
+            for style in font.get("styles", ["normal"]):
+                if style not in ("normal", "italic"):
+                    raise ValueError(
+                        f"Invalid style '{style}'. Valid options are: normal, italic."
+                    )
+                font_requests.append(
+                    {
+                        "provider": provider,
+                        "family": font["family"],
+                        "weight": None
+                        if weight is None
+                        else _map_weight_to_numeric(weight),
+                        "italic": style == "italic",
+                    }
+                )
+    return font_requests
+
+
+def _warm_font(request: dict) -> dict:
+    provider: FontProvider = get_provider(request["provider"])
+    font_url: str = provider.get_fonturl(
+        family=request["family"],
+        weight=request["weight"],
+        italic=request["italic"],
+        allowed_formats=list(provider.allowed_formats),
+        use_cache=True,
+    )
+    # offline mode finds the urls of the lockfile by endpoint
+    endpoint: Optional[str] = getattr(provider, "endpoint", None)
+    font_file: str = str(load_font(font_url).get_file())
+    with open(font_file, "rb") as f:
+        sha256: str = hashlib.sha256(f.read()).hexdigest()
+    return {**request, "endpoint": endpoint, "url": font_url, "sha256": sha256}
+
+
+def warm_cache(
+    manifest: str,
+    lockfile: Optional[str] = None,
+    max_workers: int = 8,
+) -> list[dict]:
+    """
+    Download all the fonts listed in a manifest into the cache, and write a
+    lockfile mapping each font to its url and content hash. The lockfile can
+    then be used with [`set_offline_mode()`](offline.md) to load these fonts
+    without network access.
+
+    This is also available from the command line with
+    `python -m pyfonts warm fonts.toml`.
+
+    Args:
+        manifest: Path to a TOML manifest, with one `[[fonts]]` table per
+            family. Each table has a `family`, and optionally a `provider`
+            (`"google"`, the default, `"bunny"`, or the name of a provider
+            added with [`register_provider()`](providers.md#pyfonts.register_provider)),
+            a list of `weights` and a list of `styles` (`"normal"` and/or
+            `"italic"`).
+        lockfile: Where to write the lockfile. Default is the manifest path
+            with a `.lock.json` extension.
+        max_workers: Maximum number of fonts downloaded at the same time.
+            Default to `8`.
+
+    Returns:
+        The entries of the lockfile.
+
+    Examples:
+
+        ```toml
+        # fonts.toml
+        [[fonts]]
+        family = "Roboto"
+        weights = [400, "bold"]
+        styles = ["normal", "italic"]
+
+        [[fonts]]
+        provider = "bunny"
+        family = "Alumni Sans"
+        ```
+
+        ```python
+        from pyfonts import warm_cache
+
+        warm_cache("fonts.toml")  # writes fonts.lock.json
+        ```
+    """
+    if lockfile is None:
+        lockfile = os.path.splitext(manifest)[0] + ".lock.json"
+    font_requests: list[dict] = _read_manifest(manifest)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        entries: list[dict] = list(pool.map(_warm_font, font_requests))
+
+    content: str = json.dumps({"version": 1, "fonts": entries}, indent=2)
+    _atomic_write(os.path.abspath(lockfile), content.encode())
+    return entries
@@ -0,0 +1,49 @@
+import pytest
+
+from pyfonts.cache import _MEMORY_CACHE
+from pyfonts.memory import _FONT_MEMO
+
+
+class FakeResponse:
+    def __init__(self, text="", status_code=200, content=b"", headers=None):
+        self.text = text
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(tmp_path, tmp_path_factory, monkeypatch):
+    # every test gets its own cache, so that no test reads fonts cached by
+    # another one or writes to the cache of the user running the tests
+    cache_root = tmp_path_factory.mktemp("cache")
+    monkeypatch.setattr("pyfonts.cache._CACHE_ROOT", str(cache_root))
+    monkeypatch.setattr("pyfonts.cache._SHARED_CACHE_ROOTS", [])
+    monkeypatch.setattr("pyfonts.cache._CACHE_FILE", str(tmp_path / "legacy.json"))
+    monkeypatch.setattr("pyfonts.catalog._CATALOG", None)
+    monkeypatch.setattr("pyfonts.catalog._CATALOG_CHECKED", False)
+    _MEMORY_CACHE.clear()
+    _FONT_MEMO.clear()
+    yield cache_root
+    _MEMORY_CACHE.clear()
+    _FONT_MEMO.clear()
+
+
+@pytest.fixture
+def css_requests(monkeypatch, stylesheet):
+    # the modules using this fixture define the `stylesheet` fixture
+    urls = []
+
+    def fake_http_get(url, **kwargs):
+        urls.append(url)
+        return FakeResponse(stylesheet)
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+    return urls
@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+
+from matplotlib.font_manager import FontProperties
+
+from pyfonts import aload_font, aload_google_font
+
+
+def test_aload_font():
+    font = asyncio.run(aload_font("tests/Ultra-Regular.ttf"))
+    assert isinstance(font, FontProperties)
+    assert font.get_name() == "Ultra"
+
+
+def test_aload_google_font_shares_in_flight_load(monkeypatch):
+    calls = []
+    loop_thread = threading.get_ident()
+
+    def fake_load_google_font(family, **kwargs):
+        assert threading.get_ident() != loop_thread
+        calls.append(family)
+        time.sleep(0.05)
+        return FontProperties(family=family)
+
+    monkeypatch.setattr("pyfonts.aio.load_google_font", fake_load_google_font)
+
+    async def main():
+        return await asyncio.gather(
+            aload_google_font("Roboto"),
+            aload_google_font("Roboto"),
+            aload_google_font("Lato"),
+        )
+
+    roboto_1, roboto_2, lato = asyncio.run(main())
+
+    assert sorted(calls) == ["Lato", "Roboto"]
+    assert roboto_1 is not roboto_2
+    assert roboto_1.get_family() == roboto_2.get_family() == ["Roboto"]
+
+    # each caller can change its own font
+    roboto_1.set_size(30)
+    assert roboto_2.get_size() != 30
+    assert lato.get_family() == ["Lato"]
+
+
+def test_aload_font_forwards_arguments(monkeypatch):
+    calls = []
+
+    def fake_load_google_font(family, **kwargs):
+        calls.append((family, kwargs["text"], kwargs["variations"]))
+        return FontProperties(family=family)
+
+    monkeypatch.setattr("pyfonts.aio.load_google_font", fake_load_google_font)
+
+    async def main():
+        return await asyncio.gather(
+            aload_google_font("Roboto", text="hello"),
+            aload_google_font("Roboto", text="world"),
+            aload_google_font("Roboto", variations={"wght": 650}),
+        )
+
+    asyncio.run(main())
+    assert sorted(calls, key=str) == sorted(
+        [
+            ("Roboto", "hello", None),
+            ("Roboto", "world", None),
+            ("Roboto", None, {"wght": 650}),
+        ],
+        key=str,
+    )
+
+    font = asyncio.run(aload_font("tests/Ultra-Regular.ttf", subset_text="Hi"))
+    assert font.get_name() == "Ultra"
+    assert str(font.get_file()).endswith(".subset.ttf")
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+from matplotlib.font_manager import FontProperties
+
+from pyfonts import load_fonts, load_google_fonts, load_bunny_fonts
+
+
+def test_load_fonts_keeps_order():
+    fonts = load_fonts(
+        [
+            "tests/Ultra-Regular.ttf",
+            "tests/Amarante-Regular.ttf",
+            "tests/Ultra-Regular.ttf",
+        ]
+    )
+    assert [font.get_name() for font in fonts] == ["Ultra", "Amarante", "Ultra"]
+    # identical requests get their own copy of the font
+    fonts[0].set_size(30)
+    assert fonts[2].get_size() != 30
+    assert load_fonts([]) == []
+
+
+def test_load_google_fonts_is_concurrent(monkeypatch):
+    calls = []
+    running = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_load_google_font(family, **kwargs):
+        with lock:
+            calls.append((family, kwargs))
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        return FontProperties(family=family)
+
+    monkeypatch.setattr("pyfonts.batch.load_google_font", fake_load_google_font)
+
+    fonts = load_google_fonts(
+        ["Roboto", {"family": "Lato", "weight": "bold"}, "Roboto", "Barrio"],
+        max_workers=3,
+        use_cache=False,
+    )
+
+    assert [font.get_family() for font in fonts] == [
+        ["Roboto"],
+        ["Lato"],
+        ["Roboto"],
+        ["Barrio"],
+    ]
+    # identical requests are only loaded once
+    assert len(calls) == 3
+    assert ("Lato", {"weight": "bold", "use_cache": False}) in calls
+    assert 1 < running["max"] <= 3
+
+
+def test_load_fonts_errors(monkeypatch):
+    with pytest.raises(ValueError, match="`max_workers` must be at least 1"):
+        load_fonts(["tests/Ultra-Regular.ttf"], max_workers=0)
+
+    with pytest.raises(TypeError, match="Each font must be a family name or a dict"):
+        load_bunny_fonts([42])  # ty: ignore
+
+    with pytest.raises(FileNotFoundError):
+        load_fonts(["tests/Ultra-Regular.ttf", "/path/to/font.ttf"])
+
+
+def test_load_google_fonts():
+    fonts = load_google_fonts(["Roboto", {"family": "Open Sans", "weight": "bold"}])
+    assert [font.get_name() for font in fonts] == ["Roboto", "Open Sans"]
@@ -1,7 +1,15 @@
 import pytest
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from pyfonts import clear_pyfonts_cache, load_font, load_google_font
-from pyfonts.cache import _load_cache_from_disk
+from pyfonts.cache import (
+    _load_cache_from_disk,
+    _url_cache_get,
+    _url_cache_set,
+    _MEMORY_CACHE,
+)
+from pyfonts.memory import _FONT_MEMO
 import sys
 
 pytestmark = pytest.mark.skipif(
@@ -54,3 +62,234 @@ def test_pyfonts_cache(verbose, use_cache, capsys):
     captured = capsys.readouterr()
     if verbose:
         assert "No font cache directory found" in captured.out
+
+
+def test_woff2_cached_as_ttf(tmp_path, monkeypatch):
+    pytest.importorskip("brotli")
+    from io import BytesIO
+    from fontTools.ttLib import TTFont
+
+    buffer = BytesIO()
+    font = TTFont("tests/Ultra-Regular.ttf")
+    font.flavor = "woff2"
+    font.save(buffer)
+
+    class DummyResponse:
+        status_code = 200
+        content = buffer.getvalue()
+
+    monkeypatch.setattr("pyfonts.cache._get_cache_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(
+        "pyfonts.main._http_get", lambda *args, **kwargs: DummyResponse()
+    )
+
+    font_url = "https://example.com/Ultra-Regular.woff2"
+    font = load_font(font_url)
+    assert font.get_name() == "Ultra"
+    assert str(font.get_file()).endswith(".ttf")
+    assert len(list(tmp_path.glob("*.ttf"))) == 1
+    assert not list(tmp_path.glob("*.woff*"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a warm load should not decompress nor download")
+
+    monkeypatch.setattr("pyfonts.main._decompress_woff_to_ttf", fail)
+    monkeypatch.setattr("pyfonts.main._http_get", fail)
+    _FONT_MEMO.clear()
+    warm_font = load_font(font_url)
+    assert warm_font.get_file() == font.get_file()
+
+
+# forked workers inherit the monkeypatched cache locations
+_FORK = multiprocessing.get_context("fork") if sys.platform != "win32" else None
+
+
+def test_url_cache_roundtrip():
+    assert _url_cache_get("key") is None
+    _url_cache_set("key", "https://example.com/font.woff2")
+
+    _MEMORY_CACHE.clear()
+    assert _url_cache_get("key") == "https://example.com/font.woff2"
+    assert "key" in _MEMORY_CACHE
+
+
+def test_url_cache_migrates_json(tmp_path):
+    legacy = tmp_path / "legacy.json"
+    legacy.write_text(json.dumps({"key": "https://example.com/font.ttf"}))
+
+    assert _url_cache_get("key") == "https://example.com/font.ttf"
+    assert not legacy.exists()
+
+
+def _write_entries(worker: int) -> None:
+    _MEMORY_CACHE.clear()
+    for i in range(50):
+        _url_cache_set(f"{worker}-{i}", f"https://example.com/{worker}/{i}.ttf")
+
+
+def test_url_cache_concurrent_processes():
+    with ProcessPoolExecutor(max_workers=4, mp_context=_FORK) as pool:
+        list(pool.map(_write_entries, range(8)))
+
+    _MEMORY_CACHE.clear()
+    for worker in range(8):
+        for i in range(50):
+            assert (
+                _url_cache_get(f"{worker}-{i}")
+                == f"https://example.com/{worker}/{i}.ttf"
+            )
+
+
+def test_clear_url_cache(monkeypatch):
+    _url_cache_set("key", "https://example.com/font.ttf")
+
+    clear_pyfonts_cache(verbose=False)
+    assert _url_cache_get("key") is None
+
+
+def _load_slow_font(font_url: str) -> str:
+    return load_font(font_url).get_name()
+
+
+def test_single_flight_download(tmp_path, monkeypatch):
+    import time
+
+    downloads = tmp_path / "downloads.txt"
+    content = open("tests/Ultra-Regular.ttf", "rb").read()
+
+    class DummyResponse:
+        status_code = 200
+        content = b""
+
+    def slow_http_get(url, **kwargs):
+        with open(downloads, "a") as f:
+            f.write(url + "\n")
+        time.sleep(0.2)
+        response = DummyResponse()
+        response.content = content
+        return response
+
+    monkeypatch.setattr("pyfonts.cache._get_cache_dir", lambda: str(tmp_path))
+    monkeypatch.setattr("pyfonts.main._http_get", slow_http_get)
+
+    font_url = "https://example.com/Ultra-Regular.ttf"
+    with ProcessPoolExecutor(max_workers=4, mp_context=_FORK) as pool:
+        names = list(pool.map(_load_slow_font, [font_url] * 4))
+
+    assert names == ["Ultra"] * 4
+    assert downloads.read_text().splitlines() == [font_url]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_identical_fonts_are_stored_once(tmp_cache, monkeypatch):
+    pytest.importorskip("brotli")
+    from io import BytesIO
+    from fontTools.ttLib import TTFont
+    from pyfonts.decompress import _decompress_woff_to_ttf as decompress
+
+    buffer = BytesIO()
+    font = TTFont("tests/Ultra-Regular.ttf")
+    font.flavor = "woff2"
+    font.save(buffer)
+
+    class DummyResponse:
+        status_code = 200
+        content = buffer.getvalue()
+
+    conversions = []
+
+    def counting_decompress(content):
+        conversions.append(content)
+        return decompress(content)
+
+    monkeypatch.setattr("pyfonts.main._decompress_woff_to_ttf", counting_decompress)
+    monkeypatch.setattr("pyfonts.main._http_get", lambda *a, **k: DummyResponse())
+
+    first = load_font("https://fonts.gstatic.com/s/ultra/v1/Ultra.woff2")
+    second = load_font("https://fonts.bunny.net/ultra/files/ultra-latin-400.woff2")
+
+    assert first.get_file() == second.get_file()
+    assert len(conversions) == 1
+    assert len(list((tmp_cache / "pyfontsloader").glob("*.ttf"))) == 1
+
+
+def test_corrupted_blob_is_downloaded_again(monkeypatch):
+    downloads = []
+
+    class DummyResponse:
+        status_code = 200
+        content = open("tests/Ultra-Regular.ttf", "rb").read()
+
+    def fake_http_get(url, **kwargs):
+        downloads.append(url)
+        return DummyResponse()
+
+    monkeypatch.setattr("pyfonts.main._http_get", fake_http_get)
+
+    font_url = "https://example.com/Ultra-Regular.ttf"
+    font_file = str(load_font(font_url).get_file())
+    with open(font_file, "r+b") as f:
+        f.truncate(100)
+
+    _FONT_MEMO.clear()
+    assert load_font(font_url).get_name() == "Ultra"
+    assert len(downloads) == 2
+
+
+def test_invalid_download_is_not_cached(tmp_cache, monkeypatch):
+    responses = [
+        b"<html>not a font</html>",
+        open("tests/Ultra-Regular.ttf", "rb").read(),
+    ]
+
+    class DummyResponse:
+        status_code = 200
+
+        def __init__(self, content):
+            self.content = content
+
+    monkeypatch.setattr(
+        "pyfonts.main._http_get", lambda *a, **k: DummyResponse(responses.pop(0))
+    )
+
+    font_url = "https://example.com/not-a-font/Ultra-Regular.ttf"
+    with pytest.raises(ValueError, match="is not a valid font file"):
+        load_font(font_url)
+    # the file is not kept in the cache
+    cache_dir = tmp_cache / "pyfontsloader"
+    assert not list(cache_dir.glob("*.ttf")) and not list(cache_dir.glob("*.tmp"))
+
+    assert load_font(font_url).get_name() == "Ultra"
+    assert responses == []
+
+
+def test_new_converter_version_converts_again(tmp_cache, monkeypatch):
+    from io import BytesIO
+    from fontTools.ttLib import TTFont
+
+    buffer = BytesIO()
+    font = TTFont("tests/Ultra-Regular.ttf")
+    font.flavor = "woff"
+    font.save(buffer)
+
+    class DummyResponse:
+        status_code = 200
+        content = buffer.getvalue()
+
+    conversions = []
+
+    def counting_decompress(content):
+        conversions.append(content)
+        return open("tests/Ultra-Regular.ttf", "rb").read()
+
+    monkeypatch.setattr("pyfonts.main._decompress_woff_to_ttf", counting_decompress)
+    monkeypatch.setattr("pyfonts.main._http_get", lambda *a, **k: DummyResponse())
+
+    load_font("https://fonts.gstatic.com/s/ultra/v1/Ultra.woff")
+    load_font("https://fonts.bunny.net/ultra/files/ultra-latin-400.woff")
+    assert len(conversions) == 1
+
+    monkeypatch.setattr("pyfonts.cache._CONVERTER_VERSION", 1000)
+    _FONT_MEMO.clear()
+    load_font("https://fonts.gstatic.com/s/ultra/v1/Ultra.woff")
+    assert len(conversions) == 2
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest
+
+import pyfonts.cache
+from pyfonts import configure_cache, load_font
+from pyfonts.cache import (
+    _get_cache_dir,
+    _get_index_file,
+    _url_cache_get,
+    _url_cache_set,
+    _MEMORY_CACHE,
+    _LOCAL,
+)
+from pyfonts.memory import _FONT_MEMO
+
+
+@pytest.fixture(autouse=True)
+def reset_cache_location(monkeypatch):
+    monkeypatch.setattr("pyfonts.cache._CACHE_ROOT", None)
+    monkeypatch.setattr("pyfonts.cache._SHARED_CACHE_ROOTS", None)
+    monkeypatch.delenv("PYFONTS_CACHE_DIR", raising=False)
+    monkeypatch.delenv("PYFONTS_SHARED_CACHE_DIRS", raising=False)
+    _MEMORY_CACHE.clear()
+    _FONT_MEMO.clear()
+    yield
+    _MEMORY_CACHE.clear()
+    _FONT_MEMO.clear()
+
+
+def test_default_cache_location():
+    home_cache = os.path.join(os.path.expanduser("~"), ".cache")
+    assert _get_cache_dir() == os.path.join(home_cache, "pyfontsloader")
+    assert _get_index_file() == os.path.join(home_cache, ".pyfonts_cache.sqlite3")
+    assert pyfonts.cache._get_shared_cache_roots() == []
+
+
+def test_cache_location_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("PYFONTS_CACHE_DIR", str(tmp_path / "env"))
+    monkeypatch.setenv(
+        "PYFONTS_SHARED_CACHE_DIRS", os.pathsep.join(["/opt/a", "", "/opt/b"])
+    )
+    assert _get_cache_dir() == str(tmp_path / "env" / "pyfontsloader")
+    assert pyfonts.cache._get_shared_cache_roots() == ["/opt/a", "/opt/b"]
+
+    configure_cache(cache_dir=str(tmp_path / "api"), shared_cache_dirs=[])
+    assert _get_cache_dir() == str(tmp_path / "api" / "pyfontsloader")
+    assert pyfonts.cache._get_shared_cache_roots() == []
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses chmod")
+def test_shared_cache_is_checked_first(tmp_path, monkeypatch):
+    shared, user = tmp_path / "shared", tmp_path / "user"
+    font_url = "https://example.com/Ultra-Regular.ttf"
+
+    class DummyResponse:
+        status_code = 200
+        content = open("tests/Ultra-Regular.ttf", "rb").read()
+
+    # build the shared cache, e.g. when building a docker image
+    configure_cache(cache_dir=str(shared))
+    monkeypatch.setattr("pyfonts.main._http_get", lambda *a, **k: DummyResponse())
+    load_font(font_url)
+    _url_cache_set("key", font_url)
+    _LOCAL.conn.close()
+    del _LOCAL.conn
+    for path in [shared / "pyfontsloader", shared]:
+        os.chmod(path, 0o555)
+
+    try:
+        configure_cache(cache_dir=str(user), shared_cache_dirs=[str(shared)])
+        _MEMORY_CACHE.clear()
+        _FONT_MEMO.clear()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("the font should come from the shared cache")
+
+        monkeypatch.setattr("pyfonts.main._http_get", fail)
+        font = load_font(font_url)
+        assert font.get_name() == "Ultra"
+        assert str(font.get_file()).startswith(str(shared))
+        assert not list((user / "pyfontsloader").glob("*.ttf"))
+        assert _url_cache_get("key") == font_url
+    finally:
+        for path in [shared, shared / "pyfontsloader"]:
+            os.chmod(path, 0o755)
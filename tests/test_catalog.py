@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from pyfonts import search_families, set_offline_mode
+from pyfonts.catalog import _get_catalog, _resolve_weight
+from pyfonts.utils import _get_fonturl, _GOOGLE_ENDPOINT
+from tests.conftest import FakeResponse
+
+METADATA = {
+    "familyMetadataList": [
+        {
+            "family": "Roboto",
+            "fonts": {"100": {}, "400": {}, "400i": {}, "700": {}, "900": {}},
+            "axes": [
+                {"tag": "wght", "min": 100.0, "max": 900.0, "defaultValue": 400.0}
+            ],
+        },
+        {"family": "Roboto Mono", "fonts": {"400": {}}, "axes": []},
+        {"family": "Ultra", "fonts": {"400": {}}, "axes": []},
+        {"family": "Sedgwick Ave Display", "fonts": {"700": {}}, "axes": []},
+    ]
+}
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    monkeypatch.setattr("pyfonts.offline._OFFLINE", None)
+    monkeypatch.delenv("PYFONTS_OFFLINE", raising=False)
+    monkeypatch.setattr(
+        "pyfonts.catalog._http_get",
+        lambda url, **kwargs: FakeResponse(")]}'\n" + json.dumps(METADATA)),
+    )
+
+
+def test_search_families(catalog):
+    assert search_families("roboto") == ["Roboto", "Roboto Mono"]
+    assert search_families("mono") == ["Roboto Mono"]
+    assert search_families("Robto", limit=1) == ["Roboto"]
+    assert search_families("xyz") == []
+
+
+def test_resolve_weight(catalog):
+    # the catalog is only used once downloaded
+    assert _resolve_weight("Ultra", 700, False) == 700
+    _get_catalog()
+
+    assert _resolve_weight("Roboto", None, True) is None
+    assert _resolve_weight("Roboto", 350, False) == 350
+    assert _resolve_weight("Sedgwick Ave Display", None, False) == 700
+    with pytest.raises(ValueError, match="Valid options are: 400"):
+        _resolve_weight("Ultra", 700, False)
+    with pytest.raises(ValueError, match="no italic style"):
+        _resolve_weight("Ultra", None, True)
+
+    # unknown families may be newer than the catalog
+    assert _resolve_weight("Brand New", 400, False) == 400
+
+
+def test_invalid_variants_fail_without_request(catalog, monkeypatch):
+    _get_catalog()
+
+    def fail(url, **kwargs):
+        raise AssertionError("no request should be made")
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fail)
+    with pytest.raises(ValueError, match="no normal weight 700"):
+        _get_fonturl(_GOOGLE_ENDPOINT, "Ultra", "bold", False, ["ttf"], True)
+
+    set_offline_mode(True)
+    try:
+        with pytest.raises(ValueError, match="Did you mean: 'Roboto'"):
+            _get_fonturl(_GOOGLE_ENDPOINT, "Robotto", 400, False, ["ttf"], True)
+    finally:
+        set_offline_mode(False)
@@ -0,0 +1,242 @@
+import threading
+import time
+
+import pytest
+from matplotlib.font_manager import FontProperties
+
+from pyfonts import load_google_fonts
+from pyfonts.cache import _cache_key, _url_cache_get
+from pyfonts.css import _FontFace, _parse_css, _parse_unicode_range, _select_face
+from pyfonts.utils import _get_fonturl, _resolve_family_urls, _GOOGLE_ENDPOINT
+from tests.conftest import FakeResponse
+
+FORMATS = ["woff2", "woff", "ttf", "otf"]
+
+CSS = """
+/* cyrillic */
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  src: url(https://fonts.gstatic.com/s/roboto/v1/regular-cyrillic.woff2) format('woff2');
+  unicode-range: U+0301, U+0400-045F;
+}
+/* latin */
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  src: url(https://fonts.gstatic.com/s/roboto/v1/regular-latin.woff2) format('woff2');
+  unicode-range: U+0000-00FF, U+0131, U+0152-0153;
+}
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 700;
+  src: url(https://fonts.gstatic.com/s/roboto/v1/bold.ttf) format('truetype');
+}
+@font-face {
+  font-family: 'Roboto';
+  font-style: italic;
+  font-weight: 400;
+  src: url(https://fonts.gstatic.com/s/roboto/v1/italic.woff2) format('woff2');
+}
+"""
+
+
+@pytest.fixture
+def stylesheet():
+    return CSS
+
+
+def test_parse_css():
+    faces = _parse_css(CSS)
+    assert len(faces) == 4
+    assert faces[1] == _FontFace(
+        family="Roboto",
+        weight=400,
+        style="normal",
+        url="https://fonts.gstatic.com/s/roboto/v1/regular-latin.woff2",
+        format="woff2",
+        unicode_range=((0x0000, 0x00FF), (0x0131, 0x0131), (0x0152, 0x0153)),
+    )
+    assert faces[2].format == "ttf"
+    assert faces[2].unicode_range == ()
+    assert faces[2].covers(0x4E00)
+    assert faces[3].style == "italic"
+    # the parsed stylesheet is cached
+    assert _parse_css(CSS) is faces
+
+
+def test_parse_unicode_range():
+    assert _parse_unicode_range("U+0000-00FF, U+0131, u+04??") == (
+        (0x0000, 0x00FF),
+        (0x0131, 0x0131),
+        (0x0400, 0x04FF),
+    )
+    assert _parse_unicode_range("") == ()
+
+
+def test_select_face():
+    faces = _parse_css(CSS)
+    regular = [face for face in faces if face.weight == 400 and face.style == "normal"]
+
+    face = _select_face(regular, FORMATS)
+    assert face is not None and face.url.endswith("regular-latin.woff2")
+    assert _select_face(regular, ["ttf"]) is None
+    assert _select_face([], FORMATS) is None
+
+    # the choice does not depend on the order of the stylesheet
+    assert _select_face(regular[::-1], FORMATS) == _select_face(regular, FORMATS)
+    # format preference comes before latin coverage
+    face = _select_face(faces[:3], ["ttf", "woff2"])
+    assert face is not None and face.url.endswith("bold.ttf")
+
+
+def test_get_fonturl_picks_latin_subset(css_requests):
+    url = _get_fonturl(
+        endpoint=_GOOGLE_ENDPOINT,
+        family="Roboto",
+        weight=None,
+        italic=None,
+        allowed_formats=FORMATS,
+        use_cache=True,
+    )
+    assert url == "https://fonts.gstatic.com/s/roboto/v1/regular-latin.woff2"
+
+    with pytest.raises(RuntimeError, match="No font files found in formats"):
+        _get_fonturl(_GOOGLE_ENDPOINT, "Roboto", None, None, ["otf"], False)
+
+
+def test_resolve_family_urls_single_request(css_requests):
+    urls = _resolve_family_urls(
+        endpoint=_GOOGLE_ENDPOINT,
+        family="Roboto",
+        variants=[("bold", False), (400, True), (400, False), ("bold", True)],
+        allowed_formats=FORMATS,
+        use_cache=True,
+    )
+
+    assert css_requests == [
+        f"{_GOOGLE_ENDPOINT}?family=Roboto:ital,wght@0,400;0,700;1,400;1,700"
+    ]
+    # bold italic is not in the CSS
+    assert urls == {
+        (400, False): "https://fonts.gstatic.com/s/roboto/v1/regular-latin.woff2",
+        (700, False): "https://fonts.gstatic.com/s/roboto/v1/bold.ttf",
+        (400, True): "https://fonts.gstatic.com/s/roboto/v1/italic.woff2",
+    }
+    assert (
+        _url_cache_get(_cache_key("Roboto", 700, None, FORMATS)) == urls[(700, False)]
+    )
+    assert (
+        _url_cache_get(_cache_key("Roboto", 700, False, FORMATS)) == urls[(700, False)]
+    )
+    assert _url_cache_get(_cache_key("Roboto", 400, True, FORMATS)) == urls[(400, True)]
+    assert _url_cache_get(_cache_key("Roboto", 700, True, FORMATS)) is None
+
+
+def test_resolve_family_urls_invalid_weight(css_requests):
+    with pytest.raises(ValueError, match="`weight` must be between 100 and 900"):
+        _resolve_family_urls(_GOOGLE_ENDPOINT, "Roboto", [(1000, False)], FORMATS, True)
+    assert css_requests == []
+
+
+def test_resolve_family_urls_only_requested_variants(css_requests):
+    urls = _resolve_family_urls(
+        _GOOGLE_ENDPOINT, "Roboto", [(700, False), (None, True)], FORMATS, True
+    )
+
+    # bold italic and regular normal are not requested, since a variant that
+    # doesn't exist would fail the whole request
+    assert css_requests == [f"{_GOOGLE_ENDPOINT}?family=Roboto:ital,wght@0,700;1,400"]
+    assert set(urls) == {(700, False), (400, True)}
+
+
+def test_load_google_fonts_one_css_request_per_family(css_requests, monkeypatch):
+    loaded = []
+
+    def fake_load_google_font(family, weight=None, italic=None, **kwargs):
+        loaded.append(_url_cache_get(_cache_key(family, weight, italic, FORMATS)))
+        return FontProperties(family=family)
+
+    monkeypatch.setattr("pyfonts.batch.load_google_font", fake_load_google_font)
+
+    load_google_fonts(
+        [
+            {"family": "Roboto", "weight": 400},
+            {"family": "Roboto", "weight": 700},
+            {"family": "Roboto", "weight": 400, "italic": True},
+        ],
+        allowed_formats=FORMATS,
+    )
+
+    assert len(css_requests) == 1
+    assert sorted(loaded) == [
+        "https://fonts.gstatic.com/s/roboto/v1/bold.ttf",
+        "https://fonts.gstatic.com/s/roboto/v1/italic.woff2",
+        "https://fonts.gstatic.com/s/roboto/v1/regular-latin.woff2",
+    ]
+
+
+def test_load_google_fonts_regular_weight(css_requests, monkeypatch):
+    loaded = []
+
+    def fake_load_google_font(family, weight=None, italic=None, **kwargs):
+        loaded.append(_url_cache_get(_cache_key(family, weight, italic, FORMATS)))
+        return FontProperties(family=family)
+
+    monkeypatch.setattr("pyfonts.batch.load_google_font", fake_load_google_font)
+
+    load_google_fonts(
+        [
+            "Roboto",
+            {"family": "Roboto", "weight": 700},
+            {"family": "Roboto", "italic": True},
+        ],
+        allowed_formats=FORMATS,
+    )
+
+    # `weight=None` is requested as the regular weight
+    assert css_requests == [
+        f"{_GOOGLE_ENDPOINT}?family=Roboto:ital,wght@0,400;0,700;1,400"
+    ]
+    assert sorted(loaded) == [
+        "https://fonts.gstatic.com/s/roboto/v1/bold.ttf",
+        "https://fonts.gstatic.com/s/roboto/v1/italic.woff2",
+        "https://fonts.gstatic.com/s/roboto/v1/regular-latin.woff2",
+    ]
+    assert _url_cache_get(_cache_key("Roboto", None, None, FORMATS)) == (
+        "https://fonts.gstatic.com/s/roboto/v1/regular-latin.woff2"
+    )
+
+
+def test_load_google_fonts_prefetches_concurrently(monkeypatch):
+    running = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fake_http_get(url, **kwargs):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        return FakeResponse(CSS)
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+    monkeypatch.setattr(
+        "pyfonts.batch.load_google_font", lambda **kwargs: FontProperties()
+    )
+
+    load_google_fonts(
+        [
+            {"family": family, "weight": weight}
+            for family in ["Roboto", "Lato", "Inter"]
+            for weight in [400, 700]
+        ],
+        allowed_formats=FORMATS,
+    )
+
+    # the CSS requests of the families are not made one after the other
+    assert running["max"] > 1
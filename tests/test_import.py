@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import pytest
+
+import pyfonts
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, pyfonts; "
+        "print(sorted(m for m in ('matplotlib', 'requests', 'fontTools') "
+        "if m in sys.modules))"
+    )
+    assert run_python(code) == "[]"
+
+
+def test_load_local_font_does_not_import_pyplot_nor_requests():
+    code = (
+        "import sys; from pyfonts import load_font; "
+        "load_font('tests/Ultra-Regular.ttf'); "
+        "print(sorted(m for m in ('matplotlib.pyplot', 'requests', 'fontTools') "
+        "if m in sys.modules))"
+    )
+    assert run_python(code) == "[]"
+
+
+def test_lazy_attributes():
+    assert set(pyfonts.__all__) <= set(dir(pyfonts))
+    for name in pyfonts.__all__:
+        assert callable(getattr(pyfonts, name))
+
+    with pytest.raises(AttributeError, match="has no attribute 'not_a_function'"):
+        pyfonts.not_a_function
+
+
+def test_preview_font_is_the_function_whatever_the_import_order():
+    code = (
+        "import pyfonts._preview; from pyfonts import preview_font; "
+        "print(type(preview_font).__name__)"
+    )
+    assert run_python(code) == "function"
+
+
+def test_preview_font_module_is_kept():
+    code = (
+        "import pyfonts.preview_font; from pyfonts import preview_font; "
+        "from pyfonts.preview_font import preview_font as function; "
+        "print(type(preview_font).__name__, preview_font is function, "
+        "type(pyfonts.preview_font).__name__)"
+    )
+    assert run_python(code) == "function True function"
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pyfonts.lock
+from pyfonts.lock import _atomic_write, _file_lock, _remove_unused_lock
+
+
+def test_file_lock_is_exclusive(tmp_path):
+    lock_path = str(tmp_path / "font.lock")
+    inside = {"now": 0, "max": 0}
+
+    def worker():
+        with _file_lock(lock_path):
+            inside["now"] += 1
+            inside["max"] = max(inside["max"], inside["now"])
+            time.sleep(0.02)
+            inside["now"] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert inside["max"] == 1
+
+
+def test_remove_unused_lock(tmp_path):
+    lock_path = str(tmp_path / "font.lock")
+    order = []
+    waiting = threading.Event()
+
+    def worker():
+        waiting.set()
+        with _file_lock(lock_path):
+            order.append("worker")
+
+    with _file_lock(lock_path):
+        # a held lock is not removed
+        assert not _remove_unused_lock(lock_path)
+        thread = threading.Thread(target=worker)
+        thread.start()
+        waiting.wait()
+        time.sleep(0.05)
+        order.append("main")
+    thread.join()
+    assert order == ["main", "worker"]
+
+    assert _remove_unused_lock(lock_path)
+    assert not _remove_unused_lock(lock_path)
+
+
+def test_file_lock_survives_removed_lock_file(tmp_path, monkeypatch):
+    lock_path = str(tmp_path / "font.lock")
+    lock = pyfonts.lock._lock
+    calls = []
+
+    def racy_lock(fd):
+        calls.append(fd)
+        if len(calls) == 1:
+            # the lock file is pruned between its opening and its locking
+            assert _remove_unused_lock(lock_path)
+        lock(fd)
+
+    monkeypatch.setattr(pyfonts.lock, "_lock", racy_lock)
+    with _file_lock(lock_path):
+        # the lock is held on the new lock file, not on the removed one
+        assert len(calls) == 2
+        assert not _remove_unused_lock(lock_path)
+
+
+def test_atomic_write(tmp_path):
+    path = tmp_path / "font.ttf"
+    path.write_bytes(b"old")
+
+    _atomic_write(str(path), b"new content")
+
+    assert path.read_bytes() == b"new content"
+    assert [p.name for p in tmp_path.iterdir()] == ["font.ttf"]
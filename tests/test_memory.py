@@ -0,0 +1,66 @@
+import pytest
+from matplotlib.font_manager import FontProperties
+
+from pyfonts import load_google_font, memory_cache_info, set_memory_cache_size
+from pyfonts.memory import _FontMemo, _FONT_MEMO
+
+
+@pytest.fixture(autouse=True)
+def clean_memo():
+    maxsize = _FONT_MEMO.maxsize
+    _FONT_MEMO.clear()
+    yield
+    _FONT_MEMO.clear()
+    _FONT_MEMO.resize(maxsize)
+
+
+def test_font_memo_lru():
+    memo = _FontMemo(maxsize=2)
+    memo.set("a", FontProperties(family="a"))
+    memo.set("b", FontProperties(family="b"))
+    assert memo.get("a") is not None  # "a" is now the most recently used
+    memo.set("c", FontProperties(family="c"))
+
+    assert memo.get("b") is None
+    font = memo.get("c")
+    assert font is not None and font.get_family() == ["c"]
+    assert memo.info() == {"hits": 2, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_font_memo_returns_copies():
+    memo = _FontMemo()
+    memo.set("a", FontProperties(family="a", size=10))
+    font = memo.get("a")
+    assert font is not None
+    font.set_size(30)
+    font = memo.get("a")
+    assert font is not None and font.get_size() == 10
+
+
+def test_load_google_font_is_memoized(monkeypatch):
+    calls = []
+
+    def fake_get_fonturl(**kwargs):
+        calls.append(kwargs)
+        return "tests/Ultra-Regular.ttf"
+
+    monkeypatch.setattr("pyfonts.providers._get_fonturl", fake_get_fonturl)
+
+    font = load_google_font("Ultra", weight="bold")
+    again = load_google_font("Ultra", weight="bold")
+    assert again.get_file() == font.get_file()
+    assert len(calls) == 1
+    assert memory_cache_info()["hits"] == 1
+
+    load_google_font("Ultra", weight="bold", use_cache=False)
+    assert len(calls) == 2
+
+
+def test_set_memory_cache_size(monkeypatch):
+    monkeypatch.setattr(
+        "pyfonts.providers._get_fonturl", lambda **kwargs: "tests/Ultra-Regular.ttf"
+    )
+    set_memory_cache_size(0)
+    load_google_font("Ultra")
+    load_google_font("Ultra")
+    assert memory_cache_info() == {"hits": 0, "misses": 2, "size": 0, "maxsize": 0}
@@ -0,0 +1,103 @@
+import pytest
+
+from pyfonts import add_observer, cache_stats, load_font, remove_observer
+from pyfonts.memory import _FONT_MEMO
+from pyfonts.metrics import _stage
+
+
+class DummyResponse:
+    status_code = 200
+    content = open("tests/Ultra-Regular.ttf", "rb").read()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    monkeypatch.setattr("pyfonts.main._http_get", lambda *a, **k: DummyResponse())
+    cache_stats(reset=True)
+
+    events = []
+
+    def observer(event, data):
+        events.append((event, data))
+
+    add_observer(observer)
+    yield events
+    remove_observer(observer)
+
+
+def test_load_font_events(events):
+    font_url = "https://example.com/metrics/Ultra-Regular.ttf"
+    load_font(font_url)
+    load_font(font_url)
+    _FONT_MEMO.clear()
+    load_font(font_url)
+
+    caches = [(d["cache"], d["hit"]) for e, d in events if e == "cache"]
+    assert caches == [
+        ("memory", False),
+        ("file", False),
+        ("memory", True),
+        ("memory", False),
+        ("file", True),
+    ]
+
+    download = next(d for e, d in events if e == "stage" and d["stage"] == "download")
+    assert download["url"] == font_url
+    assert download["bytes"] == len(DummyResponse.content)
+    assert download["ok"] and download["duration"] >= 0
+
+    stats = cache_stats(reset=True)
+    assert stats["caches"]["memory"] == {"hits": 1, "misses": 2}
+    assert stats["caches"]["file"] == {"hits": 1, "misses": 1}
+    assert stats["stages"]["request"]["count"] == 1
+    assert stats["stages"]["download"]["bytes"] == len(DummyResponse.content)
+    assert stats["stages"]["parse"]["count"] == 1
+    assert cache_stats()["stages"] == {}
+
+
+def test_failed_stage(events):
+    with pytest.raises(ValueError):
+        with _stage("css", url="https://example.com"):
+            raise ValueError("bad css")
+
+    assert events[-1][1]["stage"] == "css"
+    assert events[-1][1]["ok"] is False
+    assert cache_stats()["stages"]["css"]["count"] == 1
+
+
+def test_observer_errors_are_warnings(events):
+    def broken(event, data):
+        raise RuntimeError("broken observer")
+
+    add_observer(broken)
+    try:
+        with pytest.warns(UserWarning, match="broken observer"):
+            load_font("https://example.com/metrics/broken/Ultra-Regular.ttf")
+    finally:
+        remove_observer(broken)
+    assert events
+
+
+def test_css_events(events, monkeypatch):
+    from pyfonts.utils import _GOOGLE_ENDPOINT, _get_fonturl
+
+    css = (
+        "@font-face { font-family: 'Roboto'; font-style: normal; font-weight: 400; "
+        "src: url(https://fonts.gstatic.com/roboto.ttf) format('truetype'); }"
+    )
+
+    class CSSResponse:
+        status_code = 200
+        text = css
+
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr("pyfonts.utils._http_get", lambda *a, **k: CSSResponse())
+    for _ in range(2):
+        _get_fonturl(_GOOGLE_ENDPOINT, "Roboto", 400, None, ["ttf"], True)
+
+    stats = cache_stats()
+    assert stats["caches"]["url"] == {"hits": 1, "misses": 1}
+    assert stats["stages"]["css"]["count"] == 1
+    assert stats["stages"]["css"]["bytes"] == len(css)
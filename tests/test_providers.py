@@ -0,0 +1,268 @@
+import shutil
+import threading
+import time
+
+import pytest
+
+import pyfonts.providers
+from pyfonts import (
+    CSSProvider,
+    DirectoryProvider,
+    FailoverProvider,
+    FontProvider,
+    get_provider,
+    load_bunny_font,
+    load_provider_font,
+    register_provider,
+)
+from tests.conftest import FakeResponse
+
+
+@pytest.fixture
+def providers(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        pyfonts.providers, "_PROVIDERS", dict(pyfonts.providers._PROVIDERS)
+    )
+    return tmp_path
+
+
+def test_register_provider(providers):
+    assert get_provider("google").supports_text
+    assert get_provider("bunny").supports_text
+    assert not get_provider("bunny").supports_variations
+
+    mirror = CSSProvider("mirror", "https://fonts.example.com/css2")
+    register_provider(mirror)
+    assert get_provider("mirror") is mirror
+
+    with pytest.raises(ValueError, match="already registered"):
+        register_provider(CSSProvider("mirror", "https://other.example.com/css2"))
+    with pytest.raises(ValueError, match="Unknown provider 'nope'"):
+        get_provider("nope")
+    with pytest.raises(ValueError, match="'mirror' provider doesn't support `text`"):
+        load_provider_font("Roboto", provider="mirror", text="hello")
+
+
+def test_css_mirror(providers, monkeypatch):
+    css_urls = []
+
+    def fake_http_get(url, **kwargs):
+        css_urls.append(url)
+        host = url.split("/")[2]
+        return FakeResponse(
+            "@font-face { font-family: 'Ultra'; font-style: normal; font-weight: 400; "
+            f"src: url(https://{host}/ultra.ttf) format('truetype'); }}"
+        )
+
+    loaded = []
+
+    def fake_load_font(font_url, **kwargs):
+        loaded.append(font_url)
+        return pyfonts.providers.FontProperties(fname="tests/Ultra-Regular.ttf")
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+    monkeypatch.setattr("pyfonts.providers.load_font", fake_load_font)
+
+    load_bunny_font("Ultra")
+    register_provider(
+        CSSProvider("bunny", "https://fonts.internal/css", ["woff", "ttf", "otf"]),
+        replace=True,
+    )
+    # the font kept in memory for the public provider is not used either
+    load_bunny_font("Ultra")
+
+    # the url cached for the public provider is not used for the mirror
+    assert css_urls == [
+        "https://fonts.bunny.net/css?family=Ultra",
+        "https://fonts.internal/css?family=Ultra",
+    ]
+    assert loaded == [
+        "https://fonts.bunny.net/ultra.ttf",
+        "https://fonts.internal/ultra.ttf",
+    ]
+
+
+def test_builtin_providers_cache_apart(providers, monkeypatch):
+    def fake_http_get(url, **kwargs):
+        host = url.split("/")[2]
+        return FakeResponse(
+            "@font-face { font-family: 'Ultra'; font-style: normal; font-weight: 400; "
+            f"src: url(https://{host}/ultra.ttf) format('truetype'); }}"
+        )
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+    google = get_provider("google")
+    bunny = get_provider("bunny")
+
+    assert google.get_fonturl("Ultra", 400, False, ["ttf"], True) == (
+        "https://fonts.googleapis.com/ultra.ttf"
+    )
+    assert bunny.get_fonturl("Ultra", 400, False, ["ttf"], True) == (
+        "https://fonts.bunny.net/ultra.ttf"
+    )
+
+
+def test_css_mirror_relative_urls(providers, monkeypatch):
+    def fake_http_get(url, **kwargs):
+        return FakeResponse(
+            "@font-face { font-family: 'Ultra'; font-style: normal; font-weight: 400; "
+            "src: url(/files/ultra-400.ttf) format('truetype'); } "
+            "@font-face { font-family: 'Ultra'; font-style: normal; font-weight: 700; "
+            "src: url(../fonts/ultra-700.ttf) format('truetype'); } "
+            "@font-face { font-family: 'Ultra'; font-style: italic; font-weight: 400; "
+            "src: url(//cdn.example.com/ultra-italic.ttf) format('truetype'); }"
+        )
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+    mirror = CSSProvider("mirror", "https://fonts.internal.example.com/api/css2")
+
+    assert mirror.get_fonturl("Ultra", 400, False, ["ttf"], False) == (
+        "https://fonts.internal.example.com/files/ultra-400.ttf"
+    )
+    assert mirror.get_fonturl("Ultra", 700, False, ["ttf"], False) == (
+        "https://fonts.internal.example.com/fonts/ultra-700.ttf"
+    )
+    assert mirror.get_fonturl("Ultra", 400, True, ["ttf"], False) == (
+        "https://cdn.example.com/ultra-italic.ttf"
+    )
+
+
+def test_directory_provider(providers):
+    root = providers / "fonts"
+    (root / "ultra").mkdir(parents=True)
+    (root / "amarante").mkdir()
+    shutil.copy("tests/Ultra-Regular.ttf", root / "ultra" / "whatever.ttf")
+    shutil.copy("tests/Amarante-Regular.ttf", root / "amarante" / "Amarante.ttf")
+    (root / "README.txt").write_text("not a font")
+
+    register_provider(DirectoryProvider("local", str(root)))
+    font = load_provider_font("ultra", provider="local", weight="bold")
+    assert font.get_name() == "Ultra"
+    assert font.get_file() == str(root / "ultra" / "whatever.ttf")
+
+    font = load_provider_font("Amarante", provider=get_provider("local"))
+    assert font.get_name() == "Amarante"
+
+    with pytest.raises(ValueError, match="No family named 'Roboto'"):
+        load_provider_font("Roboto", provider="local")
+    with pytest.raises(RuntimeError, match="No font files found"):
+        load_provider_font("Ultra", provider="local", allowed_formats=["woff2"])
+
+
+class FakeProvider(FontProvider):
+    def __init__(self, name, delay=0.0, error=None, allowed_formats=("ttf",)):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.allowed_formats = list(allowed_formats)
+        self.calls = []
+        self.formats = []
+
+    def get_fonturl(self, family, weight, italic, allowed_formats, use_cache):
+        self.calls.append(family)
+        self.formats.append(allowed_formats)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"https://{self.name}.example.com/{family}.ttf"
+
+
+def test_font_provider_interface():
+    with pytest.raises(TypeError, match="abstract"):
+        FontProvider()  # ty: ignore
+
+    provider = FakeProvider("fake")
+    with pytest.raises(ValueError, match="'fake' provider doesn't support `text`"):
+        provider.get_subset_fonturls("Roboto", None, None, ["ttf"], "hello", False)
+    with pytest.raises(
+        ValueError, match="'fake' provider doesn't support `variations`"
+    ):
+        provider.get_variable_fonturl("Roboto", None, ["ttf"], False)
+
+
+def test_failover_provider(providers):
+    first = FakeProvider("first", error=ConnectionError("down"))
+    second = FakeProvider("second")
+    register_provider(first)
+    failover = FailoverProvider("failover", ["first", second])
+
+    url = failover.get_fonturl("Roboto", 400, False, ["ttf"], True)
+    assert url == "https://second.example.com/Roboto.ttf"
+    assert first.calls == ["Roboto"] and second.calls == ["Roboto"]
+
+    # the provider that answered is tried first next time
+    failover.get_fonturl("Roboto", 700, False, ["ttf"], True)
+    assert first.calls == ["Roboto"] and second.calls == ["Roboto", "Roboto"]
+
+    # the error of the preferred provider is raised when all providers fail
+    second.error = ValueError("No family named 'Roboto'")
+    with pytest.raises(ConnectionError, match="down"):
+        failover.get_fonturl("Roboto", 400, False, ["ttf"], False)
+
+    with pytest.raises(ValueError, match="must not be empty"):
+        FailoverProvider("failover", [])
+
+
+def test_failover_provider_formats(providers):
+    first = FakeProvider("first", error=ConnectionError("down"))
+    second = FakeProvider("second", allowed_formats=["woff", "ttf"])
+    failover = FailoverProvider("failover", [first, second])
+    assert failover.allowed_formats == ["ttf"]
+
+    # each provider uses its own default formats
+    failover.get_fonturl("Roboto", 400, False, failover.allowed_formats, False)
+    assert first.formats == [["ttf"]] and second.formats == [["woff", "ttf"]]
+
+    # requested formats are used by all providers
+    failover.get_fonturl("Roboto", 400, False, ["otf"], False)
+    assert first.formats[-1] == ["otf"] and second.formats[-1] == ["otf"]
+
+
+def test_failover_provider_hedging(providers):
+    slow = FakeProvider("slow", delay=2)
+    fast = FakeProvider("fast")
+    failover = FailoverProvider("hedged", [slow, fast], hedge_after=0.05)
+
+    start = time.perf_counter()
+    url = failover.get_fonturl("Roboto", 400, False, ["ttf"], True)
+    assert url == "https://fast.example.com/Roboto.ttf"
+    assert time.perf_counter() - start < 1
+
+    # the provider that answered is tried first next time
+    failover.get_fonturl("Roboto", 700, False, ["ttf"], True)
+    assert fast.calls == ["Roboto", "Roboto"]
+    assert slow.calls == ["Roboto"]
+
+    # a failing provider starts the next one without waiting
+    failing = FakeProvider("failing", error=ConnectionError("down"))
+    failover = FailoverProvider("hedged", [failing, slow], hedge_after=10)
+    slow.delay = 0
+    assert failover.get_fonturl("Roboto", 400, False, ["ttf"], False).startswith(
+        "https://slow."
+    )
+    assert threading.active_count() < 10
+
+
+def test_failover_providers_share_their_pool(providers):
+    slow = FakeProvider("slow", delay=2)
+    fast = FakeProvider("fast")
+    failover = FailoverProvider("hedged", [slow, fast], hedge_after=0.05)
+
+    url = failover.get_fonturl("Roboto", 400, False, ["ttf"], True)
+    assert url == "https://fast.example.com/Roboto.ttf"
+    pool = pyfonts.providers._HEDGE_POOL
+    assert pool is not None
+
+    # urls are cached by the providers themselves: the failover provider
+    # only remembers which one answered, so the other one is not started
+    start = time.perf_counter()
+    assert failover.get_fonturl("Roboto", 400, False, ["ttf"], True) == url
+    assert time.perf_counter() - start < 0.05
+    assert slow.calls == ["Roboto"] and fast.calls == ["Roboto", "Roboto"]
+
+    # all failover providers race in the same bounded threads
+    for i in range(10):
+        other = FailoverProvider(f"hedged-{i}", [slow, fast], hedge_after=0.05)
+        other.get_fonturl(f"Family {i}", 400, False, ["ttf"], False)
+    assert pyfonts.providers._HEDGE_POOL is pool
+    assert pool._max_workers == pyfonts.providers._HEDGE_MAX_WORKERS
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+
+import pytest
+from matplotlib.font_manager import FontEntry, FontProperties, fontManager
+
+import pyfonts.cache
+from pyfonts import configure_cache, prune_pyfonts_cache
+from pyfonts.cache import _cached_blob, _connect, _prune_in_background, _store_blob
+from pyfonts.lock import _file_lock
+from pyfonts.memory import _FONT_MEMO
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("pyfonts.cache._get_cache_dir", lambda: str(tmp_path))
+    monkeypatch.setattr("pyfonts.cache._MAX_CACHE_SIZE", None)
+    monkeypatch.setattr("pyfonts.cache._MAX_CACHE_AGE", None)
+    return tmp_path
+
+
+def make_font(cache_dir, name, size, downloaded, used):
+    path = cache_dir / name
+    path.write_bytes(b"0" * size)
+    now = time.time()
+    os.utime(path, (now - used, now - downloaded))
+    return path
+
+
+def test_prune_by_size(cache_dir, capsys):
+    old = make_font(cache_dir, "old.ttf", 100, downloaded=50, used=40)
+    recent = make_font(cache_dir, "recent.ttf", 100, downloaded=50, used=10)
+    newer = make_font(cache_dir, "newer.ttf", 100, downloaded=50, used=20)
+
+    configure_cache(max_size=250)
+    prune_pyfonts_cache()
+
+    assert not old.exists()
+    assert recent.exists() and newer.exists()
+    assert "Removed 1 font(s) from the cache" in capsys.readouterr().out
+
+
+def test_prune_by_age(cache_dir):
+    expired = make_font(cache_dir, "expired.ttf", 10, downloaded=100, used=100)
+    # the age of a font is the time since it was last used
+    fresh = make_font(cache_dir, "fresh.ttf", 10, downloaded=100, used=1)
+    leftover = make_font(cache_dir, "abc.tmp", 10, downloaded=7200, used=7200)
+
+    configure_cache(max_age=60)
+    prune_pyfonts_cache(verbose=False)
+
+    assert not expired.exists() and not leftover.exists()
+    assert fresh.exists()
+
+
+def test_prune_keeps_fonts_in_use(cache_dir, monkeypatch):
+    memo = make_font(cache_dir, "memo.ttf", 10, downloaded=100, used=100)
+    registered = make_font(cache_dir, "registered.ttf", 10, downloaded=100, used=100)
+    unused = make_font(cache_dir, "unused.ttf", 10, downloaded=100, used=100)
+    _FONT_MEMO.set("memo", FontProperties(fname=str(memo)))
+    monkeypatch.setattr(fontManager, "ttflist", [FontEntry(fname=str(registered))])
+
+    configure_cache(max_age=60)
+    prune_pyfonts_cache(verbose=False)
+
+    assert memo.exists() and registered.exists()
+    assert not unused.exists()
+
+
+def test_prune_removes_index_entries(tmp_cache, monkeypatch):
+    font_url = "https://example.com/Ultra-Regular.ttf"
+    content = open("tests/Ultra-Regular.ttf", "rb").read()
+    blob = _store_blob(font_url, content)
+    assert _cached_blob(font_url) == blob
+    os.utime(blob, (time.time() - 100, time.time() - 100))
+
+    monkeypatch.setattr("pyfonts.cache._MAX_CACHE_AGE", 60)
+    prune_pyfonts_cache(verbose=False)
+
+    assert not os.path.exists(blob)
+    assert _connect().execute("SELECT * FROM font_blobs").fetchall() == []
+
+
+def test_prune_unused_locks(cache_dir):
+    unused = make_font(cache_dir, "unused.ttf.lock", 0, downloaded=7200, used=7200)
+    recent = make_font(cache_dir, "recent.ttf.lock", 0, downloaded=1, used=1)
+    held = cache_dir / "held.ttf.lock"
+
+    acquired, release = threading.Event(), threading.Event()
+
+    def hold():
+        with _file_lock(str(held)):
+            # an old lock that is held by a long download
+            os.utime(held, (time.time() - 7200, time.time() - 7200))
+            acquired.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    acquired.wait()
+    try:
+        prune_pyfonts_cache(verbose=False)
+    finally:
+        release.set()
+        thread.join()
+
+    assert not unused.exists()
+    assert recent.exists() and held.exists()
+
+    # acquiring a lock marks it as used
+    with _file_lock(str(unused)):
+        pass
+    prune_pyfonts_cache(verbose=False)
+    assert unused.exists()
+
+
+def test_configure_cache_errors(cache_dir):
+    with pytest.raises(ValueError, match="`max_size` must be positive"):
+        configure_cache(max_size=-10)
+    with pytest.raises(ValueError, match="`max_age` must be positive"):
+        configure_cache(max_age=-10)
+
+    configure_cache(max_size=10)
+    configure_cache(max_age=5)
+    assert pyfonts.cache._MAX_CACHE_SIZE == 10
+
+
+def test_prune_in_background(cache_dir, monkeypatch):
+    monkeypatch.setattr("pyfonts.cache._PRUNE_STARTED", False)
+    monkeypatch.setattr("pyfonts.cache._MAX_CACHE_SIZE", 0)
+    font = make_font(cache_dir, "font.ttf", 10, downloaded=10, used=10)
+
+    _prune_in_background()
+    for _ in range(100):
+        if not font.exists():
+            break
+        time.sleep(0.01)
+    assert not font.exists()
+    assert (cache_dir / ".last_prune").exists()
+
+    # only once per process
+    font = make_font(cache_dir, "font.ttf", 10, downloaded=10, used=10)
+    _prune_in_background()
+    time.sleep(0.05)
+    assert font.exists()
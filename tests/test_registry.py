@@ -0,0 +1,84 @@
+import shutil
+
+import pytest
+from matplotlib.font_manager import fontManager
+
+from pyfonts import load_font, register_cached_fonts
+from pyfonts.registry import _clear_findfont_cache, _register_fonts
+
+
+@pytest.fixture
+def registry(tmp_cache, monkeypatch):
+    monkeypatch.setattr("pyfonts.registry._REGISTERED", set())
+    monkeypatch.setattr("pyfonts.registry._FONT_INDEXES", {})
+    ttflist = list(fontManager.ttflist)
+    yield tmp_cache
+    fontManager.ttflist[:] = ttflist
+    _clear_findfont_cache()
+
+
+def _registered_files(name):
+    return [entry.fname for entry in fontManager.ttflist if entry.name == name]
+
+
+def test_load_font_registers_once(registry):
+    n_fonts = len(fontManager.ttflist)
+    load_font("tests/Ultra-Regular.ttf")
+    load_font("tests/Ultra-Regular.ttf")
+
+    assert len(fontManager.ttflist) == n_fonts + 1
+    assert _registered_files("Ultra")
+    assert _register_fonts(["tests/Ultra-Regular.ttf"]) == 0
+
+    # local files are not added to the index of the cache
+    assert not (registry / ".pyfonts_font_index.jsonl").exists()
+
+
+def test_register_uses_persisted_index(registry, monkeypatch):
+    font_file = str(registry / "Amarante-Regular.ttf")
+    shutil.copy("tests/Amarante-Regular.ttf", font_file)
+    assert _register_fonts([font_file]) == 1
+    index_file = registry / ".pyfonts_font_index.jsonl"
+    assert len(index_file.read_text().splitlines()) == 1
+
+    # new entries are appended to the index
+    other_file = str(registry / "Ultra-Regular.ttf")
+    shutil.copy("tests/Ultra-Regular.ttf", other_file)
+    assert _register_fonts([other_file]) == 1
+    assert len(index_file.read_text().splitlines()) == 2
+
+    # a new session reads the font properties from the index
+    fontManager.ttflist[:] = [e for e in fontManager.ttflist if e.fname != font_file]
+    monkeypatch.setattr("pyfonts.registry._REGISTERED", set())
+    monkeypatch.setattr("pyfonts.registry._FONT_INDEXES", {})
+
+    def fail(path):
+        raise AssertionError("the font file should not be parsed")
+
+    monkeypatch.setattr(fontManager, "addfont", fail)
+    assert _register_fonts([font_file]) == 1
+    assert font_file in _registered_files("Amarante")
+
+
+def test_register_cached_fonts(registry):
+    cache_dir = registry / "pyfontsloader"
+    cache_dir.mkdir()
+    shutil.copy("tests/Ultra-Regular.ttf", cache_dir / "ultra.ttf")
+    shutil.copy("tests/Amarante-Regular.ttf", cache_dir / "amarante.ttf")
+    shutil.copy("tests/Amarante-Regular.ttf", cache_dir / "amarante.subset.ttf")
+    shutil.copy("tests/Amarante-Regular.ttf", cache_dir / "amarante.instance.ttf")
+    (cache_dir / "ultra.ttf.lock").touch()
+
+    assert register_cached_fonts() == 2
+    assert register_cached_fonts() == 0
+    assert str(cache_dir / "amarante.subset.ttf") not in _registered_files("Amarante")
+    assert str(cache_dir / "amarante.instance.ttf") not in _registered_files("Amarante")
+
+
+def test_register_without_writable_cache(registry, monkeypatch):
+    not_a_dir = registry / "file"
+    not_a_dir.touch()
+    monkeypatch.setattr("pyfonts.cache._CACHE_ROOT", str(not_a_dir / "cache"))
+
+    assert load_font("tests/Amarante-Regular.ttf").get_name() == "Amarante"
+    assert _registered_files("Amarante")
@@ -0,0 +1,176 @@
+import time
+
+import pytest
+import requests
+
+from pyfonts import load_font
+from pyfonts.cache import _is_stale, _validators_get
+from pyfonts.memory import _FONT_MEMO
+from pyfonts.session import _conditional_headers, _validators_from_response
+from pyfonts.utils import _get_fonturl, _GOOGLE_ENDPOINT
+from tests.conftest import FakeResponse
+
+FORMATS = ["woff2", "woff", "ttf", "otf"]
+
+
+def css(font_url):
+    return (
+        "@font-face { font-family: 'Roboto'; font-style: normal; font-weight: 400; "
+        f"src: url({font_url}) format('truetype'); }}"
+    )
+
+
+def response_with_headers(headers):
+    response = requests.Response()
+    response.headers.update(headers)
+    return response
+
+
+def test_validators_from_response():
+    response = response_with_headers(
+        {"ETag": '"abc"', "Cache-Control": "private, max-age=86400"}
+    )
+    validators = _validators_from_response(response)
+    assert validators["etag"] == '"abc"'
+    assert validators["last_modified"] is None
+    assert validators["expires"] == pytest.approx(time.time() + 86400, abs=5)
+    assert _conditional_headers(validators) == {"If-None-Match": '"abc"'}
+
+    response = response_with_headers({"Expires": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert _is_stale(_validators_from_response(response))
+
+    response = response_with_headers({"Cache-Control": "no-cache"})
+    assert _is_stale(_validators_from_response(response))
+
+    # no freshness information: never stale
+    assert not _is_stale(_validators_from_response(response_with_headers({})))
+    assert not _is_stale(None)
+
+
+def test_stale_css_is_revalidated(monkeypatch):
+    sent = []
+    responses = [
+        FakeResponse(
+            text=css("https://fonts.gstatic.com/v1.ttf"),
+            headers={"ETag": '"v1"', "Cache-Control": "max-age=0"},
+        ),
+        FakeResponse(status_code=304, headers={"Cache-Control": "max-age=0"}),
+        FakeResponse(
+            text=css("https://fonts.gstatic.com/v2.ttf"),
+            headers={"ETag": '"v2"', "Cache-Control": "max-age=3600"},
+        ),
+    ]
+
+    def fake_http_get(url, headers=None, **kwargs):
+        sent.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+
+    def get_fonturl():
+        return _get_fonturl(_GOOGLE_ENDPOINT, "Roboto", 400, None, FORMATS, True)
+
+    assert get_fonturl() == "https://fonts.gstatic.com/v1.ttf"
+    # not modified: the cached url is kept
+    assert get_fonturl() == "https://fonts.gstatic.com/v1.ttf"
+    # modified: the url is updated
+    assert get_fonturl() == "https://fonts.gstatic.com/v2.ttf"
+    # fresh: no request
+    assert get_fonturl() == "https://fonts.gstatic.com/v2.ttf"
+
+    assert sent == [None, {"If-None-Match": '"v1"'}, {"If-None-Match": '"v1"'}]
+
+
+def test_stale_css_is_used_when_offline(monkeypatch):
+    def fake_http_get(url, **kwargs):
+        return FakeResponse(
+            text=css("https://fonts.gstatic.com/v1.ttf"),
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+    _get_fonturl(_GOOGLE_ENDPOINT, "Roboto", 400, None, FORMATS, True)
+
+    failures = []
+
+    def fail(url, **kwargs):
+        failures.append(url)
+        raise ConnectionError("no network")
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fail)
+    for _ in range(2):
+        assert (
+            _get_fonturl(_GOOGLE_ENDPOINT, "Roboto", 400, None, FORMATS, True)
+            == "https://fonts.gstatic.com/v1.ttf"
+        )
+    # the failed revalidation is not retried right away
+    assert len(failures) == 1
+
+
+def test_stale_font_is_revalidated(monkeypatch):
+    content = open("tests/Ultra-Regular.ttf", "rb").read()
+    sent = []
+    responses = [
+        FakeResponse(
+            content=content,
+            headers={
+                "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+                "Cache-Control": "no-cache",
+            },
+        ),
+        FakeResponse(status_code=304),
+    ]
+
+    def fake_http_get(url, headers=None, **kwargs):
+        sent.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr("pyfonts.main._http_get", fake_http_get)
+
+    font_url = "https://example.com/Ultra-Regular.ttf"
+    font = load_font(font_url)
+    _FONT_MEMO.clear()
+    assert load_font(font_url).get_file() == font.get_file()
+
+    assert sent == [
+        None,
+        {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"},
+    ]
+    # the 304 had no freshness information, so the font is now fresh forever
+    assert not _is_stale(_validators_get(font_url))
+
+
+def test_stale_font_revalidation_backs_off(monkeypatch):
+    content = open("tests/Ultra-Regular.ttf", "rb").read()
+    not_modified = FakeResponse(status_code=304, headers={"Cache-Control": "no-cache"})
+    responses = [
+        FakeResponse(content=content, headers={"Cache-Control": "no-cache"}),
+        not_modified,
+        ConnectionError("no network"),
+    ]
+    sent = []
+
+    def fake_http_get(url, headers=None, **kwargs):
+        sent.append(headers)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr("pyfonts.main._http_get", fake_http_get)
+
+    font_url = "https://example.com/backoff/Ultra-Regular.ttf"
+    load_font(font_url)
+    _FONT_MEMO.clear()
+    load_font(font_url)
+    # the connection of the 304 response is released
+    assert not_modified.closed
+
+    # the revalidation fails: the stale font is used, and not revalidated
+    # again until the back off delay is over
+    for _ in range(3):
+        _FONT_MEMO.clear()
+        assert load_font(font_url).get_name() == "Ultra"
+    assert len(sent) == 3
+    validators = _validators_get(font_url)
+    assert validators is not None and validators["expires"] > time.time()
@@ -0,0 +1,193 @@
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+import pyfonts.session
+from pyfonts import configure_http, set_http_session
+from pyfonts.session import _get_session, _http_get, _stream_to_file
+
+
+@pytest.fixture(autouse=True)
+def reset_http_config(monkeypatch):
+    monkeypatch.setattr(pyfonts.session, "_TIMEOUT", pyfonts.session._TIMEOUT)
+    monkeypatch.setattr(pyfonts.session, "_RETRIES", pyfonts.session._RETRIES)
+    monkeypatch.setattr(
+        pyfonts.session, "_BACKOFF_FACTOR", pyfonts.session._BACKOFF_FACTOR
+    )
+    monkeypatch.setattr(
+        pyfonts.session, "_MAX_DOWNLOAD_SIZE", pyfonts.session._MAX_DOWNLOAD_SIZE
+    )
+    monkeypatch.setattr(pyfonts.session, "_PROGRESS", None)
+    monkeypatch.setattr(pyfonts.session, "_SESSIONS", {})
+    monkeypatch.setattr(pyfonts.session, "_CUSTOM_SESSIONS", {})
+
+
+@pytest.fixture
+def flaky_server():
+    hits = {"count": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits["count"] += 1
+            if hits["count"] == 1:
+                self.send_response(503)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/font.ttf", hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_sessions_are_pooled_per_host():
+    session = _get_session("https://fonts.googleapis.com/css2?family=Roboto")
+    assert session is _get_session("https://fonts.googleapis.com/css2?family=Lato")
+    assert session is not _get_session("https://fonts.gstatic.com/s/roboto.woff2")
+
+
+def test_set_http_session():
+    mirror = requests.Session()
+    set_http_session(mirror, host="fonts.gstatic.com")
+    assert _get_session("https://fonts.gstatic.com/s/roboto.woff2") is mirror
+    assert _get_session("https://fonts.bunny.net/css") is not mirror
+
+    everywhere = requests.Session()
+    set_http_session(everywhere)
+    assert _get_session("https://fonts.bunny.net/css") is everywhere
+    assert _get_session("https://fonts.gstatic.com/s/roboto.woff2") is mirror
+
+    set_http_session(None, host="fonts.gstatic.com")
+    set_http_session(None)
+    assert _get_session("https://fonts.gstatic.com/s/roboto.woff2") is not mirror
+
+
+def test_configure_http(monkeypatch):
+    configure_http(timeout=2, retries=5, backoff_factor=0.1)
+    assert pyfonts.session._TIMEOUT == (2.0, 2.0)
+    assert pyfonts.session._RETRIES == 5
+    assert pyfonts.session._BACKOFF_FACTOR == 0.1
+
+    received = {}
+
+    class DummySession:
+        def get(self, url, **kwargs):
+            received.update(kwargs)
+
+    set_http_session(DummySession())  # ty: ignore
+    _http_get("https://example.com/font.ttf")
+    assert received["timeout"] == (2.0, 2.0)
+
+    with pytest.raises(ValueError, match="`retries` must be positive"):
+        configure_http(retries=-1)
+
+
+def test_retry_on_server_error(flaky_server):
+    url, hits = flaky_server
+    configure_http(retries=2, backoff_factor=0)
+
+    response = _http_get(url)
+    assert response.status_code == 200
+    assert response.content == b"ok"
+    assert hits["count"] == 2
+
+
+@pytest.fixture
+def font_server():
+    body = open("tests/Ultra-Regular.ttf", "rb").read()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            # a server that doesn't announce the size of the body
+            if not self.path.endswith("chunked.ttf"):
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", body
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_to_file(font_server, tmp_path, monkeypatch):
+    base_url, body = font_server
+    monkeypatch.setattr(pyfonts.session, "_CHUNK_SIZE", 1024)
+    progress = []
+    configure_http(progress=lambda url, done, total: progress.append((done, total)))
+
+    url = f"{base_url}/font.ttf"
+    tmp_file, sha256, size = _stream_to_file(
+        url, _http_get(url, stream=True), str(tmp_path)
+    )
+    assert open(tmp_file, "rb").read() == body
+    assert sha256 == hashlib.sha256(body).hexdigest()
+    assert size == len(body)
+
+    # the file is written in several chunks
+    assert len(progress) > 1
+    assert progress[-1] == (len(body), len(body))
+
+
+def test_max_download_size(font_server, tmp_path):
+    base_url, body = font_server
+    configure_http(max_download_size=len(body) - 1)
+
+    # rejected from the Content-Length header, or while downloading
+    for url in [f"{base_url}/font.ttf", f"{base_url}/chunked.ttf"]:
+        with pytest.raises(ValueError, match="larger than the maximum download size"):
+            _stream_to_file(url, _http_get(url, stream=True), str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+    configure_http(max_download_size=None)
+    url = f"{base_url}/chunked.ttf"
+    assert _stream_to_file(url, _http_get(url, stream=True), str(tmp_path))[2] == len(
+        body
+    )
+
+    with pytest.raises(ValueError, match="`max_download_size` must be positive"):
+        configure_http(max_download_size=-1)
+
+
+def test_session_verify_is_not_overridden(monkeypatch):
+    monkeypatch.delenv("REQUESTS_CA_BUNDLE", raising=False)
+    monkeypatch.delenv("CURL_CA_BUNDLE", raising=False)
+    received = []
+
+    class RecordingAdapter(requests.adapters.BaseAdapter):
+        def send(self, request, verify=True, **kwargs):
+            received.append(verify)
+            response = requests.Response()
+            response.status_code = 200
+            response.request = request
+            return response
+
+        def close(self):
+            pass
+
+    session = requests.Session()
+    session.verify = "/etc/corp-ca.pem"
+    session.mount("https://", RecordingAdapter())
+    set_http_session(session)
+
+    _http_get("https://fonts.internal.example.com/roboto.woff2")
+    _http_get("https://fonts.internal.example.com/roboto.woff2", verify=False)
+    assert received == ["/etc/corp-ca.pem", False]
@@ -1,15 +1,14 @@
 import pytest
-import ssl
-from urllib.error import URLError
+import requests
 from pyfonts.main import load_font
 
 
-def make_ssl_error_urlopen(*args, **kwargs):
-    raise URLError(ssl.SSLCertVerificationError("certificate verify failed"))
+def make_ssl_error_http_get(*args, **kwargs):
+    raise requests.exceptions.SSLError("certificate verify failed")
 
 
 def test_ssl_error_raises(monkeypatch):
-    monkeypatch.setattr("pyfonts.main.urlopen", make_ssl_error_urlopen)
+    monkeypatch.setattr("pyfonts.main._http_get", make_ssl_error_http_get)
 
     with pytest.raises(
         Exception, match="SSL certificate verification failed."
@@ -23,18 +22,21 @@ def test_ssl_error_raises(monkeypatch):
 
 def test_ssl_error_warning(monkeypatch):
     class DummyResponse:
-        def read(self):
-            return b"dummy font data"
+        status_code = 200
+        # downloads that are not valid fonts are rejected
+        with open("tests/Ultra-Regular.ttf", "rb") as f:
+            content = f.read()
 
     calls = {"count": 0}
 
-    def fake_urlopen(*args, **kwargs):
+    def fake_http_get(*args, **kwargs):
         if calls["count"] == 0:
             calls["count"] += 1
-            raise URLError(ssl.SSLCertVerificationError("certificate verify failed"))
+            raise requests.exceptions.SSLError("certificate verify failed")
+        assert kwargs["verify"] is False
         return DummyResponse()
 
-    monkeypatch.setattr("pyfonts.main.urlopen", fake_urlopen)
+    monkeypatch.setattr("pyfonts.main._http_get", fake_http_get)
 
     with pytest.warns(UserWarning, match="SSL certificate verification disabled"):
         font = load_font(
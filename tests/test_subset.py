@@ -0,0 +1,190 @@
+import os
+
+import pytest
+from fontTools.ttLib import TTFont
+from matplotlib.font_manager import FontProperties
+
+from pyfonts import load_font, load_google_font
+from pyfonts.cache import _connect
+from pyfonts.subset import _merge_fonts, _subset_font
+from pyfonts.utils import _get_fonturl, _get_subset_fonturls, _GOOGLE_ENDPOINT
+from tests.conftest import FakeResponse
+
+FORMATS = ["woff2", "woff", "ttf", "otf"]
+
+CSS = """
+/* cyrillic */
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  src: url(https://fonts.gstatic.com/s/roboto/v1/cyrillic.ttf) format('truetype');
+  unicode-range: U+0301, U+0400-045F, U+0490-0491;
+}
+/* latin-ext */
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  src: url(https://fonts.gstatic.com/s/roboto/v1/latin-ext.ttf) format('truetype');
+  unicode-range: U+0100-02BA, U+1E00-1E9F;
+}
+/* latin */
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  src: url(https://fonts.gstatic.com/s/roboto/v1/latin.ttf) format('truetype');
+  unicode-range: U+0000-00FF, U+0131, U+0152-0153;
+}
+"""
+
+LATIN = "https://fonts.gstatic.com/s/roboto/v1/latin.ttf"
+CYRILLIC = "https://fonts.gstatic.com/s/roboto/v1/cyrillic.ttf"
+
+
+@pytest.fixture
+def stylesheet():
+    return CSS
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("hello", [LATIN]),
+        ("Привет, hello", [CYRILLIC, LATIN]),
+        # no subset has these characters
+        ("中文", [LATIN]),
+    ],
+)
+def test_get_subset_fonturls(css_requests, text, expected):
+    urls = _get_subset_fonturls(
+        _GOOGLE_ENDPOINT, "Roboto", 400, None, FORMATS, text, use_cache=True
+    )
+    assert urls == expected
+
+
+def test_subset_urls_share_the_stylesheet_cache(css_requests):
+    texts = ["hello", "world", "Привет", "123"]
+    for text in texts:
+        _get_subset_fonturls(
+            _GOOGLE_ENDPOINT, "Roboto", 400, None, FORMATS, text, use_cache=True
+        )
+
+    # the cache grows with the variants, not with the texts
+    assert len(css_requests) == 1
+    assert _connect().execute("SELECT COUNT(*) FROM url_cache").fetchone() == (1,)
+
+
+def test_merge_fonts(tmp_cache):
+    merged_file = _merge_fonts(
+        ["tests/Ultra-Regular.ttf", "tests/Amarante-Regular.ttf"]
+    )
+    assert merged_file.startswith(str(tmp_cache))
+    assert TTFont(merged_file)["cmap"].getBestCmap()[ord("A")]
+
+    # merging the same files again reuses the merged file
+    assert _merge_fonts(["tests/Ultra-Regular.ttf", "tests/Amarante-Regular.ttf"]) == (
+        merged_file
+    )
+
+
+def test_load_google_font_with_text(tmp_cache, css_requests, monkeypatch):
+    files = {LATIN: "tests/Ultra-Regular.ttf", CYRILLIC: "tests/Amarante-Regular.ttf"}
+    loaded = []
+
+    def fake_load_remote_font(font_url, use_cache, danger_not_verify_ssl, register):
+        # subsets are not registered under the family name
+        assert not register
+        loaded.append(font_url)
+        return FontProperties(fname=files[font_url])
+
+    monkeypatch.setattr("pyfonts.providers._load_remote_font", fake_load_remote_font)
+
+    font = load_google_font("Roboto", text="hello", use_cache=False)
+    assert loaded == [LATIN]
+    assert font.get_name() == "Ultra"
+
+    loaded.clear()
+    font = load_google_font("Roboto", text="Привет, hello", use_cache=False)
+    assert sorted(loaded) == sorted([LATIN, CYRILLIC])
+    assert str(font.get_file()).startswith(str(tmp_cache))
+    assert str(font.get_file()).endswith(".merged.ttf")
+
+
+def test_load_font_subset_text(tmp_cache):
+    font = load_font("tests/Ultra-Regular.ttf", subset_text="Hello")
+    subset_file = str(font.get_file())
+
+    assert subset_file.startswith(str(tmp_cache))
+    assert font.get_name() == "Ultra"
+    assert os.path.getsize(subset_file) < os.path.getsize("tests/Ultra-Regular.ttf")
+    assert set(TTFont(subset_file)["cmap"].getBestCmap()) == set(map(ord, "Helo"))
+
+    # the subset is keyed by the set of characters
+    assert _subset_font("tests/Ultra-Regular.ttf", "oleH") == subset_file
+    assert _subset_font("tests/Ultra-Regular.ttf", "World") != subset_file
+
+
+# what Google Fonts actually sends: a single ttf per variant to clients that
+# are not browsers, and woff2/woff subsets to browsers
+GOOGLE_TTF_CSS = """
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  font-stretch: 100%;
+  src: url(https://fonts.gstatic.com/s/roboto/v47/full.ttf) format('truetype');
+}
+"""
+
+GOOGLE_SUBSETS_CSS = """
+/* cyrillic */
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  font-stretch: 100%;
+  src: url(https://fonts.gstatic.com/s/roboto/v47/cyrillic.{ext}) format('{ext}');
+  unicode-range: U+0301, U+0400-045F, U+0490-0491, U+04B0-04B1, U+2116;
+}
+/* latin */
+@font-face {
+  font-family: 'Roboto';
+  font-style: normal;
+  font-weight: 400;
+  font-stretch: 100%;
+  src: url(https://fonts.gstatic.com/s/roboto/v47/latin.{ext}) format('{ext}');
+  unicode-range: U+0000-00FF, U+0131, U+0152-0153, U+02BB-02BC, U+2000-206F;
+}
+"""
+
+
+def test_subset_urls_with_google_responses(monkeypatch):
+    user_agents = []
+
+    def fake_http_get(url, headers=None, **kwargs):
+        user_agent = (headers or {}).get("User-Agent", "python-requests/2.32")
+        user_agents.append(user_agent)
+        if "Chrome/" in user_agent:
+            return FakeResponse(GOOGLE_SUBSETS_CSS.replace("{ext}", "woff2"))
+        if "Firefox/" in user_agent:
+            return FakeResponse(GOOGLE_SUBSETS_CSS.replace("{ext}", "woff"))
+        return FakeResponse(GOOGLE_TTF_CSS)
+
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+
+    # the whole font by default
+    url = _get_fonturl(_GOOGLE_ENDPOINT, "Roboto", 400, None, FORMATS, False)
+    assert url == "https://fonts.gstatic.com/s/roboto/v47/full.ttf"
+
+    # only the subsets of the text, as a browser would get them
+    urls = _get_subset_fonturls(
+        _GOOGLE_ENDPOINT, "Roboto", 400, None, FORMATS, "Привет", use_cache=False
+    )
+    assert len(urls) == 1 and "/cyrillic.woff" in urls[0]
+    urls = _get_subset_fonturls(
+        _GOOGLE_ENDPOINT, "Roboto", 400, None, ["woff"], "Hi", use_cache=False
+    )
+    assert urls == ["https://fonts.gstatic.com/s/roboto/v47/latin.woff"]
+    assert "Firefox/" in user_agents[-1]
@@ -0,0 +1,145 @@
+import json
+
+import pytest
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+from fontTools.ttLib import TTFont
+from fontTools.ttLib.tables.TupleVariation import TupleVariation
+from matplotlib.font_manager import FontProperties
+
+from pyfonts import load_font, load_google_font
+from pyfonts.catalog import _get_family_axes
+from pyfonts.variable import _instantiate_font
+from tests.conftest import FakeResponse
+
+
+def _square():
+    pen = TTGlyphPen(None)
+    pen.moveTo((0, 0))
+    pen.lineTo((0, 500))
+    pen.lineTo((500, 500))
+    pen.lineTo((500, 0))
+    pen.closePath()
+    return pen.glyph()
+
+
+@pytest.fixture
+def variable_font(tmp_path):
+    """A variable font with a `wght` axis that makes `A` wider."""
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder([".notdef", "A"])
+    fb.setupCharacterMap({ord("A"): "A"})
+    fb.setupGlyf({".notdef": _square(), "A": _square()})
+    fb.setupHorizontalMetrics({".notdef": (600, 0), "A": (600, 0)})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": "Pyfonts Variable", "styleName": "Regular"})
+    fb.setupOS2(usWeightClass=400)
+    fb.setupPost()
+    fb.setupFvar(axes=[("wght", 100, 400, 900, "Weight")], instances=[])
+    deltas = [(0, 0), (0, 0), (200, 0), (200, 0), (0, 0), (200, 0), (0, 0), (0, 0)]
+    fb.setupGvar({"A": [TupleVariation({"wght": (0, 1.0, 1.0)}, deltas)]})
+    path = tmp_path / "PyfontsVariable.ttf"
+    fb.save(str(path))
+    return str(path)
+
+
+def test_instantiate_font(tmp_cache, variable_font):
+    instance_file = _instantiate_font(variable_font, {"wght": 900})
+    assert instance_file.startswith(str(tmp_cache))
+    assert instance_file.endswith(".instance.ttf")
+
+    instance = TTFont(instance_file)
+    assert "fvar" not in instance
+    assert getattr(instance["OS/2"], "usWeightClass") == 900
+    assert max(x for x, _ in instance["glyf"]["A"].coordinates) == 700
+
+    # instances are cached by coordinates
+    assert _instantiate_font(variable_font, {"wght": 900.0}) == instance_file
+    assert _instantiate_font(variable_font, {"wght": 400}) != instance_file
+
+
+def test_instantiate_font_errors(tmp_cache, variable_font):
+    with pytest.raises(ValueError, match="no 'wdth' axis. Valid options are: wght"):
+        _instantiate_font(variable_font, {"wdth": 80})
+    with pytest.raises(ValueError, match="`wght` must be between 100 and 900"):
+        _instantiate_font(variable_font, {"wght": 1000})
+    with pytest.raises(ValueError, match="is not a variable font"):
+        _instantiate_font("tests/Ultra-Regular.ttf", {"wght": 400})
+
+
+def test_load_font_variations(tmp_cache, variable_font):
+    font = load_font(variable_font, variations={"wght": 700})
+    assert font.get_name() == "Pyfonts Variable"
+    instance = TTFont(str(font.get_file()))
+    assert getattr(instance["OS/2"], "usWeightClass") == 700
+
+
+def test_load_google_font_variations(tmp_cache, monkeypatch):
+    css_urls, loaded = [], []
+
+    def fake_http_get(url, **kwargs):
+        css_urls.append(url)
+        return FakeResponse(
+            "@font-face { font-family: 'Roboto'; font-style: normal; "
+            "font-weight: 100 900; src: url(https://fonts.gstatic.com/roboto.ttf) "
+            "format('truetype'); }"
+        )
+
+    def fake_load_font(font_url, variations=None, **kwargs):
+        loaded.append((font_url, variations))
+        return FontProperties(family="Roboto")
+
+    monkeypatch.setattr(
+        "pyfonts.utils._get_family_axes",
+        lambda family: {"wght": [100, 900, 400], "wdth": [75, 100, 100]},
+    )
+    monkeypatch.setattr("pyfonts.utils._http_get", fake_http_get)
+    monkeypatch.setattr("pyfonts.providers.load_font", fake_load_font)
+
+    load_google_font("Roboto", variations={"wdth": 80}, weight="bold")
+    load_google_font("Roboto", variations={"wght": 650})
+
+    # the variable font url is only resolved once
+    assert css_urls == [
+        "https://fonts.googleapis.com/css2?family=Roboto:wdth,wght@75..100,100..900"
+    ]
+    assert loaded == [
+        ("https://fonts.gstatic.com/roboto.ttf", {"wdth": 80, "wght": 700}),
+        ("https://fonts.gstatic.com/roboto.ttf", {"wght": 650}),
+    ]
+
+    with pytest.raises(ValueError, match="can't be used together"):
+        load_google_font("Roboto", variations={"wght": 650}, text="hello")
+
+
+def test_get_family_axes(tmp_cache, monkeypatch):
+    requests = []
+    metadata = {
+        "familyMetadataList": [
+            {
+                "family": "Roboto",
+                "fonts": {"400": {}, "700": {}},
+                "axes": [
+                    {"tag": "wght", "min": 100.0, "max": 900.0, "defaultValue": 400.0}
+                ],
+            },
+            {"family": "Ultra", "fonts": {"400": {}}, "axes": []},
+        ]
+    }
+
+    def fake_http_get(url, **kwargs):
+        requests.append(url)
+        return FakeResponse(")]}'\n" + json.dumps(metadata))
+
+    monkeypatch.setattr("pyfonts.catalog._http_get", fake_http_get)
+
+    assert _get_family_axes("Roboto") == {"wght": [100.0, 900.0, 400.0]}
+    assert _get_family_axes("Ultra") == {}
+    with pytest.raises(ValueError, match="No family named 'Robot'"):
+        _get_family_axes("Robot")
+    assert len(requests) == 1
+
+    # the catalog is read back from the cache in a new process
+    monkeypatch.setattr("pyfonts.catalog._CATALOG", None)
+    assert _get_family_axes("Roboto") == {"wght": [100.0, 900.0, 400.0]}
+    assert len(requests) == 1
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from pyfonts import load_google_font, load_bunny_font, set_offline_mode
+from pyfonts.__main__ import main
+from pyfonts.cache import _MEMORY_CACHE
+from pyfonts.memory import _FONT_MEMO
+from pyfonts.utils import _get_fonturl
+
+MANIFEST = """
+[[fonts]]
+family = "Roboto"
+weights = [400, "bold"]
+styles = ["normal", "italic"]
+
+[[fonts]]
+provider = "bunny"
+family = "Alumni Sans"
+"""
+
+
+@pytest.fixture
+def offline_env(tmp_path, monkeypatch):
+    monkeypatch.setattr("pyfonts.offline._OFFLINE", None)
+    monkeypatch.setattr("pyfonts.offline._LOCKFILE", None)
+    monkeypatch.delenv("PYFONTS_OFFLINE", raising=False)
+    monkeypatch.delenv("PYFONTS_LOCKFILE", raising=False)
+
+    class DummyResponse:
+        status_code = 200
+        content = open("tests/Ultra-Regular.ttf", "rb").read()
+
+    def fake_get_fonturl(endpoint, family, weight, italic, **kwargs):
+        name = family.replace(" ", "")
+        return f"https://fonts.example.com/{name}-{weight}-{int(italic)}.ttf"
+
+    monkeypatch.setattr("pyfonts.providers._get_fonturl", fake_get_fonturl)
+    monkeypatch.setattr("pyfonts.main._http_get", lambda *a, **k: DummyResponse())
+
+    manifest = tmp_path / "fonts.toml"
+    manifest.write_text(MANIFEST)
+    return manifest
+
+
+def test_warm_cli(offline_env, capsys):
+    assert main(["warm", str(offline_env), "--jobs", "2"]) == 0
+    assert "Cached 5 font(s)" in capsys.readouterr().out
+
+    lockfile = offline_env.with_name("fonts.lock.json")
+    entries = json.loads(lockfile.read_text())["fonts"]
+    assert [(e["family"], e["weight"], e["italic"]) for e in entries] == [
+        ("Roboto", 400, False),
+        ("Roboto", 400, True),
+        ("Roboto", 700, False),
+        ("Roboto", 700, True),
+        ("Alumni Sans", None, False),
+    ]
+    assert all(len(e["sha256"]) == 64 for e in entries)
+
+
+def test_offline_mode(offline_env, monkeypatch):
+    lockfile = offline_env.with_name("custom.lock.json")
+    main(["warm", str(offline_env), "--lockfile", str(lockfile)])
+
+    # the url cache is gone, and the network is not available
+    _MEMORY_CACHE.clear()
+    _FONT_MEMO.clear()
+    monkeypatch.setattr("pyfonts.providers._get_fonturl", _get_fonturl)
+    monkeypatch.setattr("pyfonts.utils._url_cache_get", lambda key: None)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("offline mode should not use the network")
+
+    monkeypatch.setattr("pyfonts.main._http_get", fail)
+    monkeypatch.setattr("pyfonts.utils._http_get", fail)
+
+    set_offline_mode(lockfile=str(lockfile))
+    assert load_google_font("Roboto", weight="bold", italic=True).get_name() == "Ultra"
+    assert load_bunny_font("Alumni Sans").get_name() == "Ultra"
+
+    with pytest.raises(RuntimeError, match="Offline mode is enabled"):
+        load_google_font("Roboto", weight=300)
+
+
+def test_warm_invalid_manifest(offline_env, capsys):
+    offline_env.write_text('[[fonts]]\nfamily = "Roboto"\nprovider = "nope"\n')
+    assert main(["warm", str(offline_env)]) == 1
+    assert "Unknown provider 'nope'" in capsys.readouterr().err